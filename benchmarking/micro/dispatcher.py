@@ -0,0 +1,77 @@
+"""
+Micro-benchmark of the round trip between the main process and the inference
+pool workers, for small requests (where the IPC overhead dominates).
+"""
+
+import os
+import time
+import asyncio
+import click
+
+from mlserver.model import MLModel
+from mlserver.parallel.pool import InferencePool
+from mlserver.settings import ModelSettings, Settings
+from mlserver.types import InferenceRequest, RequestInput
+
+MODEL_SETTINGS_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "testserver",
+    "models",
+    "sum-model",
+    "model-settings.json",
+)
+
+
+def _generate_request() -> InferenceRequest:
+    return InferenceRequest(
+        inputs=[
+            RequestInput(name="input-0", shape=[1, 3], datatype="FP32", data=[1, 2, 3])
+        ]
+    )
+
+
+async def _run(workers: int, requests: int, concurrency: int) -> float:
+    settings = Settings(parallel_workers=workers)
+    model_settings = ModelSettings.parse_file(MODEL_SETTINGS_PATH)
+    # Disable adaptive batching, to only measure the IPC overhead
+    model_settings.max_batch_size = 0
+    model_settings.max_batch_time = 0
+
+    inference_pool = InferencePool(settings)
+    model = await inference_pool.load_model(MLModel(model_settings))
+
+    inference_request = _generate_request()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _send():
+        async with semaphore:
+            await model.predict(inference_request)
+
+    # Warm up
+    await asyncio.gather(*[_send() for _ in range(concurrency)])
+
+    start = time.perf_counter()
+    await asyncio.gather(*[_send() for _ in range(requests)])
+    elapsed = time.perf_counter() - start
+
+    await inference_pool.unload_model(model)
+    await inference_pool.close()
+
+    return elapsed
+
+
+@click.command()
+@click.option("--workers", default=2, help="Number of inference workers")
+@click.option("--requests", default=10000, help="Number of requests to send")
+def main(workers: int, requests: int):
+    print(f"{'concurrency':>12} {'req/s':>10} {'latency (ms)':>13}")
+    for concurrency in [1, 8, 32, 128]:
+        elapsed = asyncio.run(_run(workers, requests, concurrency))
+        throughput = requests / elapsed
+        latency = elapsed / requests * concurrency
+        print(f"{concurrency:>12} {throughput:>10.0f} {latency * 1000:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
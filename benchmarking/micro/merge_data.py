@@ -0,0 +1,72 @@
+"""
+Micro-benchmark of the merge step of adaptive batching, comparing the current
+implementation against the previous `sum(all_data, [])` approach.
+"""
+
+import timeit
+import click
+import numpy as np
+
+from mlserver.batching.requests import BatchedRequests, _merge_data
+from mlserver.types import InferenceRequest, RequestInput
+
+
+def _merge_data_legacy(all_data: list) -> list:
+    return sum(all_data, [])
+
+
+def _generate_requests(batch_size: int, elem_size: int, as_numpy: bool) -> dict:
+    requests = {}
+    for idx in range(batch_size):
+        data = np.random.rand(elem_size)
+        requests[str(idx)] = InferenceRequest(
+            inputs=[
+                RequestInput(
+                    name="input-0",
+                    shape=[1, elem_size],
+                    datatype="FP64",
+                    data=data if as_numpy else data.tolist(),
+                )
+            ]
+        )
+
+    return requests
+
+
+@click.command()
+@click.option("--elem-size", default=256, help="Number of elements per request")
+@click.option("--number", default=100, help="Number of runs per measurement")
+def main(elem_size: int, number: int):
+    print(f"{'batch':>6} {'legacy (ms)':>12} {'lists (ms)':>11} {'numpy (ms)':>11}")
+    for batch_size in [8, 16, 32, 64, 128, 256]:
+        lists = [np.random.rand(elem_size).tolist() for _ in range(batch_size)]
+        arrays = [np.random.rand(elem_size) for _ in range(batch_size)]
+
+        legacy = timeit.timeit(lambda: _merge_data_legacy(lists), number=number)
+        merged_lists = timeit.timeit(lambda: _merge_data(lists), number=number)
+        merged_arrays = timeit.timeit(lambda: _merge_data(arrays), number=number)
+
+        print(
+            f"{batch_size:>6} "
+            f"{legacy / number * 1000:>12.3f} "
+            f"{merged_lists / number * 1000:>11.3f} "
+            f"{merged_arrays / number * 1000:>11.3f}"
+        )
+
+    print()
+    print(f"{'batch':>6} {'requests (ms)':>14} {'numpy requests (ms)':>20}")
+    for batch_size in [8, 64, 256]:
+        requests = _generate_requests(batch_size, elem_size, as_numpy=False)
+        np_requests = _generate_requests(batch_size, elem_size, as_numpy=True)
+
+        merged = timeit.timeit(lambda: BatchedRequests(requests), number=number)
+        np_merged = timeit.timeit(lambda: BatchedRequests(np_requests), number=number)
+        print(
+            f"{batch_size:>6} "
+            f"{merged / number * 1000:>14.3f} "
+            f"{np_merged / number * 1000:>20.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Micro-benchmark of the per-message overhead of the messages exchanged between
+the main process and the inference pool workers (i.e. building them, and
+pickling them through the queues).
+"""
+
+import os
+import timeit
+import click
+
+from multiprocessing.reduction import ForkingPickler
+
+from mlserver.parallel.messages import (
+    ModelRequestMessage,
+    ModelResponseMessage,
+    ModelUpdateMessage,
+    ModelUpdateType,
+)
+from mlserver.settings import ModelSettings
+from mlserver.types import InferenceRequest, InferenceResponse, RequestInput
+
+MODEL_SETTINGS_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "testserver",
+    "models",
+    "sum-model",
+    "model-settings.json",
+)
+
+INFERENCE_REQUEST = InferenceRequest(
+    inputs=[RequestInput(name="input-0", shape=[1, 3], datatype="FP32", data=[1, 2, 3])]
+)
+INFERENCE_RESPONSE = InferenceResponse(model_name="sum-model", outputs=[])
+
+
+def _round_trip(message):
+    # Same serialisation used by `multiprocessing.Queue`
+    return ForkingPickler.loads(ForkingPickler.dumps(message))
+
+
+def _request():
+    message = ModelRequestMessage(
+        model_name="sum-model",
+        model_version="v1",
+        method_name="predict",
+        method_args=[INFERENCE_REQUEST],
+    )
+    return _round_trip(message)
+
+
+def _metadata():
+    # Message without any payload, to isolate the overhead of the message
+    # itself
+    message = ModelRequestMessage(
+        model_name="sum-model", model_version="v1", method_name="metadata"
+    )
+    return _round_trip(message)
+
+
+def _response():
+    message = ModelResponseMessage(id=1, return_value=INFERENCE_RESPONSE)
+    return _round_trip(message)
+
+
+def _update(model_settings: ModelSettings):
+    message = ModelUpdateMessage(
+        update_type=ModelUpdateType.Load, model_settings=model_settings
+    )
+    received = _round_trip(message)
+    # The settings get accessed more than once while processing an update
+    received.model_settings
+    return received.model_settings
+
+
+@click.command()
+@click.option("--number", default=10000, help="Number of messages per measurement")
+def main(number: int):
+    model_settings = ModelSettings.parse_file(MODEL_SETTINGS_PATH)
+    benchmarks = {
+        "metadata": _metadata,
+        "request": _request,
+        "response": _response,
+        "update": lambda: _update(model_settings),
+    }
+
+    print(f"{'message':>9} {'per message (us)':>17} {'size (bytes)':>13}")
+    for name, benchmark in benchmarks.items():
+        elapsed = timeit.timeit(benchmark, number=number)
+        size = len(ForkingPickler.dumps(benchmark()))
+        print(f"{name:>9} {elapsed / number * 1e6:>17.2f} {size:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,21 @@ from __future__ import annotations
 import time
 import asyncio
 
-from asyncio import Future, Queue, wait_for, Task
+from asyncio import Future, Queue, Semaphore, wait_for, Task
+from collections import OrderedDict
 from functools import partial
-from typing import AsyncIterator, Awaitable, Dict, Optional, Tuple
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    Hashable,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
 
+from ..errors import MLServerError, ModelOverloaded
 from ..model import MLModel
 from ..types import (
     InferenceRequest,
@@ -17,7 +28,22 @@ from ..types import (
 from ..utils import generate_uuid, schedule_with_callback
 from .. import metrics
 
+from .buckets import Bucket, BucketKey, FLUSH_DRAIN, FLUSH_SIZE, FLUSH_TIMEOUT
+from .lanes import get_priority
+from .metrics import BatchingMetrics
 from .requests import BatchedRequests
+from .signatures import get_signature, validate_request
+from .tuning import LatencyTuner
+
+
+def _is_retriable(err: MLServerError, batched: BatchedRequests) -> bool:
+    """
+    Check whether a failed batch should get retried in smaller batches.
+    That is, whether it failed with a client error (which could have been
+    caused by a single invalid request) and it holds more than one request.
+    """
+    is_client_error = err.status_code < 500
+    return is_client_error and len(batched.inference_requests) > 1
 
 
 class AdaptiveBatcher:
@@ -26,11 +52,38 @@ class AdaptiveBatcher:
 
         self._max_batch_size = model.settings.max_batch_size
         self._max_batch_time = model.settings.max_batch_time
+        self._max_concurrent_batches = model.settings.max_concurrent_batches
+        self._max_queued_requests = model.settings.max_queued_requests
+
+        self._tuner: Optional[LatencyTuner] = None
+        if model.settings.target_batch_latency:
+            self._tuner = LatencyTuner(
+                target_latency=model.settings.target_batch_latency,
+                max_batch_size=self._max_batch_size,
+                # If there is no explicit limit, the batch window will only be
+                # bound by the target latency
+                max_batch_time=(
+                    self._max_batch_time or model.settings.target_batch_latency
+                ),
+            )
+
+        self._bucket_key: Optional[BucketKey] = None
+        if model.settings.batch_bucket_input:
+            self._bucket_key = BucketKey(
+                input_name=model.settings.batch_bucket_input,
+                dim=model.settings.batch_bucket_dim,
+                boundaries=model.settings.batch_bucket_boundaries,
+            )
+
+        self._metrics = BatchingMetrics(model.name, model.version)
+        self._update_limits_metrics()
 
         # Save predict function before it gets decorated
         self._predict_fn = model.predict
-        self.__requests: Optional[Queue[Tuple[str, InferenceRequest]]] = None
+        self.__requests: Optional[Queue] = None
+        self.__in_flight: Optional[Semaphore] = None
         self._async_responses: Dict[str, Future[InferenceResponse]] = {}
+        self._queued_at: Dict[str, float] = {}
         self._batching_task = None
         metrics.register("batch_request_queue", "counter of request queue batch size")
 
@@ -40,21 +93,57 @@ class AdaptiveBatcher:
         return await self._wait_response(internal_id)
 
     @property
-    def _requests(self) -> Queue[Tuple[str, InferenceRequest]]:
+    def _requests(self) -> Queue:
         # NOTE: We need to create Queue within the async request path (and not
         # during __init__!!) to ensure that it shares the same AsyncIO loop.
         if self.__requests is None:
-            self.__requests = Queue(maxsize=self._max_batch_size)
+            maxsize = self._max_batch_size
+            if self._max_queued_requests:
+                maxsize = self._max_queued_requests
+
+            self.__requests = Queue(maxsize=maxsize)
 
         return self.__requests
 
+    @property
+    def _in_flight(self) -> Optional[Semaphore]:
+        if self._max_concurrent_batches is None:
+            return None
+
+        if self.__in_flight is None:
+            self.__in_flight = Semaphore(self._max_concurrent_batches)
+
+        return self.__in_flight
+
     async def _queue_request(
         self,
         req: InferenceRequest,
     ) -> Tuple[str, Awaitable[InferenceResponse]]:
+        # Reject invalid requests straight away, so that they can't cause
+        # the rest of their batch to fail
+        validate_request(req)
+        get_priority(req)
+
         internal_id = generate_uuid()
         self._batch_queue_monitor()
-        await self._requests.put((internal_id, req))
+        if self._tuner is not None:
+            self._tuner.observe_arrival()
+
+        if self._is_overloaded():
+            # Reject requests straight away when the queue is full, so that
+            # clients can back off (or retry somewhere else)
+            self._metrics.rejected.inc()
+            raise ModelOverloaded(self._model.name, self._model.version)
+
+        self._queued_at[internal_id] = time.perf_counter()
+        try:
+            if self._max_queued_requests:
+                self._requests.put_nowait((internal_id, req))
+            else:
+                await self._requests.put((internal_id, req))
+        except BaseException:
+            self._queued_at.pop(internal_id, None)
+            raise
 
         loop = asyncio.get_running_loop()
         async_response = loop.create_future()
@@ -62,6 +151,16 @@ class AdaptiveBatcher:
 
         return internal_id, async_response
 
+    def _is_overloaded(self) -> bool:
+        if not self._max_queued_requests:
+            return False
+
+        # NOTE: Requests get moved out of the queue (and into their bucket)
+        # straight away, so every request which hasn't been sent to the
+        # model yet (i.e. which is still waiting in either the queue, a
+        # bucket or for a free batch slot) counts towards the limit
+        return len(self._queued_at) >= self._max_queued_requests
+
     def _batch_queue_monitor(self):
         """Monitorize batch queue size"""
         batch_queue_size = self._requests.qsize()
@@ -100,52 +199,267 @@ class AdaptiveBatcher:
         # Empty queue
         for _ in range(self._requests.qsize()):
             self._requests.get_nowait()
+        self._queued_at.clear()
 
     async def _batcher(self):
         async for batched in self._batch_requests():
+            in_flight = self._in_flight
+            if in_flight is not None:
+                # NOTE: While we wait, requests will keep piling up in the
+                # queue, until new ones start getting rejected
+                await in_flight.acquire()
+
+            self._observe_queue_wait(batched)
+            self._metrics.in_flight.inc()
             # We run prediction as a Task to ensure it gets scheduled
             # immediately.
             # That way, we can process multiple batches concurrently.
             schedule_with_callback(
-                self._predict_fn(batched.merged_request),
-                partial(self._predict_callback, batched),
+                self._predict(batched),
+                partial(self._predict_callback, batched, time.perf_counter()),
+            )
+
+    async def _predict(
+        self, batched: BatchedRequests, retry: bool = True
+    ) -> Mapping[str, Union[InferenceResponse, BaseException]]:
+        try:
+            batched_response = await self._predict_fn(batched.merged_request)
+        except MLServerError as err:
+            if not retry or not _is_retriable(err, batched):
+                raise
+
+            # A single invalid request could have caused the whole batch to
+            # fail, so split it in halves to ensure only the offending ones
+            # fail.
+            # Bisecting (rather than retrying each request on its own) keeps
+            # the number of extra calls to the model down to about
+            # 2 * log2(N) when only one of the requests is invalid.
+            return await self._predict_halves(batched)
+
+        started = time.perf_counter()
+        responses = batched.split_response(batched_response)
+        self._metrics.split_time.observe(time.perf_counter() - started)
+
+        return responses
+
+    async def _predict_halves(
+        self, batched: BatchedRequests
+    ) -> Mapping[str, Union[InferenceResponse, BaseException]]:
+        self._metrics.bisections.inc()
+        internal_ids = list(batched.inference_requests.keys())
+        middle = len(internal_ids) // 2
+        halves = [
+            BatchedRequests(
+                {
+                    internal_id: batched.inference_requests[internal_id]
+                    for internal_id in half
+                }
             )
+            for half in [internal_ids[:middle], internal_ids[middle:]]
+        ]
+
+        attempts = await asyncio.gather(
+            *[self._predict(half, retry=False) for half in halves],
+            return_exceptions=True,
+        )
+
+        # When both halves fail, the batch is likely to hold multiple invalid
+        # requests, so bisecting any further would end up costing more calls
+        # than retrying each request on its own (i.e. up to 2N - 1)
+        failed = [
+            isinstance(attempt, MLServerError) and _is_retriable(attempt, half)
+            for half, attempt in zip(halves, attempts)
+        ]
+        retry = self._predict_halves
+        if all(failed):
+            retry = self._predict_individually
+
+        responses: Dict[str, Union[InferenceResponse, BaseException]] = {}
+        retries = []
+        for half, attempt, half_failed in zip(halves, attempts, failed):
+            if half_failed:
+                retries.append(retry(half))
+            elif isinstance(attempt, BaseException):
+                responses.update(
+                    {internal_id: attempt for internal_id in half.inference_requests}
+                )
+            else:
+                responses.update(attempt)
+
+        for retried in await asyncio.gather(*retries):
+            responses.update(retried)
+
+        return responses
+
+    async def _predict_individually(
+        self, batched: BatchedRequests
+    ) -> Mapping[str, Union[InferenceResponse, BaseException]]:
+        internal_ids = list(batched.inference_requests.keys())
+        responses = await asyncio.gather(
+            *[
+                self._predict_fn(batched.inference_requests[internal_id])
+                for internal_id in internal_ids
+            ],
+            return_exceptions=True,
+        )
+
+        return dict(zip(internal_ids, responses))
+
+    def _observe_queue_wait(self, batched: BatchedRequests):
+        now = time.perf_counter()
+        for internal_id in batched.inference_requests.keys():
+            queued_at = self._queued_at.pop(internal_id, None)
+            if queued_at is not None:
+                self._metrics.queue_wait.observe(now - queued_at)
+
+    def _predict_callback(
+        self, batched: BatchedRequests, started: float, predict_task: Task
+    ):
+        self._metrics.in_flight.dec()
+        in_flight = self._in_flight
+        if in_flight is not None:
+            in_flight.release()
 
-    def _predict_callback(self, batched: BatchedRequests, predict_task: Task):
         try:
-            batched_response = predict_task.result()
-            responses = batched.split_response(batched_response)
+            responses = predict_task.result()
+            self._observe_batch(batched, time.perf_counter() - started)
             for internal_id, response in responses.items():
-                self._async_responses[internal_id].set_result(response)
+                async_response = self._async_responses[internal_id]
+                if isinstance(response, BaseException):
+                    async_response.set_exception(response)
+                else:
+                    async_response.set_result(response)
         except Exception as err:
             for internal_id in batched.inference_requests.keys():
                 self._async_responses[internal_id].set_exception(err)
 
+    def _observe_batch(self, batched: BatchedRequests, latency: float):
+        if self._tuner is None:
+            return
+
+        self._tuner.observe_batch(len(batched.inference_requests), latency)
+        self._update_limits_metrics()
+
+    def _update_limits_metrics(self):
+        max_batch_size, max_batch_time = self._get_batch_limits()
+        self._metrics.batch_size.set(max_batch_size)
+        self._metrics.batch_time.set(max_batch_time)
+
+    def _get_batch_limits(self) -> Tuple[int, float]:
+        """
+        Returns the maximum size of the next batch, as well as the maximum
+        time to wait for it to fill up.
+        """
+        if self._tuner is not None:
+            return self._tuner.batch_size, self._tuner.batch_time
+
+        return self._max_batch_size, self._max_batch_time
+
     async def _batch_requests(self) -> AsyncIterator[BatchedRequests]:
-        while not self._requests.empty():
-            to_batch: Dict[str, InferenceRequest] = {}
-            start = time.time()
-            timeout = self._max_batch_time
+        # Requests get grouped into buckets, which get batched (and flushed)
+        # independently, once they fill up or reach their own deadline.
+        # Each request signature gets its own set of buckets.
+        buckets: Dict[Hashable, Bucket] = OrderedDict()
+        while not self._requests.empty() or buckets:
+            max_batch_size, max_batch_time = self._get_batch_limits()
+
+            # Take every request that is already waiting in the queue, before
+            # checking any deadline
+            while not self._requests.empty():
+                internal_id, inference_request = self._requests.get_nowait()
+                self._add_to_bucket(
+                    buckets, internal_id, inference_request, max_batch_time
+                )
 
+            # NOTE: Only one batch gets flushed at a time, so that requests
+            # which arrive meanwhile (e.g. while waiting for a free batch
+            # slot) can still get picked for the next one, if their priority
+            # is higher
+            batched = self._flush_next(buckets, max_batch_size, max_batch_time)
+            if batched is not None:
+                yield batched
+                continue
+
+            if not buckets:
+                continue
+
+            next_deadline = min(bucket.deadline for bucket in buckets.values())
             try:
-                while len(to_batch) < self._max_batch_size:
-                    internal_id, inference_request = await self._get_request(
-                        timeout=timeout
-                    )
-                    to_batch[internal_id] = inference_request
-
-                    # Update remaining timeout
-                    current = time.time()
-                    timeout = timeout - (current - start)
+                internal_id, inference_request = await wait_for(
+                    self._requests.get(), timeout=next_deadline - time.time()
+                )
             except asyncio.TimeoutError:
                 # NOTE: Hit timeout, continue
-                pass
+                continue
+
+            self._add_to_bucket(buckets, internal_id, inference_request, max_batch_time)
+
+    def _add_to_bucket(
+        self,
+        buckets: Dict[Hashable, Bucket],
+        internal_id: str,
+        inference_request: InferenceRequest,
+        max_batch_time: float,
+    ):
+        # Requests with different signatures can't be merged together, so
+        # they always get their own buckets
+        bucket_key: Hashable = get_signature(inference_request)
+        if self._bucket_key is not None:
+            bucket_key = (bucket_key, self._bucket_key(inference_request))
+
+        bucket = buckets.get(bucket_key)
+        if bucket is None:
+            bucket = Bucket(
+                deadline=time.time() + max_batch_time,
+                max_wait=self._model.settings.batch_priority_max_wait,
+                metrics=self._metrics,
+            )
+            buckets[bucket_key] = bucket
+
+        bucket.add(internal_id, inference_request)
+
+    def _flush_next(
+        self,
+        buckets: Dict[Hashable, Bucket],
+        max_batch_size: int,
+        max_batch_time: float,
+    ) -> Optional[BatchedRequests]:
+        """
+        Flushes the next bucket which is either full or past its deadline (if
+        any), picking its highest-priority requests first.
+        """
+        # Without a batch window, buckets just get flushed as soon as the
+        # queue is drained
+        expired_reason = FLUSH_TIMEOUT if max_batch_time > 0 else FLUSH_DRAIN
+        now = time.time()
+        for bucket_key, bucket in buckets.items():
+            if len(bucket) >= max_batch_size:
+                reason = FLUSH_SIZE
+            elif bucket.is_expired(now):
+                reason = expired_reason
+            else:
+                continue
+
+            batched = self._flush(bucket, reason, max_batch_size)
+            if not bucket:
+                # NOTE: Safe, as we stop iterating straight away
+                del buckets[bucket_key]
+
+            return batched
+
+        return None
+
+    def _flush(
+        self, bucket: Bucket, reason: str, max_batch_size: int
+    ) -> BatchedRequests:
+        requests = bucket.pop(max_batch_size)
 
-            yield BatchedRequests(to_batch)
+        started = time.perf_counter()
+        batched = BatchedRequests(requests)
+        self._metrics.merge_time.observe(time.perf_counter() - started)
 
-    async def _get_request(self, timeout: float) -> Tuple[str, InferenceRequest]:
-        if not self._requests.empty():
-            return await self._requests.get()
+        self._metrics.flushes(reason).inc()
+        self._metrics.sizes.observe(len(requests))
+        self._metrics.fill_ratio.observe(len(requests) / max_batch_size)
 
-        read_op = self._requests.get()
-        return await wait_for(read_op, timeout=timeout)
+        return batched
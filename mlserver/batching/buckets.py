@@ -0,0 +1,98 @@
+from bisect import bisect_left
+from typing import Dict, Hashable, List, Optional
+
+from ..types import InferenceRequest, RequestInput
+from .lanes import Lanes
+from .metrics import BatchingMetrics
+
+# Reasons why a bucket gets flushed (i.e. batched and sent to the model)
+FLUSH_SIZE = "size"
+FLUSH_TIMEOUT = "timeout"
+FLUSH_DRAIN = "drain"
+
+
+def _get_text_length(request_input: RequestInput) -> Optional[int]:
+    data = getattr(request_input.data, "__root__", request_input.data)
+    if isinstance(data, (str, bytes)):
+        return len(data)
+
+    if isinstance(data, list) and data and isinstance(data[0], (str, bytes)):
+        # For text inputs, the length of each sequence will only be known
+        # after tokenising it, so we use the length of the raw text instead
+        return max(len(elem) for elem in data)
+
+    return None
+
+
+def _get_dim(request_input: RequestInput, dim: int) -> Optional[int]:
+    try:
+        return request_input.shape[dim]
+    except IndexError:
+        return None
+
+
+class BucketKey:
+    """
+    Computes the bucket of each request, based on the length of one of its
+    inputs, so that requests with similar lengths can get batched together.
+    """
+
+    def __init__(
+        self, input_name: str, dim: int = -1, boundaries: Optional[List[int]] = None
+    ):
+        self.input_name = input_name
+        self.dim = dim
+        self.boundaries = sorted(boundaries or [])
+
+    def __call__(self, inference_request: InferenceRequest) -> Hashable:
+        for request_input in inference_request.inputs:
+            if request_input.name == self.input_name:
+                length = _get_text_length(request_input)
+                if length is None:
+                    # Tensors with different lengths can't be merged together
+                    # without padding them, so boundaries only apply to text
+                    # inputs
+                    return _get_dim(request_input, self.dim)
+
+                if not self.boundaries:
+                    # Without boundaries, each length gets its own bucket
+                    return length
+
+                # Lengths above the last boundary get their own extra bucket
+                return bisect_left(self.boundaries, length)
+
+        return None
+
+
+class Bucket:
+    """
+    Set of queued requests which will get batched together, once the bucket
+    fills up or reaches its deadline.
+    Requests are kept in separate lanes for each priority, so that each batch
+    gets filled from the highest-priority lanes first.
+    """
+
+    def __init__(
+        self,
+        deadline: float,
+        max_wait: Optional[float] = None,
+        metrics: Optional[BatchingMetrics] = None,
+    ):
+        self.deadline = deadline
+        self._lanes = Lanes(max_wait=max_wait, metrics=metrics)
+
+    def __len__(self) -> int:
+        return len(self._lanes)
+
+    def add(self, internal_id: str, inference_request: InferenceRequest):
+        self._lanes.append((internal_id, inference_request))
+
+    def pop(self, max_batch_size: int) -> Dict[str, InferenceRequest]:
+        """
+        Takes the next batch of requests out of the bucket.
+        """
+        batch_size = min(len(self._lanes), max_batch_size)
+        return dict(self._lanes.popleft() for _ in range(batch_size))
+
+    def is_expired(self, now: float) -> bool:
+        return self.deadline <= now
@@ -50,10 +50,16 @@ async def load_batching(model: MLModel) -> MLModel:
     if model.settings.max_batch_size <= 1:
         return model
 
-    if model.settings.max_batch_time <= 0:
+    # NOTE: When targeting a latency, the batch time will get tuned on the fly
+    has_target_latency = bool(model.settings.target_batch_latency)
+    if model.settings.max_batch_time <= 0 and not has_target_latency:
         return model
 
-    if model.settings.max_batch_size > 1 and model.settings.max_batch_time <= 0:
+    if (
+        model.settings.max_batch_size > 1
+        and model.settings.max_batch_time <= 0
+        and not has_target_latency
+    ):
         logger.warning(
             "Setting max_batch_time equal to zero will result"
             " in batching having no effect, if you intend to "
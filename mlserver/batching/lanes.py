@@ -0,0 +1,107 @@
+import time
+
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from ..errors import MLServerError
+from ..types import InferenceRequest
+from .metrics import BatchingMetrics
+
+PRIORITY_PARAMETER = "priority"
+PRIORITY_HEADER = "mlserver-priority"
+DEFAULT_PRIORITY = 0
+
+QueueItem = Tuple[str, InferenceRequest]
+
+
+class InvalidPriority(MLServerError):
+    def __init__(self, priority: Any):
+        super().__init__(f"Invalid request priority ({priority}), expected an integer")
+
+
+def get_priority(inference_request: InferenceRequest) -> int:
+    """
+    Returns the priority of a request, taken from either its `priority`
+    parameter or its `mlserver-priority` header.
+    Higher values get served first.
+    """
+    parameters = inference_request.parameters
+    if parameters is None:
+        return DEFAULT_PRIORITY
+
+    priority = getattr(parameters, PRIORITY_PARAMETER, None)
+    if priority is None and parameters.headers:
+        priority = parameters.headers.get(PRIORITY_HEADER, None)
+
+    if priority is None:
+        return DEFAULT_PRIORITY
+
+    try:
+        return int(priority)
+    except (TypeError, ValueError):
+        raise InvalidPriority(priority)
+
+
+class Lanes:
+    """
+    Set of FIFO lanes (one per request priority), so that higher-priority
+    requests get picked first.
+
+    To avoid starving lower-priority lanes, any request which has been waiting
+    for longer than `max_wait` gets picked first, regardless of its lane.
+    """
+
+    def __init__(
+        self,
+        max_wait: Optional[float] = None,
+        metrics: Optional[BatchingMetrics] = None,
+    ):
+        self._max_wait = max_wait
+        self._metrics = metrics
+        self._lanes: Dict[int, Deque[Tuple[float, QueueItem]]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, item: QueueItem):
+        _, inference_request = item
+        priority = get_priority(inference_request)
+
+        lane = self._lanes.get(priority)
+        if lane is None:
+            lane = deque()
+            self._lanes[priority] = lane
+
+        lane.append((time.perf_counter(), item))
+        self._size += 1
+
+        if self._metrics is not None:
+            self._metrics.lane_size(priority).inc()
+
+    def popleft(self) -> QueueItem:
+        priority = self._next_lane()
+        lane = self._lanes[priority]
+        queued_at, item = lane.popleft()
+        if not lane:
+            del self._lanes[priority]
+
+        self._size -= 1
+
+        if self._metrics is not None:
+            # NOTE: Lanes of other buckets may hold requests with the same
+            # priority, so the lane size gets tracked across all of them
+            self._metrics.lane_size(priority).dec()
+            waited = time.perf_counter() - queued_at
+            self._metrics.lane_wait(priority).observe(waited)
+
+        return item
+
+    def _next_lane(self) -> int:
+        if self._max_wait is not None:
+            oldest = min(self._lanes, key=lambda priority: self._lanes[priority][0][0])
+            oldest_queued_at, _ = self._lanes[oldest][0]
+            if time.perf_counter() - oldest_queued_at >= self._max_wait:
+                return oldest
+
+        return max(self._lanes)
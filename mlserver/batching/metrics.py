@@ -0,0 +1,124 @@
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.metrics import MetricWrapperBase
+from typing import List, Optional, Type, TypeVar
+
+from ..metrics import REGISTRY
+from ..metrics.context import SELDON_MODEL_NAME_LABEL, SELDON_MODEL_VERSION_LABEL
+
+_Metric = TypeVar("_Metric", bound=MetricWrapperBase)
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+FILL_RATIO_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+
+def _get_or_create_metric(
+    metric_class: Type[_Metric],
+    name: str,
+    description: str,
+    extra_labels: List[str] = [],
+    **kwargs,
+) -> _Metric:
+    if name in REGISTRY:
+        return REGISTRY[name]  # type: ignore
+
+    return metric_class(
+        name,
+        description,
+        labelnames=[SELDON_MODEL_NAME_LABEL, SELDON_MODEL_VERSION_LABEL] + extra_labels,
+        registry=REGISTRY,
+        **kwargs,
+    )
+
+
+class BatchingMetrics:
+    """
+    Prometheus metrics exported by the adaptive batcher of each model.
+    """
+
+    def __init__(self, model_name: str, model_version: Optional[str]):
+        labels = {
+            SELDON_MODEL_NAME_LABEL: model_name,
+            SELDON_MODEL_VERSION_LABEL: model_version or "",
+        }
+        self._labels = labels
+
+        self.batch_size = _get_or_create_metric(
+            Gauge,
+            "batch_max_size",
+            "Maximum number of requests currently grouped in a single batch",
+        ).labels(**labels)
+        self.batch_time = _get_or_create_metric(
+            Gauge,
+            "batch_max_time_seconds",
+            "Maximum time (in seconds) currently waited for a batch to fill up",
+        ).labels(**labels)
+        self.in_flight = _get_or_create_metric(
+            Gauge,
+            "batch_in_flight",
+            "Number of batches currently being processed",
+        ).labels(**labels)
+        self.queue_wait = _get_or_create_metric(
+            Histogram,
+            "batch_queue_wait_seconds",
+            "Time (in seconds) requests waited to get batched and sent to the model",
+        ).labels(**labels)
+        self.rejected = _get_or_create_metric(
+            Counter,
+            "batch_rejected_requests",
+            "Number of requests rejected because the batching queue was full",
+        ).labels(**labels)
+        self.bisections = _get_or_create_metric(
+            Counter,
+            "batch_bisections",
+            "Number of batches split in halves after failing with a client error",
+        ).labels(**labels)
+        self._lane_size = _get_or_create_metric(
+            Gauge,
+            "batch_lane_queue_size",
+            "Number of requests waiting in each priority lane",
+            extra_labels=["priority"],
+        )
+        self._lane_wait = _get_or_create_metric(
+            Histogram,
+            "batch_lane_wait_seconds",
+            "Time (in seconds) requests waited in each priority lane",
+            extra_labels=["priority"],
+        )
+
+        self.sizes = _get_or_create_metric(
+            Histogram,
+            "batch_size",
+            "Number of requests grouped in each batch",
+            buckets=BATCH_SIZE_BUCKETS,
+        ).labels(**labels)
+        self.fill_ratio = _get_or_create_metric(
+            Histogram,
+            "batch_fill_ratio",
+            "Size of each batch, relative to the maximum batch size",
+            buckets=FILL_RATIO_BUCKETS,
+        ).labels(**labels)
+        self.merge_time = _get_or_create_metric(
+            Histogram,
+            "batch_merge_seconds",
+            "Time (in seconds) spent merging requests into a batch",
+        ).labels(**labels)
+        self.split_time = _get_or_create_metric(
+            Histogram,
+            "batch_split_seconds",
+            "Time (in seconds) spent splitting a batched response",
+        ).labels(**labels)
+        self._flushes = _get_or_create_metric(
+            Counter,
+            "batch_flushes",
+            "Number of batches sent to the model, by the reason they were flushed",
+            extra_labels=["reason"],
+        )
+
+    def flushes(self, reason: str) -> Counter:
+        return self._flushes.labels(**self._labels, reason=reason)
+
+    def lane_size(self, priority: int) -> Gauge:
+        return self._lane_size.labels(**self._labels, priority=str(priority))
+
+    def lane_wait(self, priority: int) -> Histogram:
+        return self._lane_wait.labels(**self._labels, priority=str(priority))
@@ -1,5 +1,7 @@
+import numpy as np
+
 from collections import defaultdict, OrderedDict
-from typing import Dict, List, Optional, Union, Any, DefaultDict
+from typing import Dict, Iterable, List, Optional, Union, Any, DefaultDict
 
 from ..types import (
     InferenceRequest,
@@ -80,23 +82,70 @@ def _merge_input_parameters(
 
 
 def _merge_data(
-    all_data: Union[list, List[str], List[bytes]]
-) -> Union[list, str, bytes]:
+    all_data: Union[list, List[str], List[bytes], List[np.ndarray]]
+) -> Union[list, str, bytes, np.ndarray]:
     sampled_datum = all_data[0]
 
     if isinstance(sampled_datum, str):
         return "".join(all_data)  # type: ignore
 
-    if isinstance(sampled_datum, bytes):
+    if isinstance(sampled_datum, (bytes, bytearray, memoryview)):
         return b"".join(all_data)  # type: ignore
 
-    if isinstance(sampled_datum, list):
-        return sum(all_data, [])
+    if isinstance(sampled_datum, np.ndarray) and all(
+        isinstance(datum, np.ndarray) for datum in all_data
+    ):
+        # Concatenate into a single pre-allocated buffer, without going
+        # through Python lists
+        return np.concatenate(all_data)
+
+    if isinstance(sampled_datum, (list, np.ndarray)):
+        # NOTE: Extending a single list keeps the merge linear on the total
+        # number of elements (as opposed to `sum(all_data, [])`, which copies
+        # the partial result on every step)
+        merged: list = []
+        for datum in all_data:
+            merged.extend(datum)
+
+        return merged
 
     # TODO: Should we raise an error if we couldn't merge the data?
     return all_data
 
 
+def _get_row_stride(merged_data: Any, merged_shape: Shape, batch_size: int) -> int:
+    """
+    Returns the number of entries of the merged data which correspond to a
+    single row of the batch.
+    """
+    element_size = merged_shape.elem_size
+    if isinstance(merged_data, np.ndarray) and merged_data.ndim > 1:
+        # Multi-dimensional arrays always keep the batch dimension first
+        return 1
+
+    if isinstance(merged_data, (list, np.ndarray)):
+        is_flattened = len(merged_data) == batch_size * element_size
+        if not is_flattened and len(merged_data) == batch_size:
+            # Non-flattened data (i.e. nested lists with one entry per row)
+            return 1
+
+    return element_size
+
+
+def _split_data(
+    merged_data: Any, stride: int, minibatch_sizes: Iterable[int]
+) -> List[Any]:
+    idx = 0
+    all_data = []
+    for minibatch_size in minibatch_sizes:
+        # NOTE: Slicing a Numpy array returns a view over the merged data, so
+        # its contents won't get copied
+        all_data.append(merged_data[idx : idx + minibatch_size * stride])
+        idx += minibatch_size * stride
+
+    return all_data
+
+
 class BatchedRequests:
     def __init__(self, inference_requests: Dict[str, InferenceRequest] = {}):
         self.inference_requests = inference_requests
@@ -245,18 +294,12 @@ class BatchedRequests:
 
     def _split_data(self, response_output: ResponseOutput) -> Dict[str, Any]:
         merged_shape = Shape(response_output.shape)
-        element_size = merged_shape.elem_size
         merged_data = _get_data(response_output)
-        idx = 0
-
-        all_data = {}
-        # TODO: Don't rely on array to have been flattened
-        for internal_id, minibatch_size in self._minibatch_sizes.items():
-            data = merged_data[idx : idx + minibatch_size * element_size]
-            idx += minibatch_size * element_size
-            all_data[internal_id] = data
+        batch_size = sum(self._minibatch_sizes.values())
+        stride = _get_row_stride(merged_data, merged_shape, batch_size)
+        all_data = _split_data(merged_data, stride, self._minibatch_sizes.values())
 
-        return all_data
+        return dict(zip(self._minibatch_sizes.keys(), all_data))
 
     def _split_parameters(
         self, response_output: ResponseOutput
@@ -0,0 +1,86 @@
+from typing import Hashable, Optional
+
+from ..errors import MLServerError
+from ..types import InferenceRequest, Parameters, RequestInput
+from .shape import Shape
+
+
+class InvalidBatchRequest(MLServerError):
+    def __init__(self, input_name: str, reason: str):
+        super().__init__(f"Input {input_name} can't be batched: {reason}")
+
+
+def _get_content_type(parameters: Optional[Parameters]) -> Optional[str]:
+    if parameters is None:
+        return None
+
+    return parameters.content_type
+
+
+def _get_input_signature(request_input: RequestInput) -> Hashable:
+    return (
+        request_input.name,
+        request_input.datatype,
+        tuple(request_input.shape[1:]),
+        _get_content_type(request_input.parameters),
+    )
+
+
+def get_signature(inference_request: InferenceRequest) -> Hashable:
+    """
+    Returns the signature of a request (i.e. its input names, datatypes,
+    non-batch dimensions and content types, as well as its requested
+    outputs).
+    Only requests which share the same signature can be merged together into
+    the same batch.
+    """
+    sorted_inputs = sorted(
+        inference_request.inputs, key=lambda request_input: request_input.name
+    )
+    inputs = tuple(
+        _get_input_signature(request_input) for request_input in sorted_inputs
+    )
+
+    outputs = None
+    if inference_request.outputs is not None:
+        outputs = tuple(
+            sorted(request_output.name for request_output in inference_request.outputs)
+        )
+
+    return inputs, outputs, _get_content_type(inference_request.parameters)
+
+
+def validate_request(inference_request: InferenceRequest):
+    """
+    Ensure that a request can be merged with other requests (i.e. that all of
+    its inputs have a consistent batch dimension).
+    """
+    batch_size = None
+    for request_input in inference_request.inputs:
+        if not request_input.shape:
+            raise InvalidBatchRequest(request_input.name, "missing batch dimension")
+
+        shape = Shape(request_input.shape)
+        if batch_size is None:
+            batch_size = shape.batch_size
+        elif shape.batch_size != batch_size:
+            raise InvalidBatchRequest(
+                request_input.name,
+                f"batch size ({shape.batch_size}) differs from other inputs "
+                f"({batch_size})",
+            )
+
+        data = getattr(request_input.data, "__root__", request_input.data)
+        if request_input.datatype == "BYTES" or not isinstance(data, list):
+            # The length of BYTES payloads doesn't need to match their shape
+            # (e.g. when packed as a single bytes blob)
+            continue
+
+        # Data can either be flattened or nested (i.e. with one entry per row)
+        expected_sizes = {shape.batch_size * shape.elem_size, shape.batch_size}
+        if len(data) not in expected_sizes:
+            raise InvalidBatchRequest(
+                request_input.name,
+                f"data length ({len(data)}) doesn't match its shape "
+                f"({request_input.shape})",
+            )
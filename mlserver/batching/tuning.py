@@ -0,0 +1,176 @@
+import time
+import numpy as np
+
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+
+class LatencyTuner:
+    """
+    Tunes the batch size and batch window (i.e. how long to wait for a batch
+    to fill up) of the adaptive batcher, so that requests stay within a target
+    p99 latency.
+
+    The tuner keeps track of the model's latency for recent batches, which it
+    uses to estimate the p99 latency of a batch of a given size, as well as of
+    the rate at which requests arrive.
+    It then picks the largest batch size that can be filled (and processed)
+    within the target latency, alongside the window needed to fill it.
+
+    Once the tuner settles on a batch size, it will only observe batches up
+    to that size.
+    To avoid getting stuck on small batches, it keeps the shape of the last
+    fit across multiple batch sizes as a prior, and it probes a larger batch
+    size every ``explore_every`` batches when it has no data about them.
+    """
+
+    def __init__(
+        self,
+        target_latency: float,
+        max_batch_size: int,
+        max_batch_time: float,
+        history: int = 256,
+        min_samples: int = 8,
+        smoothing: float = 0.1,
+        explore_every: int = 64,
+    ):
+        self.target_latency = target_latency
+        self.max_batch_size = max_batch_size
+        self.max_batch_time = max_batch_time
+        self.min_samples = min_samples
+        self.smoothing = smoothing
+        self.explore_every = explore_every
+
+        # Until we've got enough data, we'll just use the static limits
+        self.batch_size = max_batch_size
+        self.batch_time = max_batch_time
+
+        self._samples: Deque[Tuple[int, float]] = deque(maxlen=history)
+        self._intercept = 0.0
+        self._slope = 0.0
+        self._tail = 1.0
+        # Intercept and slope of the last fit across multiple batch sizes
+        self._prior: Optional[Tuple[float, float]] = None
+        self._batches_since_explore = 0
+
+        self._last_arrival: Optional[float] = None
+        self._arrival_interval: Optional[float] = None
+
+    @property
+    def arrival_rate(self) -> float:
+        """
+        Estimated number of requests arriving per second.
+        """
+        if not self._arrival_interval:
+            return 0.0
+
+        return 1 / self._arrival_interval
+
+    def observe_arrival(self, now: Optional[float] = None):
+        if now is None:
+            now = time.perf_counter()
+
+        if self._last_arrival is not None:
+            interval = now - self._last_arrival
+            if self._arrival_interval is None:
+                self._arrival_interval = interval
+            else:
+                self._arrival_interval += self.smoothing * (
+                    interval - self._arrival_interval
+                )
+
+        self._last_arrival = now
+
+    def observe_batch(self, batch_size: int, latency: float):
+        self._samples.append((batch_size, latency))
+        if len(self._samples) < self.min_samples:
+            return
+
+        self._fit()
+        self.batch_size, self.batch_time = self._choose_limits()
+        self._explore()
+
+    def estimate_latency(self, batch_size: int) -> float:
+        """
+        Estimated p99 latency of running inference on a batch of the given
+        size.
+        """
+        return (self._intercept + self._slope * batch_size) * self._tail
+
+    def _fit(self):
+        sizes, latencies = np.array(self._samples, dtype=float).T
+
+        if np.ptp(sizes) == 0 and self._prior is not None:
+            # With a single batch size, we can't tell how latency scales with
+            # it, so we keep the shape of the last fit, rescaled to match the
+            # latest observations
+            intercept, slope = self._prior
+            expected = max(intercept + slope * sizes[0], np.finfo(float).eps)
+            scale = latencies.mean() / expected
+            self._intercept = intercept * scale
+            self._slope = slope * scale
+        elif np.ptp(sizes) == 0:
+            # Without any prior, we pessimistically assume that latency scales
+            # linearly with the batch size
+            self._intercept = 0.0
+            self._slope = latencies.mean() / sizes[0]
+        else:
+            slope, intercept = np.polyfit(sizes, latencies, 1)
+            self._slope = max(slope, 0.0)
+            self._intercept = max(intercept, 0.0)
+            self._prior = (self._intercept, self._slope)
+
+        # Account for the spread of observed latencies around the (mean) fit
+        fitted = self._intercept + self._slope * sizes
+        ratios = latencies / np.maximum(fitted, np.finfo(float).eps)
+        self._tail = max(float(np.percentile(ratios, 99)), 1.0)
+
+    def _explore(self):
+        if self.batch_size >= self.max_batch_size:
+            return
+
+        largest_observed = max(batch_size for batch_size, _ in self._samples)
+        if largest_observed > self.batch_size:
+            # We already know how larger batches behave
+            self._batches_since_explore = 0
+            return
+
+        if self.estimate_latency(1) > self.target_latency:
+            # Model is too slow for the target anyway, so larger batches
+            # would only make it worse
+            return
+
+        self._batches_since_explore += 1
+        if self._batches_since_explore < self.explore_every:
+            return
+
+        # Allow a larger batch (just for the next one), so that we can learn
+        # how latency scales with its size
+        self._batches_since_explore = 0
+        self.batch_size = min(self.batch_size * 2, self.max_batch_size)
+        self.batch_time = self.max_batch_time
+
+    def _choose_limits(self) -> Tuple[int, float]:
+        arrival_rate = self.arrival_rate
+        batch_sizes = np.arange(1, self.max_batch_size + 1)
+        latencies = (self._intercept + self._slope * batch_sizes) * self._tail
+
+        # Time needed for the rest of a batch to arrive after its first request
+        if arrival_rate > 0:
+            fill_times = (batch_sizes - 1) / arrival_rate
+        else:
+            fill_times = np.where(batch_sizes > 1, np.inf, 0.0)
+
+        within_target = latencies + fill_times <= self.target_latency
+        if not within_target.any():
+            # Even single requests exceed the target, so don't wait at all
+            return 1, 0.0
+
+        batch_size = int(batch_sizes[within_target][-1])
+        if batch_size == 1:
+            return 1, 0.0
+
+        # Wait as long as the target allows, as the batch will get flushed
+        # anyway as soon as it's full
+        batch_time = self.target_latency - self.estimate_latency(batch_size)
+        return batch_size, float(min(batch_time, self.max_batch_time))
@@ -1,4 +1,12 @@
 from .cache import ResponseCache
 from .local import LocalCache
+from .shared import SharedCache
+from .key import compute_cache_key, namespaced_key
 
-__all__ = ["ResponseCache", "LocalCache"]
+__all__ = [
+    "ResponseCache",
+    "LocalCache",
+    "SharedCache",
+    "compute_cache_key",
+    "namespaced_key",
+]
@@ -1,5 +1,12 @@
+from typing import List, Tuple, Union
+
+# Cached values can be either strings or raw bytes (e.g. pre-serialized
+# responses)
+CacheValue = Union[str, bytes]
+
+
 class ResponseCache:
-    async def insert(self, key: str, value: str):
+    async def insert(self, key: str, value: CacheValue):
         """
         Method responsible for inserting value to cache.
 
@@ -8,15 +15,34 @@ class ResponseCache:
         """
         raise NotImplementedError("insert() method not implemented")
 
-    async def lookup(self, key: str) -> str:
+    async def lookup(self, key: str) -> CacheValue:
         """
         Method responsible for returning key value in the cache.
+        Cache misses should return an empty value.
 
 
         **This method should be overriden to implement your custom cache logic.**
         """
         raise NotImplementedError("lookup() method not implemented")
 
+    async def insert_many(self, items: List[Tuple[str, CacheValue]]):
+        """
+        Method responsible for inserting multiple values to cache.
+        By default, values are inserted one by one, but caches can override it
+        to insert all of them at once (e.g. in a single round-trip).
+        """
+        for key, value in items:
+            await self.insert(key, value)
+
+    async def lookup_many(self, keys: List[str]) -> List[CacheValue]:
+        """
+        Method responsible for returning the values of multiple keys in the
+        cache.
+        By default, keys are looked up one by one, but caches can override it
+        to look up all of them at once (e.g. in a single round-trip).
+        """
+        return [await self.lookup(key) for key in keys]
+
     async def size(self) -> int:
         """
         Method responsible for returning the size of the cache.
@@ -25,3 +51,20 @@ class ResponseCache:
         **This method should be overriden to implement your custom cache logic.**
         """
         raise NotImplementedError("size() method not implemented")
+
+    async def invalidate(self, namespace: str):
+        """
+        Method responsible for dropping all the entries within a namespace
+        (i.e. whose keys have been prefixed with ``namespace``).
+        By default, this is a no-op, as the server will stop looking up the
+        invalidated keys anyway.
+        """
+        return None
+
+    async def close(self):
+        """
+        Method responsible for releasing any resources held by the cache
+        (e.g. open connections or files), once the server shuts down.
+        By default, this is a no-op.
+        """
+        return None
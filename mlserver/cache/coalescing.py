@@ -0,0 +1,48 @@
+import asyncio
+
+from asyncio import Task
+from typing import Any, Callable, Coroutine, Dict
+
+from ..types import InferenceResponse
+
+
+class RequestCoalescer:
+    """
+    Coalesces concurrent identical requests (i.e. requests sharing the same
+    key), so that only one of them gets sent to the model.
+    The rest of requests will wait for the in-flight one to finish, and will
+    then receive their own copy of its response.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    async def run(
+        self, key: str, predict_fn: Callable[[], Coroutine[Any, Any, InferenceResponse]]
+    ) -> InferenceResponse:
+        task = self._in_flight.get(key)
+        if task is None:
+            # NOTE: Run the prediction as a separate task, so that cancelling
+            # the first request (e.g. because its client disconnected) doesn't
+            # cancel the prediction for every other waiting request
+            task = asyncio.create_task(predict_fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._clear(key, task))
+
+        response = await asyncio.shield(task)
+
+        # Each request gets its own copy, as the response will get modified
+        # further down the line (e.g. to set the request ID)
+        return response.copy(deep=True)
+
+    def _clear(self, key: str, task: Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+        if not task.cancelled():
+            # Mark exception as retrieved, in case all waiting requests got
+            # cancelled
+            task.exception()
@@ -0,0 +1,220 @@
+import hashlib
+import json
+import struct
+
+import numpy as np
+
+from typing import Any, Iterable, List, Optional, Union
+
+from ..types import (
+    InferenceRequest,
+    RequestInput,
+    RequestOutput,
+    Parameters,
+    Datatype,
+)
+from ..codecs.string import encode_str
+
+# Size (in bytes) of the digest used as cache key.
+# The hex-encoded key will be twice as long.
+CACHE_KEY_DIGEST_SIZE = 32
+
+# Separator between a key's namespace (e.g. the model name and version) and
+# the rest of the key
+NAMESPACE_SEPARATOR = "/"
+
+_LengthFormat = "<Q"
+_ValueTag = b"\x00"
+_NoneTag = b"\x01"
+_NumericKinds = "biuf"
+
+
+def _get_data(request_input: RequestInput) -> Any:
+    return getattr(request_input.data, "__root__", request_input.data)
+
+
+def _update_field(hasher, value: Union[bytes, memoryview]):
+    # Prefix each field with its length, to ensure that adjacent fields can't
+    # be confused with each other (e.g. `["ab", "c"]` vs `["a", "bc"]`)
+    hasher.update(_ValueTag)
+    hasher.update(struct.pack(_LengthFormat, memoryview(value).nbytes))
+    hasher.update(value)
+
+
+def _update_str(hasher, value: Optional[str]):
+    if value is None:
+        # Use a distinct marker (i.e. different to the empty string) for `None`
+        hasher.update(_NoneTag)
+        return
+
+    _update_field(hasher, encode_str(value))
+
+
+def _flatten(data: Iterable) -> Iterable:
+    for elem in data:
+        if isinstance(elem, (list, tuple)):
+            yield from _flatten(elem)
+        else:
+            yield elem
+
+
+def _update_bytes_tensor(hasher, data: Any):
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        _update_field(hasher, data)
+        return
+
+    if isinstance(data, str):
+        _update_str(hasher, data)
+        return
+
+    for elem in _flatten(data):
+        if isinstance(elem, str):
+            _update_str(hasher, elem)
+        elif isinstance(elem, (bytes, bytearray, memoryview)):
+            _update_field(hasher, elem)
+        else:
+            # Any other element (e.g. NumPy scalars) may not be JSON
+            # serialisable, so it gets tagged with its type instead
+            _update_object(hasher, elem)
+
+
+def _update_object(hasher, elem: Any):
+    # Tag each element with its type, so that e.g. `1` and `"1"` don't hash
+    # the same way
+    _update_str(hasher, type(elem).__name__)
+    if isinstance(elem, np.ndarray):
+        _update_str(hasher, json.dumps(elem.shape))
+        _update_array(hasher, elem)
+    elif isinstance(elem, str):
+        _update_str(hasher, elem)
+    elif isinstance(elem, (bytes, bytearray, memoryview)):
+        _update_field(hasher, elem)
+    else:
+        _update_str(hasher, json.dumps(elem, default=str))
+
+
+def _update_array(hasher, data: np.ndarray):
+    _update_str(hasher, data.dtype.str)
+    if data.dtype.hasobject:
+        # The buffer of `object` arrays only holds pointers to each element,
+        # so these need to get hashed element by element instead
+        for elem in data.flat:
+            _update_object(hasher, elem)
+        return
+
+    # Hash straight from the underlying buffer (copying only if the array is
+    # not contiguous)
+    _update_field(hasher, np.ascontiguousarray(data).data)
+
+
+def _update_tensor(hasher, request_input: RequestInput):
+    data = _get_data(request_input)
+
+    if isinstance(data, np.ndarray):
+        _update_array(hasher, data)
+        return
+
+    if Datatype(request_input.datatype) == Datatype.BYTES:
+        _update_bytes_tensor(hasher, data)
+        return
+
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        # Raw (i.e. already packed) tensor contents
+        _update_field(hasher, data)
+        return
+
+    try:
+        # NOTE: We let NumPy infer the dtype (instead of using the request's
+        # datatype) to ensure the conversion is lossless (e.g. so that
+        # `[1.5]` and `[1]` don't hash to the same key on an `INT32` input).
+        as_array = np.asarray(data)
+    except ValueError:
+        as_array = None
+
+    if as_array is None or as_array.dtype.kind not in _NumericKinds:
+        # If the tensor can't be packed as a contiguous buffer (e.g. if it's
+        # ragged or contains nulls), fall back to its JSON representation
+        _update_str(hasher, json.dumps(data, default=str))
+        return
+
+    _update_array(hasher, as_array)
+
+
+def _update_parameters(hasher, parameters: Optional[Parameters], allowlist: List[str]):
+    if not allowlist:
+        return
+
+    as_dict = parameters.dict() if parameters is not None else {}
+    for name in allowlist:
+        _update_str(hasher, name)
+        if name not in as_dict:
+            _update_str(hasher, None)
+            continue
+
+        value = json.dumps(as_dict[name], sort_keys=True, default=str)
+        _update_str(hasher, value)
+
+
+def _update_outputs(hasher, outputs: Optional[List[RequestOutput]]):
+    if outputs is None:
+        # Requesting every output is not the same as requesting none of them
+        _update_str(hasher, None)
+        return
+
+    _update_str(hasher, str(len(outputs)))
+    for request_output in sorted(outputs, key=lambda output: output.name):
+        _update_str(hasher, request_output.name)
+        parameters = request_output.parameters
+        as_dict = parameters.dict() if parameters is not None else None
+        _update_str(hasher, json.dumps(as_dict, sort_keys=True, default=str))
+
+
+def compute_cache_key(
+    payload: InferenceRequest,
+    name: str,
+    version: Optional[str] = None,
+    parameters: Optional[List[str]] = None,
+) -> str:
+    """
+    Compute a canonical, fixed-size cache key for an inference request.
+
+    The key only takes into account the model name and version, the requested
+    outputs, and the name, datatype, shape and contents of each input.
+    Request-specific fields, like the request ID or the request headers, are
+    ignored.
+    Request and input parameters can be included into the key by listing their
+    names on the ``parameters`` allowlist.
+    """
+    hasher = hashlib.blake2b(digest_size=CACHE_KEY_DIGEST_SIZE)
+
+    _update_str(hasher, name)
+    _update_str(hasher, version)
+    allowlist = parameters or []
+    _update_parameters(hasher, payload.parameters, allowlist)
+    _update_outputs(hasher, payload.outputs)
+
+    for request_input in payload.inputs:
+        _update_str(hasher, request_input.name)
+        _update_str(hasher, Datatype(request_input.datatype).value)
+        _update_str(hasher, json.dumps(request_input.shape))
+        _update_parameters(hasher, request_input.parameters, allowlist)
+        _update_tensor(hasher, request_input)
+
+    return hasher.hexdigest()
+
+
+def namespaced_key(namespace: str, key: str) -> str:
+    """
+    Prefix a cache key with its namespace, so that all the keys within a
+    namespace can be invalidated at once.
+    """
+    return f"{namespace}{NAMESPACE_SEPARATOR}{key}"
+
+
+def get_namespace(key: str) -> str:
+    """
+    Returns the namespace of a cache key (or an empty string if the key is not
+    namespaced).
+    """
+    namespace, _, _ = key.rpartition(NAMESPACE_SEPARATOR)
+    return namespace
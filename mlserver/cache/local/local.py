@@ -1,25 +1,133 @@
-from collections import OrderedDict
-from ..cache import ResponseCache
+import sys
+import time
+
+from collections import OrderedDict, defaultdict
+from typing import DefaultDict, NamedTuple, Optional, Set
+
+from ..cache import ResponseCache, CacheValue
+from ..key import get_namespace
+from ..metrics import CacheMetrics
+
+
+class _CacheEntry(NamedTuple):
+    value: CacheValue
+    nbytes: int
+    expires_at: Optional[float]
+
+
+def _sizeof(key: str, value: CacheValue) -> int:
+    return sys.getsizeof(key) + sys.getsizeof(value)
 
 
 class LocalCache(ResponseCache):
-    def __init__(self, size=100):
-        self.cache = OrderedDict()
+    """
+    In-process response cache, which evicts entries in LRU order.
+
+    The cache is bounded both by number of entries (``size``) and, optionally,
+    by the total size in bytes of the cached keys and values (``max_bytes``).
+    Entries can also expire after a given number of seconds (``ttl``).
+    """
+
+    def __init__(
+        self,
+        size: int = 100,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.cache: OrderedDict[str, _CacheEntry] = OrderedDict()
         self.size_limit = size
+        self.ttl = ttl
+        self.max_bytes = max_bytes
 
-    async def insert(self, key: str, value: str):
-        self.cache[key] = value
-        cache_size = await self.size()
-        if cache_size > self.size_limit:
-            # The cache removes the first entry if it overflows (i.e. in FIFO order)
-            self.cache.popitem(last=False)
-        return None
+        self._nbytes = 0
+        self._namespaces: DefaultDict[str, Set[str]] = defaultdict(set)
+        self._metrics = CacheMetrics(cache_name="local")
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Approximate size (in bytes) of the entries currently in the cache.
+        """
+        return self._nbytes
 
-    async def lookup(self, key: str) -> str:
+    async def insert(self, key: str, value: CacheValue):
         if key in self.cache:
-            return self.cache[key]
-        else:
+            self._remove(key)
+
+        nbytes = _sizeof(key, value)
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            # Entries larger than the whole budget are never admitted, as they
+            # would just flush the rest of the cache
+            self._update_usage()
+            return None
+
+        expires_at = None
+        if self.ttl is not None:
+            expires_at = time.monotonic() + self.ttl
+
+        self.cache[key] = _CacheEntry(value, nbytes, expires_at)
+        self._nbytes += nbytes
+        self._namespaces[get_namespace(key)].add(key)
+
+        while self._should_evict():
+            # The least recently used entry is always at the front
+            oldest_key = next(iter(self.cache))
+            self._evict(oldest_key)
+
+        self._update_usage()
+        return None
+
+    async def lookup(self, key: str) -> CacheValue:
+        entry = self.cache.get(key)
+        if entry is None:
+            self._metrics.misses.inc()
+            return ""
+
+        if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            self._evict(key)
+            self._update_usage()
+            self._metrics.misses.inc()
             return ""
 
+        # Promote entry to most recently used
+        self.cache.move_to_end(key)
+        self._metrics.hits.inc()
+        return entry.value
+
     async def size(self) -> int:
         return len(self.cache)
+
+    async def invalidate(self, namespace: str):
+        keys = self._namespaces.pop(namespace, set())
+        for key in keys:
+            entry = self.cache.pop(key)
+            self._nbytes -= entry.nbytes
+
+        self._update_usage()
+
+    def _should_evict(self) -> bool:
+        if len(self.cache) > self.size_limit:
+            return True
+
+        if self.max_bytes is not None and self._nbytes > self.max_bytes:
+            return True
+
+        return False
+
+    def _evict(self, key: str):
+        self._remove(key)
+        self._metrics.evictions.inc()
+
+    def _remove(self, key: str):
+        entry = self.cache.pop(key)
+        self._nbytes -= entry.nbytes
+
+        namespace = get_namespace(key)
+        keys = self._namespaces[namespace]
+        keys.discard(key)
+        if not keys:
+            del self._namespaces[namespace]
+
+    def _update_usage(self):
+        self._metrics.entries.set(len(self.cache))
+        self._metrics.bytes.set(self._nbytes)
@@ -0,0 +1,61 @@
+from prometheus_client import Counter, Gauge
+from prometheus_client.metrics import MetricWrapperBase
+from typing import Type, TypeVar
+
+from ..metrics import REGISTRY
+
+CACHE_LABEL = "cache"
+
+_Metric = TypeVar("_Metric", bound=MetricWrapperBase)
+
+
+def _get_or_create_metric(
+    metric_class: Type[_Metric], name: str, description: str
+) -> _Metric:
+    if name in REGISTRY:
+        return REGISTRY[name]  # type: ignore
+
+    return metric_class(
+        name,
+        description,
+        labelnames=[CACHE_LABEL],
+        registry=REGISTRY,
+    )
+
+
+class CacheMetrics:
+    """
+    Prometheus metrics shared by the different response cache
+    implementations.
+    Each implementation gets its own set of series, labelled by its name.
+    """
+
+    def __init__(self, cache_name: str):
+        labels = {CACHE_LABEL: cache_name}
+
+        self.hits = _get_or_create_metric(
+            Counter, "response_cache_hits", "Number of response cache hits"
+        ).labels(**labels)
+        self.misses = _get_or_create_metric(
+            Counter, "response_cache_misses", "Number of response cache misses"
+        ).labels(**labels)
+        self.evictions = _get_or_create_metric(
+            Counter,
+            "response_cache_evictions",
+            "Number of entries evicted (or expired) from the response cache",
+        ).labels(**labels)
+        self.errors = _get_or_create_metric(
+            Counter,
+            "response_cache_errors",
+            "Number of failed (or timed out) response cache operations",
+        ).labels(**labels)
+        self.entries = _get_or_create_metric(
+            Gauge,
+            "response_cache_entries",
+            "Number of entries currently held in the response cache",
+        ).labels(**labels)
+        self.bytes = _get_or_create_metric(
+            Gauge,
+            "response_cache_bytes",
+            "Approximate size (in bytes) of the entries held in the response cache",
+        ).labels(**labels)
@@ -0,0 +1,78 @@
+from asyncio import StreamReader
+from typing import Any, List, Union
+
+# Minimal implementation of the Redis serialisation protocol (RESP2), which is
+# spoken by Redis and its compatible alternatives (e.g. KeyDB).
+CRLF = b"\r\n"
+
+Arg = Union[str, bytes, int, float]
+
+
+class RedisError(Exception):
+    """
+    Error reply returned by the server.
+    """
+
+
+def _to_bytes(arg: Arg) -> bytes:
+    if isinstance(arg, bytes):
+        return arg
+
+    if isinstance(arg, str):
+        return arg.encode("utf-8")
+
+    return str(arg).encode("utf-8")
+
+
+def encode_command(*args: Arg) -> bytes:
+    """
+    Encode a command as an array of bulk strings.
+    """
+    chunks = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        as_bytes = _to_bytes(arg)
+        chunks.append(b"$%d\r\n" % len(as_bytes))
+        chunks.append(as_bytes)
+        chunks.append(CRLF)
+
+    return b"".join(chunks)
+
+
+async def read_reply(reader: StreamReader) -> Any:
+    """
+    Read a single reply from the server.
+    Error replies are returned (instead of raised) as ``RedisError`` objects,
+    so that they don't break the rest of a pipeline.
+    """
+    line = await reader.readuntil(CRLF)
+    prefix, body = line[:1], line[1:-2]
+
+    if prefix == b"+":
+        return body.decode("utf-8")
+
+    if prefix == b"-":
+        return RedisError(body.decode("utf-8"))
+
+    if prefix == b":":
+        return int(body)
+
+    if prefix == b"$":
+        length = int(body)
+        if length == -1:
+            return None
+
+        data = await reader.readexactly(length + len(CRLF))
+        return data[:-2]
+
+    if prefix == b"*":
+        length = int(body)
+        if length == -1:
+            return None
+
+        items: List[Any] = []
+        for _ in range(length):
+            items.append(await read_reply(reader))
+
+        return items
+
+    raise RedisError(f"Unknown reply type: {line!r}")
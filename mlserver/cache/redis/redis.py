@@ -0,0 +1,463 @@
+import asyncio
+import zlib
+
+from asyncio import Future, StreamReader, StreamWriter, Task
+from collections import deque
+from functools import partial
+from itertools import count
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from ...logging import logger
+from ..cache import ResponseCache, CacheValue
+from ..key import NAMESPACE_SEPARATOR
+from ..metrics import CacheMetrics
+from .protocol import Arg, RedisError, encode_command, read_reply
+
+# Flags stored in the first byte of each value
+_FlagBytes = 0x01
+_FlagCompressed = 0x02
+
+_GlobSpecialChars = "\\*?[]^-"
+_ScanCount = 1000
+
+
+def _escape_glob(pattern: str) -> str:
+    return "".join(
+        f"\\{char}" if char in _GlobSpecialChars else char for char in pattern
+    )
+
+
+class _Connection:
+    """
+    Connection to a Redis server, which supports pipelining.
+    That is, commands get written as soon as they are sent (without waiting
+    for the replies to previous commands), and replies are then matched to
+    their commands in order by a background reader task.
+    """
+
+    def __init__(self, reader: StreamReader, writer: StreamWriter):
+        self._reader = reader
+        self._writer = writer
+
+        # Pending replies, in the same order as their commands were sent.
+        # Replies which nobody is waiting for are tracked as `None`.
+        self._pending: Deque[Optional[Future]] = deque()
+        self._reader_task: Task = asyncio.create_task(self._read_replies())
+
+    @property
+    def closed(self) -> bool:
+        return self._reader_task.done()
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of commands whose reply hasn't been received yet.
+        """
+        return len(self._pending)
+
+    @property
+    def buffer_size(self) -> int:
+        """
+        Number of bytes which have been written but not yet flushed to the
+        server.
+        """
+        return self._writer.transport.get_write_buffer_size()
+
+    def send(
+        self, commands: Iterable[Tuple[Arg, ...]], wait: bool = True
+    ) -> List[Future]:
+        """
+        Write a pipeline of commands.
+        If ``wait`` is set, returns a future for each command's reply.
+        Otherwise, the replies will get discarded.
+        """
+        if self.closed:
+            raise ConnectionError("Connection to Redis server is closed")
+
+        loop = asyncio.get_running_loop()
+        futures = []
+        chunks = []
+        for command in commands:
+            chunks.append(encode_command(*command))
+            if wait:
+                future = loop.create_future()
+                futures.append(future)
+                self._pending.append(future)
+            else:
+                self._pending.append(None)
+
+        self._writer.write(b"".join(chunks))
+        return futures
+
+    async def drain(self):
+        await self._writer.drain()
+
+    async def execute(self, *commands: Tuple[Arg, ...]) -> list:
+        futures = self.send(commands)
+        await self.drain()
+        return await asyncio.gather(*futures)
+
+    async def _read_replies(self):
+        try:
+            while True:
+                reply = await read_reply(self._reader)
+                future = self._pending.popleft()
+                if future is not None and not future.done():
+                    future.set_result(reply)
+        except Exception as err:
+            if not isinstance(err, asyncio.IncompleteReadError):
+                logger.debug(f"Lost connection to Redis server: {err}")
+
+            self._fail_pending(ConnectionError("Connection to Redis server lost"))
+        finally:
+            self._writer.close()
+
+    def _fail_pending(self, err: Exception):
+        while self._pending:
+            future = self._pending.popleft()
+            if future is not None and not future.done():
+                future.set_exception(err)
+
+    async def close(self):
+        self._reader_task.cancel()
+        try:
+            await self._reader_task
+        except asyncio.CancelledError:
+            pass
+
+        self._fail_pending(ConnectionError("Connection to Redis server closed"))
+
+
+class RedisCache(ResponseCache):
+    """
+    Response cache backed by a Redis-compatible server (e.g. Redis or KeyDB),
+    which lets multiple MLServer replicas share the same cache.
+
+    Commands are pipelined over a fixed-size pool of connections, which get
+    (re)opened lazily.
+    Each key is always sent over the same connection, so that a lookup will
+    always see any earlier insert of the same key.
+    Values larger than ``compression_threshold`` bytes get compressed with
+    ``zlib``.
+
+    To ensure a slow (or unavailable) cache never slows down inference,
+    lookups which take longer than ``lookup_timeout`` seconds are treated as
+    misses, and inserts don't wait for the server's reply.
+    Instead, inserts only wait (up to ``insert_timeout`` seconds) for their
+    writes to get flushed, and get dropped when a connection already holds
+    more than ``max_buffer_size`` unflushed bytes (or more than
+    ``max_pending`` commands waiting for a reply).
+    Invalidations run in the background.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        key_prefix: str = "mlserver:",
+        ttl: Optional[float] = None,
+        pool_size: int = 4,
+        connect_timeout: float = 1.0,
+        lookup_timeout: float = 0.05,
+        insert_timeout: float = 0.05,
+        max_buffer_size: int = 16 * 1024 * 1024,
+        max_pending: int = 10000,
+        compression_threshold: int = 1024,
+        compression_level: int = 1,
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.key_prefix = key_prefix
+        self.ttl = ttl
+        self.connect_timeout = connect_timeout
+        self.lookup_timeout = lookup_timeout
+        self.insert_timeout = insert_timeout
+        self.max_buffer_size = max_buffer_size
+        self.max_pending = max_pending
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+
+        self._pool: List[Optional[_Connection]] = [None] * max(1, pool_size)
+        self._connecting: Dict[int, Task] = {}
+        self._next_connection = count()
+        self._invalidations: Set[Task] = set()
+
+        self._metrics = CacheMetrics(cache_name="redis")
+
+    def _encode(self, value: CacheValue) -> bytes:
+        flags = 0
+        if isinstance(value, bytes):
+            flags |= _FlagBytes
+            payload = value
+        else:
+            payload = value.encode("utf-8")
+
+        if len(payload) >= self.compression_threshold:
+            compressed = zlib.compress(payload, self.compression_level)
+            if len(compressed) < len(payload):
+                flags |= _FlagCompressed
+                payload = compressed
+
+        return bytes([flags]) + payload
+
+    def _decode(self, data: bytes) -> CacheValue:
+        flags = data[0]
+        payload = data[1:]
+        if flags & _FlagCompressed:
+            payload = zlib.decompress(payload)
+
+        if flags & _FlagBytes:
+            return payload
+
+        return payload.decode("utf-8")
+
+    def _set_command(self, key: str, value: CacheValue) -> Tuple[Arg, ...]:
+        command: Tuple[Arg, ...] = ("SET", self.key_prefix + key, self._encode(value))
+        if self.ttl is not None:
+            command += ("PX", int(self.ttl * 1000))
+
+        return command
+
+    def _get_connection_idx(self, key: str) -> int:
+        return zlib.crc32(key.encode("utf-8")) % len(self._pool)
+
+    def _group_by_connection(self, keys: Iterable[str]) -> Dict[int, List[int]]:
+        """
+        Returns the positions of the given keys, grouped by the index of the
+        connection where they should be sent.
+        """
+        groups: Dict[int, List[int]] = {}
+        for pos, key in enumerate(keys):
+            groups.setdefault(self._get_connection_idx(key), []).append(pos)
+
+        return groups
+
+    async def _get_connection(self, idx: Optional[int] = None) -> _Connection:
+        if idx is None:
+            idx = next(self._next_connection) % len(self._pool)
+
+        connection = self._pool[idx]
+        if connection is not None and not connection.closed:
+            return connection
+
+        # NOTE: Connections get opened on a separate task, shared by every
+        # caller and shielded from their cancellation, so that a caller timing
+        # out (e.g. on a lookup) doesn't leave a half-open connection behind
+        connecting = self._connecting.get(idx)
+        if connecting is None:
+            connecting = asyncio.create_task(self._connect())
+            connecting.add_done_callback(partial(self._on_connect, idx))
+            self._connecting[idx] = connecting
+
+        return await asyncio.shield(connecting)
+
+    def _on_connect(self, idx: int, connecting: Task):
+        del self._connecting[idx]
+        if connecting.cancelled():
+            return
+
+        err = connecting.exception()
+        if err is not None:
+            logger.debug(f"Failed to connect to Redis server: {err}")
+            return
+
+        self._pool[idx] = connecting.result()
+
+    async def _connect(self) -> _Connection:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.connect_timeout
+        )
+        connection = _Connection(reader, writer)
+
+        commands: List[Tuple[Arg, ...]] = []
+        if self.password is not None:
+            commands.append(("AUTH", self.password))
+        if self.db:
+            commands.append(("SELECT", self.db))
+
+        try:
+            if commands:
+                replies = await asyncio.wait_for(
+                    connection.execute(*commands), self.connect_timeout
+                )
+                for reply in replies:
+                    if isinstance(reply, RedisError):
+                        raise reply
+        except BaseException:
+            await connection.close()
+            raise
+
+        return connection
+
+    async def insert(self, key: str, value: CacheValue):
+        await self.insert_many([(key, value)])
+
+    async def insert_many(self, items: List[Tuple[str, CacheValue]]):
+        try:
+            groups = self._group_by_connection(key for key, _ in items)
+            connections = [await self._get_connection(idx) for idx in groups]
+            for connection, positions in zip(connections, groups.values()):
+                if connection.buffer_size > self.max_buffer_size:
+                    raise ConnectionError("Too many unflushed writes to Redis server")
+
+                if connection.pending + len(positions) > self.max_pending:
+                    raise ConnectionError("Too many pending replies from Redis server")
+
+                # NOTE: Don't wait for the server to acknowledge the write, but
+                # still keep track of any errors
+                futures = connection.send(
+                    [self._set_command(*items[pos]) for pos in positions]
+                )
+                for future in futures:
+                    future.add_done_callback(self._check_insert)
+
+            await asyncio.wait_for(
+                asyncio.gather(*[connection.drain() for connection in connections]),
+                self.insert_timeout,
+            )
+        except Exception as err:
+            # ignore cache insertion error if any
+            logger.debug(f"Failed to insert entries into Redis cache: {err}")
+            self._metrics.errors.inc()
+
+    def _check_insert(self, future: Future):
+        if future.cancelled():
+            return
+
+        err = future.exception() or future.result()
+        if isinstance(err, Exception):
+            logger.debug(f"Failed to insert entry into Redis cache: {err}")
+            self._metrics.errors.inc()
+
+    async def lookup(self, key: str) -> CacheValue:
+        values = await self.lookup_many([key])
+        return values[0]
+
+    async def lookup_many(self, keys: List[str]) -> List[CacheValue]:
+        try:
+            replies = await asyncio.wait_for(self._get(keys), self.lookup_timeout)
+        except Exception as err:
+            # Treat timeouts (and any other error) as misses
+            logger.debug(f"Failed to look up entries in Redis cache: {err}")
+            self._metrics.errors.inc()
+            self._metrics.misses.inc(len(keys))
+            return [""] * len(keys)
+
+        values: List[CacheValue] = []
+        for reply in replies:
+            if isinstance(reply, bytes) and reply:
+                self._metrics.hits.inc()
+                values.append(self._decode(reply))
+            else:
+                self._metrics.misses.inc()
+                values.append("")
+
+        return values
+
+    async def _get(self, keys: List[str]) -> list:
+        groups = self._group_by_connection(keys)
+        group_replies = await asyncio.gather(
+            *[
+                self._get_group(idx, [keys[pos] for pos in positions])
+                for idx, positions in groups.items()
+            ]
+        )
+
+        replies: list = [None] * len(keys)
+        for positions, group in zip(groups.values(), group_replies):
+            for pos, reply in zip(positions, group):
+                replies[pos] = reply
+
+        return replies
+
+    async def _get_group(self, idx: int, keys: List[str]) -> list:
+        connection = await self._get_connection(idx)
+        commands = [("GET", self.key_prefix + key) for key in keys]
+        return await connection.execute(*commands)
+
+    async def _sync(self):
+        """
+        Wait until every command already sent to the server (over any of the
+        open connections) has been processed.
+        """
+        connections = [
+            connection
+            for connection in self._pool
+            if connection is not None and not connection.closed
+        ]
+        await asyncio.gather(
+            *[connection.execute(("PING",)) for connection in connections]
+        )
+
+    async def _scan(self, pattern: str) -> List[bytes]:
+        # NOTE: Ensure any earlier inserts (which may have been sent over a
+        # different connection) are visible to the scan
+        await self._sync()
+
+        connection = await self._get_connection()
+        keys = []
+        cursor = b"0"
+        while True:
+            (reply,) = await connection.execute(
+                ("SCAN", cursor, "MATCH", pattern, "COUNT", _ScanCount)
+            )
+            if isinstance(reply, RedisError):
+                raise reply
+
+            cursor, batch = reply
+            keys.extend(batch)
+            if cursor == b"0":
+                return keys
+
+    async def size(self) -> int:
+        try:
+            keys = await self._scan(_escape_glob(self.key_prefix) + "*")
+        except Exception as err:
+            logger.debug(f"Failed to get the size of the Redis cache: {err}")
+            self._metrics.errors.inc()
+            return 0
+
+        return len(keys)
+
+    async def invalidate(self, namespace: str):
+        # NOTE: Scanning the keyspace can take a while, so run it in the
+        # background, to avoid blocking the model's reload (or unload)
+        task = asyncio.create_task(self._invalidate(namespace))
+        self._invalidations.add(task)
+        task.add_done_callback(self._invalidations.discard)
+
+    async def _invalidate(self, namespace: str):
+        pattern = _escape_glob(self.key_prefix + namespace + NAMESPACE_SEPARATOR)
+        try:
+            keys = await self._scan(pattern + "*")
+            if not keys:
+                return
+
+            connection = await self._get_connection()
+            for start in range(0, len(keys), _ScanCount):
+                (reply,) = await connection.execute(
+                    ("DEL", *keys[start : start + _ScanCount])
+                )
+                if isinstance(reply, RedisError):
+                    raise reply
+        except Exception as err:
+            logger.warning(
+                f"Failed to invalidate namespace {namespace} in Redis cache: {err}"
+            )
+            self._metrics.errors.inc()
+
+    async def close(self):
+        tasks = [*self._invalidations, *self._connecting.values()]
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        for idx, connection in enumerate(self._pool):
+            if connection is not None:
+                await connection.close()
+                self._pool[idx] = None
@@ -0,0 +1,323 @@
+import numpy as np
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+from weakref import WeakSet
+
+from ..batching.requests import _get_data, _get_row_stride, _merge_data, _split_data
+from ..batching.shape import Shape
+from ..model import MLModel
+from ..types import (
+    InferenceRequest,
+    InferenceResponse,
+    RequestInput,
+    ResponseOutput,
+    TensorData,
+)
+from .cache import ResponseCache
+from .key import compute_cache_key, namespaced_key
+
+PredictFn = Callable[[InferenceRequest], Awaitable[InferenceResponse]]
+
+
+def _split_rows(
+    payload: Union[RequestInput, ResponseOutput], num_rows: Optional[int] = None
+) -> Optional[List[Any]]:
+    """
+    Split a tensor's data along the batch dimension.
+    Returns `None` if the data can't be split (e.g. if it has been packed as
+    raw bytes, or if its batch size doesn't match ``num_rows``).
+    """
+    data = _get_data(payload)
+    if not isinstance(data, (list, np.ndarray)) or not payload.shape:
+        return None
+
+    shape = Shape(payload.shape)
+    if num_rows is None:
+        num_rows = shape.batch_size
+
+    if shape.batch_size != num_rows:
+        return None
+
+    stride = _get_row_stride(data, shape, num_rows)
+    if len(data) != num_rows * stride:
+        return None
+
+    return _split_data(data, stride, [1] * num_rows)
+
+
+def _merge_rows(rows: List[Any]) -> Any:
+    if not all(isinstance(row, np.ndarray) for row in rows):
+        # NOTE: Rows coming from the cache will always be lists, so any
+        # arrays (e.g. views over the model's outputs) need to get converted
+        # before they can be merged with them
+        rows = [row.tolist() if isinstance(row, np.ndarray) else row for row in rows]
+
+    return _merge_data(rows)
+
+
+def _with_batch_size(shape: List[int], batch_size: int) -> List[int]:
+    as_shape = Shape(shape)
+    as_shape.batch_size = batch_size
+    return as_shape.to_list()
+
+
+class RowRequests:
+    """
+    View of an inference request as a list of single-row requests (i.e. split
+    along the batch dimension), which can be cached individually.
+    """
+
+    def __init__(self, payload: InferenceRequest, all_rows: List[List[Any]]):
+        self._payload = payload
+        self._all_rows = all_rows
+
+    @classmethod
+    def from_request(cls, payload: InferenceRequest) -> Optional["RowRequests"]:
+        """
+        Split an inference request into rows.
+        Returns `None` if the request can't be split (e.g. if its inputs have
+        different batch sizes).
+        """
+        if not payload.inputs:
+            return None
+
+        all_rows = []
+        for request_input in payload.inputs:
+            rows = _split_rows(request_input)
+            if rows is None:
+                return None
+
+            all_rows.append(rows)
+
+        num_rows = len(all_rows[0])
+        if any(len(rows) != num_rows for rows in all_rows):
+            return None
+
+        return cls(payload, all_rows)
+
+    def __len__(self) -> int:
+        return len(self._all_rows[0])
+
+    def take(self, indices: List[int]) -> InferenceRequest:
+        """
+        Build a new request out of a subset of rows.
+        """
+        inputs = []
+        for request_input, rows in zip(self._payload.inputs, self._all_rows):
+            data = _merge_rows([rows[idx] for idx in indices])
+            inputs.append(
+                RequestInput(
+                    name=request_input.name,
+                    shape=_with_batch_size(request_input.shape, len(indices)),
+                    datatype=request_input.datatype,
+                    parameters=request_input.parameters,
+                    data=data,
+                )
+            )
+
+        return InferenceRequest(
+            id=self._payload.id,
+            parameters=self._payload.parameters,
+            inputs=inputs,
+            outputs=self._payload.outputs,
+        )
+
+    def cache_keys(self, model: MLModel, namespace: str) -> List[str]:
+        keys = []
+        for idx in range(len(self)):
+            # NOTE: Skip validation, as we only need the request to compute
+            # its cache key
+            row_inputs = [
+                RequestInput.construct(
+                    name=request_input.name,
+                    shape=_with_batch_size(request_input.shape, 1),
+                    datatype=request_input.datatype,
+                    parameters=request_input.parameters,
+                    data=TensorData.construct(__root__=rows[idx]),
+                )
+                for request_input, rows in zip(self._payload.inputs, self._all_rows)
+            ]
+            row_request = InferenceRequest.construct(
+                parameters=self._payload.parameters, inputs=row_inputs
+            )
+            cache_key = compute_cache_key(
+                row_request,
+                name=model.name,
+                version=model.version,
+                parameters=model.settings.cache_key_parameters,
+            )
+            keys.append(namespaced_key(namespace, cache_key))
+
+        return keys
+
+
+def split_response(
+    response: InferenceResponse, num_rows: int
+) -> Optional[List[InferenceResponse]]:
+    """
+    Split an inference response into single-row responses.
+    Returns `None` if the response's outputs don't preserve the batch
+    dimension of the request.
+    """
+    all_rows = []
+    for response_output in response.outputs:
+        rows = _split_rows(response_output, num_rows)
+        if rows is None:
+            return None
+
+        all_rows.append(rows)
+
+    return [
+        InferenceResponse(
+            model_name=response.model_name,
+            model_version=response.model_version,
+            parameters=response.parameters,
+            outputs=[
+                ResponseOutput(
+                    name=response_output.name,
+                    shape=_with_batch_size(response_output.shape, 1),
+                    datatype=response_output.datatype,
+                    parameters=response_output.parameters,
+                    data=rows[idx],
+                )
+                for response_output, rows in zip(response.outputs, all_rows)
+            ],
+        )
+        for idx in range(num_rows)
+    ]
+
+
+def merge_responses(responses: List[InferenceResponse]) -> InferenceResponse:
+    """
+    Stitch a list of single-row responses back together (in order).
+    """
+    sampled = responses[0]
+    outputs = []
+    for output_idx, response_output in enumerate(sampled.outputs):
+        data = _merge_rows(
+            [_get_data(response.outputs[output_idx]) for response in responses]
+        )
+        outputs.append(
+            ResponseOutput(
+                name=response_output.name,
+                shape=_with_batch_size(response_output.shape, len(responses)),
+                datatype=response_output.datatype,
+                parameters=response_output.parameters,
+                data=data,
+            )
+        )
+
+    return InferenceResponse(
+        id=sampled.id,
+        model_name=sampled.model_name,
+        model_version=sampled.model_version,
+        parameters=sampled.parameters,
+        outputs=outputs,
+    )
+
+
+class RowPredictor:
+    """
+    Runs inference using a row-level cache, keeping track of which models
+    return outputs that can be split into rows.
+    """
+
+    def __init__(self):
+        # Models whose outputs have been split into rows, which can thus get
+        # sent only the rows missing from the cache
+        self._splittable_models: "WeakSet[MLModel]" = WeakSet()
+        # Models whose outputs couldn't be split into rows, which thus can't
+        # use the row-level cache
+        self._unsplittable_models: "WeakSet[MLModel]" = WeakSet()
+
+    async def predict(
+        self,
+        model: MLModel,
+        payload: InferenceRequest,
+        response_cache: ResponseCache,
+        namespace: str,
+        is_current: Callable[[], bool] = lambda: True,
+        predict: Optional[PredictFn] = None,
+    ) -> InferenceResponse:
+        """
+        Run inference using a row-level cache.
+        That is, the request gets split along its batch dimension and only the
+        rows missing from the cache get sent to the model (through ``predict``,
+        which defaults to ``model.predict``).
+        The model's outputs then get stitched back together with the cached
+        rows.
+        The new rows only get cached if ``is_current()`` still holds once the
+        model has returned (i.e. if the namespace hasn't been invalidated in the
+        meantime).
+        """
+        if predict is None:
+            predict = model.predict
+
+        if model in self._unsplittable_models:
+            return await predict(payload)
+
+        row_requests = RowRequests.from_request(payload)
+        if row_requests is None:
+            return await predict(payload)
+
+        keys = row_requests.cache_keys(model, namespace)
+        responses: Dict[int, InferenceResponse] = {}
+        missing = []
+        cache_values = await response_cache.lookup_many(keys)
+        for idx, cache_value in enumerate(cache_values):
+            if cache_value:
+                responses[idx] = InferenceResponse.parse_raw(cache_value)
+            else:
+                missing.append(idx)
+
+        if not missing:
+            return merge_responses([responses[idx] for idx in range(len(keys))])
+
+        # NOTE: Until the model's outputs have been split into rows at least
+        # once, we can't know whether a prediction over a subset of rows could
+        # get merged with the cached ones, so the whole request gets sent instead
+        is_full = len(missing) == len(keys) or model not in self._splittable_models
+        if is_full:
+            prediction = await predict(payload)
+            predicted = list(range(len(keys)))
+        else:
+            prediction = await predict(row_requests.take(missing))
+            predicted = missing
+
+        row_responses = split_response(prediction, len(predicted))
+        if row_responses is None:
+            # If the model's outputs can't be split into rows, we can't use the
+            # row-level cache, so we stop using it for this model altogether
+            self._splittable_models.discard(model)
+            self._unsplittable_models.add(model)
+            if is_full:
+                # The prediction already covers the whole request, so we just
+                # return it without caching it
+                return prediction
+
+            # NOTE: This can only happen if a model's outputs stop preserving the
+            # batch dimension after having done so before (and thus only once per
+            # model), as the prediction over a subset of rows can't get merged
+            # with the cached ones
+            return await predict(payload)
+
+        self._splittable_models.add(model)
+        for idx, row_response in zip(predicted, row_responses):
+            responses[idx] = row_response
+
+        if is_current():
+            # ignore cache insertion error if any
+            await response_cache.insert_many(
+                [
+                    (keys[idx], row_response.json())
+                    for idx, row_response in zip(predicted, row_responses)
+                ]
+            )
+
+        if is_full:
+            return prediction
+
+        merged = merge_responses([responses[idx] for idx in range(len(keys))])
+        merged.id = prediction.id
+        merged.parameters = prediction.parameters
+        return merged
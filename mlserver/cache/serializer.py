@@ -0,0 +1,77 @@
+import json
+import struct
+
+from typing import Dict, Generic, Optional, Tuple, TypeVar
+
+from ..types import InferenceResponse
+
+_LengthFormat = "<I"
+_LengthSize = struct.calcsize(_LengthFormat)
+
+Serialized = TypeVar("Serialized")
+
+
+class ResponseSerializer(Generic[Serialized]):
+    """
+    Base class for protocol-specific serializers, which convert inference
+    responses into the representation sent back to clients (e.g. the JSON
+    body of a REST response).
+
+    Serialized responses can then be cached as raw bytes, so that cache hits
+    can be served without going through the ``InferenceResponse`` model.
+    To make cached entries shareable across requests, serialized responses
+    never include the response ID, which gets patched in afterwards through
+    the ``with_id()`` method.
+    """
+
+    name: str = ""
+    """Name of the serializer, used to namespace its cache entries."""
+
+    def serialize(self, response: InferenceResponse) -> Serialized:
+        """
+        Serialize an inference response, ignoring its ``id`` field.
+        """
+        raise NotImplementedError("serialize() method not implemented")
+
+    def with_id(self, serialized: Serialized, response_id: Optional[str]) -> Serialized:
+        """
+        Patch the response ID into an already serialized response.
+        """
+        raise NotImplementedError("with_id() method not implemented")
+
+    def dumps(self, serialized: Serialized) -> bytes:
+        """
+        Convert a serialized response into bytes, so that it can be cached.
+        """
+        raise NotImplementedError("dumps() method not implemented")
+
+    def loads(self, data: bytes) -> Serialized:
+        """
+        Convert bytes returned by ``dumps()`` back into a serialized response.
+        """
+        raise NotImplementedError("loads() method not implemented")
+
+
+def pack_response(body: bytes, headers: Optional[Dict[str, str]]) -> bytes:
+    """
+    Pack a serialized response body, alongside the response headers returned
+    by the model, into a single cache entry.
+    """
+    packed_headers = json.dumps(headers).encode("utf-8") if headers else b""
+    return b"".join(
+        [struct.pack(_LengthFormat, len(packed_headers)), packed_headers, body]
+    )
+
+
+def unpack_response(data: bytes) -> Tuple[bytes, Optional[Dict[str, str]]]:
+    """
+    Unpack a cache entry created with ``pack_response()``.
+    """
+    (headers_length,) = struct.unpack_from(_LengthFormat, data)
+    body_start = _LengthSize + headers_length
+
+    headers = None
+    if headers_length:
+        headers = json.loads(data[_LengthSize:body_start])
+
+    return data[body_start:], headers
@@ -0,0 +1,3 @@
+from .shared import SharedCache
+
+__all__ = ["SharedCache"]
@@ -0,0 +1,407 @@
+import asyncio
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+from ..cache import ResponseCache, CacheValue
+from ..key import get_namespace
+from ..metrics import CacheMetrics
+
+# NOTE: The file name includes the cache's layout, so that instances with
+# different settings never share (and never reinitialise) the same file, which
+# other processes may have memory-mapped
+CACHE_FILENAME = "response-cache-v{version}-{buckets}x{ways}x{entry_bytes}.bin"
+DEFAULT_ENTRY_BYTES = 64 * 1024
+DEFAULT_WAYS = 4
+
+_Magic = b"MLSCACHE"
+_FormatVersion = 3
+
+# File header: magic, format version, number of buckets, ways per bucket and
+# maximum payload size per entry
+_HeaderFormat = "<8sIIII"
+_HeaderSize = 64
+
+# Slot header: sequence number, key digest, expiry timestamp, last access
+# timestamp, payload length, whether the payload holds raw bytes (instead of
+# an encoded string) and namespace digest
+_SlotFormat = "<Q16sddI?3x8s"
+_SlotHeaderSize = struct.calcsize(_SlotFormat)
+_SeqFormat = "<Q"
+_AccessedFormat = "<d"
+_AccessedOffset = 8 + 16 + 8
+
+_EmptyDigest = bytes(16)
+_ReadRetries = 3
+
+
+def _digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+def _namespace_digest(namespace: str) -> bytes:
+    return hashlib.blake2b(namespace.encode("utf-8"), digest_size=8).digest()
+
+
+def _align(size: int, alignment: int = 8) -> int:
+    return (size + alignment - 1) // alignment * alignment
+
+
+class SharedCache(ResponseCache):
+    """
+    Response cache backed by a memory-mapped file, which can be shared across
+    multiple MLServer processes running on the same node.
+    Since the cache lives on disk, it will also survive server restarts.
+
+    Under the hood, the file holds a set-associative hash table with a fixed
+    number of slots (i.e. ``size``), each of which can hold a response of up
+    to ``max_bytes / size`` bytes (64KiB by default).
+    Within each set, entries get evicted in LRU order.
+
+    Reads are lock-free: each slot is guarded by a sequence counter (i.e. a
+    seqlock), which lets readers detect (and retry) concurrent writes.
+    Writes are serialised across processes through an exclusive ``flock`` on
+    the cache file.
+    To avoid blocking the event loop, inserts which find the lock taken (as
+    well as invalidations, which need to scan every slot) run on a separate
+    thread.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        size: int = 100,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        ways: int = DEFAULT_WAYS,
+    ):
+        self.ttl = ttl
+        self._ways = max(1, min(ways, size))
+        self._num_buckets = max(1, -(-size // self._ways))
+
+        # NOTE: The byte budget gets split evenly across all slots
+        self._entry_bytes = DEFAULT_ENTRY_BYTES
+        if max_bytes is not None:
+            self._entry_bytes = max_bytes // (self._num_buckets * self._ways)
+            if self._entry_bytes < _SlotHeaderSize:
+                raise ValueError(
+                    f"Response cache byte budget ({max_bytes} bytes) is too small "
+                    f"for {size} entries"
+                )
+
+        self._slot_size = _align(_SlotHeaderSize + self._entry_bytes)
+
+        os.makedirs(cache_dir, exist_ok=True)
+        filename = CACHE_FILENAME.format(
+            version=_FormatVersion,
+            buckets=self._num_buckets,
+            ways=self._ways,
+            entry_bytes=self._entry_bytes,
+        )
+        self._path = os.path.join(cache_dir, filename)
+        self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+        # NOTE: A ``flock`` only excludes other processes, so writes from
+        # different threads of this process also need their own lock
+        self._lock = threading.Lock()
+        self._init_file()
+        self._mmap = mmap.mmap(self._fd, self._file_size)
+
+        self._metrics = CacheMetrics(cache_name="shared")
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def _file_size(self) -> int:
+        num_slots = self._num_buckets * self._ways
+        return _HeaderSize + num_slots * self._slot_size
+
+    @property
+    def _header(self) -> bytes:
+        return struct.pack(
+            _HeaderFormat,
+            _Magic,
+            _FormatVersion,
+            self._num_buckets,
+            self._ways,
+            self._entry_bytes,
+        )
+
+    def _init_file(self):
+        header = self._header
+        with self._write_lock():
+            current_size = os.fstat(self._fd).st_size
+            if current_size == 0:
+                # New file, so we need to create it from scratch
+                os.ftruncate(self._fd, self._file_size)
+                os.pwrite(self._fd, header, 0)
+                return
+
+            current_header = os.pread(self._fd, len(header), 0)
+            if current_size == self._file_size:
+                if current_header == header:
+                    # The file was created by a compatible cache instance, so
+                    # we can keep its (warm) contents
+                    return
+
+                if current_header == bytes(len(header)):
+                    # A previous instance stopped before writing the header
+                    os.pwrite(self._fd, header, 0)
+                    return
+
+            # NOTE: Never truncate the file in place, as other processes may
+            # have it memory-mapped (and would crash when reading from it)
+            raise ValueError(
+                f"Response cache file {self._path} is not compatible with the "
+                "current cache settings"
+            )
+
+    @contextmanager
+    def _write_lock(self, blocking: bool = True) -> Iterator[bool]:
+        """
+        Serialise writes, both across threads and across processes.
+        Yields whether the lock was acquired, which will always be the case
+        unless ``blocking`` is disabled.
+        """
+        if not self._lock.acquire(blocking):
+            yield False
+            return
+
+        try:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            try:
+                fcntl.flock(self._fd, flags)
+            except BlockingIOError:
+                yield False
+                return
+
+            try:
+                yield True
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            self._lock.release()
+
+    def _slot_offsets(self, digest: bytes) -> Iterator[int]:
+        bucket = int.from_bytes(digest[:8], "little") % self._num_buckets
+        first_slot = bucket * self._ways
+        for way in range(self._ways):
+            yield _HeaderSize + (first_slot + way) * self._slot_size
+
+    def _read_slot(
+        self, offset: int, digest: bytes
+    ) -> Tuple[bool, Optional[CacheValue], float]:
+        """
+        Read a slot without taking any lock.
+        Returns whether the slot holds the given key, alongside its value
+        and expiry timestamp.
+        """
+        for _ in range(_ReadRetries):
+            seq, slot_digest, expires_at, _, length, is_bytes, _ = struct.unpack_from(
+                _SlotFormat, self._mmap, offset
+            )
+            if seq % 2 == 1:
+                # Slot is being written right now
+                continue
+
+            if slot_digest != digest:
+                return False, None, 0
+
+            start = offset + _SlotHeaderSize
+            payload: bytes = self._mmap[start : start + length]
+
+            (seq_after,) = struct.unpack_from(_SeqFormat, self._mmap, offset)
+            if seq_after == seq:
+                value: CacheValue = payload if is_bytes else payload.decode("utf-8")
+                return True, value, expires_at
+
+        # Couldn't get a consistent read, so treat it as a miss
+        return False, None, 0
+
+    def _write_slot(
+        self,
+        offset: int,
+        digest: bytes,
+        payload: bytes,
+        is_bytes: bool,
+        expires_at: float,
+        namespace_digest: bytes,
+    ):
+        (seq,) = struct.unpack_from(_SeqFormat, self._mmap, offset)
+        # NOTE: A writer which crashed mid-write would have left an odd
+        # sequence number behind, so round it up to keep its parity right
+        seq += seq % 2
+
+        # Mark the slot as "being written" (i.e. odd sequence number), so that
+        # concurrent readers know that they need to retry
+        struct.pack_into(_SeqFormat, self._mmap, offset, seq + 1)
+
+        struct.pack_into(
+            _SlotFormat,
+            self._mmap,
+            offset,
+            seq + 1,
+            digest,
+            expires_at,
+            time.time(),
+            len(payload),
+            is_bytes,
+            namespace_digest,
+        )
+        start = offset + _SlotHeaderSize
+        self._mmap[start : start + len(payload)] = payload
+
+        struct.pack_into(_SeqFormat, self._mmap, offset, seq + 2)
+
+    def _is_expired(self, expires_at: float, now: float) -> bool:
+        return expires_at != 0 and expires_at <= now
+
+    async def insert(self, key: str, value: CacheValue):
+        is_bytes = isinstance(value, bytes)
+        payload = value if isinstance(value, bytes) else value.encode("utf-8")
+        digest = _digest(key)
+        if len(payload) > self._entry_bytes:
+            # Entry doesn't fit in a slot, but any previous value for the same
+            # key would now be stale
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._delete, digest)
+            return None
+
+        namespace_digest = _namespace_digest(get_namespace(key))
+        with self._write_lock(blocking=False) as locked:
+            if locked:
+                evicted = self._write_entry(digest, payload, is_bytes, namespace_digest)
+
+        if not locked:
+            # Another writer holds the lock (e.g. an invalidation), so wait for
+            # it on a separate thread
+            loop = asyncio.get_running_loop()
+            evicted = await loop.run_in_executor(
+                None, self._insert, digest, payload, is_bytes, namespace_digest
+            )
+
+        if evicted:
+            self._metrics.evictions.inc()
+
+        return None
+
+    def _insert(
+        self, digest: bytes, payload: bytes, is_bytes: bool, namespace_digest: bytes
+    ) -> bool:
+        with self._write_lock():
+            return self._write_entry(digest, payload, is_bytes, namespace_digest)
+
+    def _delete(self, digest: bytes):
+        with self._write_lock():
+            for offset in self._slot_offsets(digest):
+                _, slot_digest, *_ = struct.unpack_from(_SlotFormat, self._mmap, offset)
+                if slot_digest == digest:
+                    self._write_slot(offset, _EmptyDigest, b"", False, 0, bytes(8))
+
+    def _write_entry(
+        self, digest: bytes, payload: bytes, is_bytes: bool, namespace_digest: bytes
+    ) -> bool:
+        """
+        Write a new entry, returning whether another entry had to get evicted.
+        Must be called while holding the write lock.
+        """
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else 0
+        offset, evicted = self._find_victim(digest, now)
+        self._write_slot(
+            offset, digest, payload, is_bytes, expires_at, namespace_digest
+        )
+        return evicted
+
+    def _find_victim(self, digest: bytes, now: float) -> Tuple[int, bool]:
+        """
+        Find the slot where a new entry should be written.
+        Must be called while holding the write lock.
+        """
+        free_offset = None
+        victim_offset = None
+        victim_accessed_at = None
+        for offset in self._slot_offsets(digest):
+            _, slot_digest, expires_at, accessed_at, *_ = struct.unpack_from(
+                _SlotFormat, self._mmap, offset
+            )
+            if slot_digest == digest:
+                # Overwrite existing entry for the same key
+                return offset, False
+
+            if slot_digest == _EmptyDigest or self._is_expired(expires_at, now):
+                if free_offset is None:
+                    free_offset = offset
+                continue
+
+            if victim_accessed_at is None or accessed_at < victim_accessed_at:
+                victim_offset = offset
+                victim_accessed_at = accessed_at
+
+        if free_offset is not None:
+            return free_offset, False
+
+        # Otherwise, evict the least recently used entry of the set
+        return victim_offset, True  # type: ignore
+
+    async def lookup(self, key: str) -> CacheValue:
+        digest = _digest(key)
+        for offset in self._slot_offsets(digest):
+            found, value, expires_at = self._read_slot(offset, digest)
+            if not found:
+                continue
+
+            now = time.time()
+            if value is None or self._is_expired(expires_at, now):
+                break
+
+            # NOTE: The access timestamp is only used as an eviction hint, so
+            # it's fine to update it without holding the write lock
+            struct.pack_into(_AccessedFormat, self._mmap, offset + _AccessedOffset, now)
+            self._metrics.hits.inc()
+            return value
+
+        self._metrics.misses.inc()
+        return ""
+
+    async def size(self) -> int:
+        now = time.time()
+        num_slots = self._num_buckets * self._ways
+        count = 0
+        for idx in range(num_slots):
+            offset = _HeaderSize + idx * self._slot_size
+            _, slot_digest, expires_at, *_ = struct.unpack_from(
+                _SlotFormat, self._mmap, offset
+            )
+            if slot_digest != _EmptyDigest and not self._is_expired(expires_at, now):
+                count += 1
+
+        return count
+
+    async def invalidate(self, namespace: str):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._invalidate, namespace)
+
+    def _invalidate(self, namespace: str):
+        namespace_digest = _namespace_digest(namespace)
+        num_slots = self._num_buckets * self._ways
+        with self._write_lock():
+            for idx in range(num_slots):
+                offset = _HeaderSize + idx * self._slot_size
+                _, slot_digest, *_, slot_namespace = struct.unpack_from(
+                    _SlotFormat, self._mmap, offset
+                )
+                if slot_digest != _EmptyDigest and slot_namespace == namespace_digest:
+                    self._write_slot(offset, _EmptyDigest, b"", False, 0, bytes(8))
+
+    async def close(self):
+        self._mmap.close()
+        os.close(self._fd)
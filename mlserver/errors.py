@@ -35,6 +35,18 @@ class ModelNotReady(MLServerError):
         super().__init__(msg, status.HTTP_400_BAD_REQUEST)
 
 
+class ModelOverloaded(MLServerError):
+    def __init__(self, name: str, version: Optional[str] = None):
+        msg = f"Model {name} is overloaded, please retry later."
+        if version is not None:
+            msg = (
+                f"Model {name} with version {version} is overloaded, "
+                "please retry later."
+            )
+
+        super().__init__(msg, status.HTTP_429_TOO_MANY_REQUESTS)
+
+
 class InferenceError(MLServerError):
     def __init__(self, msg: str):
         super().__init__(msg, status.HTTP_400_BAD_REQUEST)
@@ -1,3 +1,5 @@
+import numpy as np
+
 from typing import Any, Union, Mapping, Optional
 from ..types import Datatype
 
@@ -6,6 +8,7 @@ from . import model_repository_pb2 as mr_pb
 
 from .. import types
 from ..raw import extract_raw, inject_raw
+from ..cache.serializer import ResponseSerializer
 
 _FIELDS = {
     Datatype.BOOL: "bool_contents",
@@ -338,6 +341,12 @@ class InferTensorContentsConverter:
     @classmethod
     def _get_contents(cls, type_object: types.TensorData, datatype: Datatype) -> dict:
         field = _FIELDS[datatype]
+        data = getattr(type_object, "__root__", type_object)
+        if isinstance(data, np.ndarray):
+            # Protobuf can copy the array's elements directly, as long as it's
+            # flat
+            return {field: data.tolist() if datatype == Datatype.BOOL else data.ravel()}
+
         return {field: type_object}
 
 
@@ -402,6 +411,37 @@ class ModelInferResponseConverter:
         return model_infer_response
 
 
+class ModelInferResponseSerializer(ResponseSerializer[pb.ModelInferResponse]):
+    """
+    Serializes inference responses into gRPC messages.
+    """
+
+    def __init__(self, use_raw: bool = False):
+        self._use_raw = use_raw
+        self.name = "grpc-raw" if use_raw else "grpc"
+
+    def serialize(self, response: types.InferenceResponse) -> pb.ModelInferResponse:
+        model_infer_response = ModelInferResponseConverter.from_types(
+            response, use_raw=self._use_raw
+        )
+        model_infer_response.ClearField("id")
+        return model_infer_response
+
+    def with_id(
+        self, serialized: pb.ModelInferResponse, response_id: Optional[str]
+    ) -> pb.ModelInferResponse:
+        if response_id is not None:
+            serialized.id = response_id
+
+        return serialized
+
+    def dumps(self, serialized: pb.ModelInferResponse) -> bytes:
+        return serialized.SerializeToString()
+
+    def loads(self, data: bytes) -> pb.ModelInferResponse:
+        return pb.ModelInferResponse.FromString(data)
+
+
 class InferOutputTensorConverter:
     @classmethod
     def to_types(
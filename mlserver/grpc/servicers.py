@@ -4,7 +4,7 @@ from . import dataplane_pb2 as pb
 from .dataplane_pb2_grpc import GRPCInferenceServiceServicer
 from .converters import (
     ModelInferRequestConverter,
-    ModelInferResponseConverter,
+    ModelInferResponseSerializer,
     ServerMetadataResponseConverter,
     ModelMetadataResponseConverter,
     RepositoryIndexRequestConverter,
@@ -12,7 +12,7 @@ from .converters import (
 )
 from .utils import to_headers, to_metadata, handle_mlserver_error
 
-from ..utils import insert_headers, extract_headers
+from ..utils import insert_headers
 from ..handlers import DataPlane, ModelRepositoryHandlers
 
 
@@ -23,6 +23,10 @@ class InferenceServicer(GRPCInferenceServiceServicer):
         super().__init__()
         self._data_plane = data_plane
         self._model_repository_handlers = model_repository_handlers
+        self._response_serializers = {
+            use_raw: ModelInferResponseSerializer(use_raw=use_raw)
+            for use_raw in [False, True]
+        }
 
     async def ServerLive(
         self, request: pb.ServerLiveRequest, context
@@ -74,16 +78,18 @@ class InferenceServicer(GRPCInferenceServiceServicer):
         request_headers = to_headers(context)
         insert_headers(payload, request_headers)
 
-        result = await self._data_plane.infer(
-            payload=payload, name=request.model_name, version=request.model_version
+        serializer = self._response_serializers[return_raw]
+        response, response_headers = await self._data_plane.infer_serialized(
+            payload=payload,
+            name=request.model_name,
+            version=request.model_version,
+            serializer=serializer,
         )
 
-        response_headers = extract_headers(result)
         if response_headers:
             response_metadata = to_metadata(response_headers)
             context.set_trailing_metadata(response_metadata)
 
-        response = ModelInferResponseConverter.from_types(result, use_raw=return_raw)
         return response
 
     async def RepositoryIndex(
@@ -13,7 +13,9 @@ STATUS_CODE_MAPPING = {
     status.HTTP_400_BAD_REQUEST: grpc.StatusCode.INVALID_ARGUMENT,
     status.HTTP_404_NOT_FOUND: grpc.StatusCode.NOT_FOUND,
     status.HTTP_422_UNPROCESSABLE_ENTITY: grpc.StatusCode.FAILED_PRECONDITION,
+    status.HTTP_429_TOO_MANY_REQUESTS: grpc.StatusCode.RESOURCE_EXHAUSTED,
     status.HTTP_500_INTERNAL_SERVER_ERROR: grpc.StatusCode.INTERNAL,
+    status.HTTP_503_SERVICE_UNAVAILABLE: grpc.StatusCode.UNAVAILABLE,
 }
 
 
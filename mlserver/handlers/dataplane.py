@@ -1,23 +1,54 @@
+import hashlib
+
 from prometheus_client import (
     Counter,
     Summary,
 )
-from typing import Optional
+from contextlib import contextmanager
+from functools import partial
+from typing import Dict, Iterator, Optional, Tuple
+from weakref import WeakKeyDictionary
 
 from ..errors import ModelNotReady
+from ..logging import logger
 from ..context import model_context
 from ..settings import Settings
+from ..model import MLModel
 from ..registry import MultiModelRegistry
 from ..types import (
     MetadataModelResponse,
     MetadataServerResponse,
     InferenceRequest,
     InferenceResponse,
+    Parameters,
 )
 from ..middleware import InferenceMiddlewares
 from ..cloudevents import CloudEventsMiddleware
-from ..utils import generate_uuid
-from ..cache import ResponseCache, LocalCache
+from ..utils import generate_uuid, extract_headers
+from ..cache import (
+    ResponseCache,
+    LocalCache,
+    SharedCache,
+    compute_cache_key,
+    namespaced_key,
+)
+from ..cache.coalescing import RequestCoalescer
+from ..cache.rows import RowPredictor
+from ..cache.serializer import (
+    ResponseSerializer,
+    Serialized,
+    pack_response,
+    unpack_response,
+)
+
+
+def _get_settings_digest(model: MLModel) -> str:
+    # NOTE: Generations are only tracked in-memory, so the namespace also
+    # includes a digest of the model's settings.
+    # This ensures that persistent (or shared) caches won't serve responses
+    # from a previous deployment of the model with different settings.
+    as_json = model.settings.json(sort_keys=True)
+    return hashlib.sha256(as_json.encode("utf-8")).hexdigest()[:16]
 
 
 class DataPlane:
@@ -32,6 +63,14 @@ class DataPlane:
         self._response_cache = None
         if settings.cache_enabled:
             self._response_cache = self._create_response_cache()
+        self._request_coalescer = RequestCoalescer()
+        self._row_predictor = RowPredictor()
+        self._cache_generations: Dict[Tuple[str, Optional[str]], int] = {}
+        # Namespace (and generation) where each model instance caches its
+        # responses
+        self._cache_namespaces: WeakKeyDictionary[MLModel, Tuple[str, int]] = (
+            WeakKeyDictionary()
+        )
         self._inference_middleware = InferenceMiddlewares(
             CloudEventsMiddleware(settings)
         )
@@ -85,6 +124,48 @@ class DataPlane:
         name: str,
         version: Optional[str] = None,
     ) -> InferenceResponse:
+        with self._track_infer(name, version):
+            model = await self._get_inference_model(payload, name, version)
+
+            # TODO: Make await optional for sync methods
+            with model_context(model.settings):
+                prediction = await self._infer(model, payload)
+
+            # Ensure ID matches
+            prediction.id = payload.id
+
+            self._inference_middleware.response_middleware(prediction, model.settings)
+
+            return prediction
+
+    async def infer_serialized(
+        self,
+        payload: InferenceRequest,
+        name: str,
+        version: Optional[str],
+        serializer: ResponseSerializer[Serialized],
+    ) -> Tuple[Serialized, Optional[Dict[str, str]]]:
+        """
+        Run inference, returning the response already serialized for a given
+        protocol, alongside its headers.
+
+        If caching is enabled, the serialized response will be cached as well,
+        so that cache hits can be served straight away, without having to
+        re-build (and re-serialize) the response.
+        """
+        with self._track_infer(name, version):
+            model = await self._get_inference_model(payload, name, version)
+
+            with model_context(model.settings):
+                serialized, headers = await self._infer_serialized(
+                    model, payload, serializer
+                )
+
+            response_headers = self._get_response_headers(model, payload, headers)
+            return serializer.with_id(serialized, payload.id), response_headers
+
+    @contextmanager
+    def _track_infer(self, name: str, version: Optional[str]) -> Iterator[None]:
         infer_duration = self._ModelInferRequestDuration.labels(
             model=name, version=version
         ).time()
@@ -92,46 +173,269 @@ class DataPlane:
             model=name, version=version
         ).count_exceptions()
 
-        if self._response_cache is not None:
-            cache_key = payload.json()
-
         with infer_duration, infer_errors:
-            if payload.id is None:
-                payload.id = generate_uuid()
+            yield
 
-            model = await self._model_registry.get_model(name, version)
-            if not model.ready:
-                raise ModelNotReady(name, version)
+            self._ModelInferRequestSuccess.labels(model=name, version=version).inc()
 
-            self._inference_middleware.request_middleware(payload, model.settings)
+    async def _get_inference_model(
+        self, payload: InferenceRequest, name: str, version: Optional[str]
+    ) -> MLModel:
+        if payload.id is None:
+            payload.id = generate_uuid()
 
-            # TODO: Make await optional for sync methods
-            with model_context(model.settings):
-                if (
-                    self._response_cache is not None
-                    and model.settings.cache_enabled is not False
-                ):
-                    cache_value = await self._response_cache.lookup(cache_key)
-                    if cache_value != "":
-                        prediction = InferenceResponse.parse_raw(cache_value)
-                    else:
-                        prediction = await model.predict(payload)
-                        # ignore cache insertion error if any
-                        await self._response_cache.insert(cache_key, prediction.json())
-                else:
-                    prediction = await model.predict(payload)
+        model = await self._model_registry.get_model(name, version)
+        if not model.ready:
+            raise ModelNotReady(name, version)
 
-            # Ensure ID matches
-            prediction.id = payload.id
+        self._inference_middleware.request_middleware(payload, model.settings)
+        return model
 
-            self._inference_middleware.response_middleware(prediction, model.settings)
+    async def _infer(
+        self, model: MLModel, payload: InferenceRequest
+    ) -> InferenceResponse:
+        response_cache = self._get_model_cache(model)
+        if response_cache is not None and model.settings.cache_rows:
+            return await self._row_predictor.predict(
+                model,
+                payload,
+                response_cache,
+                self._get_cache_namespace(model),
+                partial(self._is_cache_current, model),
+                partial(self._coalesce, model),
+            )
 
-            self._ModelInferRequestSuccess.labels(model=name, version=version).inc()
+        if response_cache is None and not model.settings.coalesce_requests:
+            return await model.predict(payload)
 
-            return prediction
+        # NOTE: Only compute the cache key when the model has caching (or
+        # request coalescing) enabled
+        cache_key = self._get_cache_key(model, payload)
+        if response_cache is not None:
+            cache_value = await response_cache.lookup(cache_key)
+            if cache_value:
+                return InferenceResponse.parse_raw(cache_value)
+
+        return await self._predict(model, payload, cache_key, response_cache)
+
+    async def _infer_serialized(
+        self,
+        model: MLModel,
+        payload: InferenceRequest,
+        serializer: ResponseSerializer[Serialized],
+    ) -> Tuple[Serialized, Optional[Dict[str, str]]]:
+        response_cache = self._get_model_cache(model)
+        if response_cache is not None and model.settings.cache_rows:
+            # NOTE: Rows get cached individually, thus there is no serialized
+            # response to cache
+            prediction = await self._row_predictor.predict(
+                model,
+                payload,
+                response_cache,
+                self._get_cache_namespace(model),
+                partial(self._is_cache_current, model),
+                partial(self._coalesce, model),
+            )
+            return self._serialize(prediction, serializer)
+
+        if response_cache is None and not model.settings.coalesce_requests:
+            prediction = await model.predict(payload)
+            return self._serialize(prediction, serializer)
+
+        cache_key = self._get_cache_key(model, payload)
+        serialized_key = f"{cache_key}.{serializer.name}"
+        if response_cache is not None:
+            cache_value = await response_cache.lookup(serialized_key)
+            if isinstance(cache_value, bytes) and cache_value:
+                body, headers = unpack_response(cache_value)
+                return serializer.loads(body), headers
+
+        # NOTE: We don't pass down the response cache, as we'll cache the
+        # serialized response instead
+        prediction = await self._predict(model, payload, cache_key, None)
+        serialized, headers = self._serialize(prediction, serializer)
+        if response_cache is not None and self._is_cache_current(model):
+            # ignore cache insertion error if any
+            cache_value = pack_response(serializer.dumps(serialized), headers)
+            await response_cache.insert(serialized_key, cache_value)
+
+        return serialized, headers
+
+    async def _predict(
+        self,
+        model: MLModel,
+        payload: InferenceRequest,
+        cache_key: str,
+        response_cache: Optional[ResponseCache],
+    ) -> InferenceResponse:
+        predict_fn = partial(
+            self._predict_and_cache, model, payload, cache_key, response_cache
+        )
+        if model.settings.coalesce_requests:
+            return await self._request_coalescer.run(cache_key, predict_fn)
+
+        return await predict_fn()
+
+    async def _coalesce(
+        self, model: MLModel, payload: InferenceRequest
+    ) -> InferenceResponse:
+        if not model.settings.coalesce_requests:
+            return await model.predict(payload)
+
+        cache_key = self._get_cache_key(model, payload)
+        return await self._request_coalescer.run(
+            cache_key, partial(model.predict, payload)
+        )
+
+    async def _predict_and_cache(
+        self,
+        model: MLModel,
+        payload: InferenceRequest,
+        cache_key: str,
+        response_cache: Optional[ResponseCache],
+    ) -> InferenceResponse:
+        prediction = await model.predict(payload)
+        if response_cache is not None and self._is_cache_current(model):
+            # ignore cache insertion error if any
+            await response_cache.insert(cache_key, prediction.json())
+
+        return prediction
+
+    def _serialize(
+        self, prediction: InferenceResponse, serializer: ResponseSerializer[Serialized]
+    ) -> Tuple[Serialized, Optional[Dict[str, str]]]:
+        # NOTE: Headers are sent separately (i.e. outside of the response body)
+        headers = extract_headers(prediction)
+        return serializer.serialize(prediction), headers
+
+    def _get_response_headers(
+        self,
+        model: MLModel,
+        payload: InferenceRequest,
+        headers: Optional[Dict[str, str]],
+    ) -> Optional[Dict[str, str]]:
+        # NOTE: As the response has already been serialized, run the response
+        # middlewares on an empty response which only holds its headers
+        response = InferenceResponse.construct(
+            id=payload.id,
+            model_name=model.name,
+            outputs=[],
+            parameters=Parameters(headers=headers) if headers else None,
+        )
+        self._inference_middleware.response_middleware(response, model.settings)
+        return extract_headers(response)
+
+    def _get_model_cache(self, model: MLModel) -> Optional[ResponseCache]:
+        if model.settings.cache_enabled is False:
+            return None
+
+        return self._response_cache
+
+    def _get_cache_key(self, model: MLModel, payload: InferenceRequest) -> str:
+        cache_key = compute_cache_key(
+            payload,
+            name=model.name,
+            version=model.version,
+            parameters=model.settings.cache_key_parameters,
+        )
+        return namespaced_key(self._get_cache_namespace(model), cache_key)
+
+    def _get_cache_namespace(self, model: MLModel) -> str:
+        pinned = self._cache_namespaces.get(model)
+        if pinned is None:
+            # NOTE: Each model instance gets pinned to the namespace's current
+            # generation, so that in-flight requests to a model which is being
+            # reloaded don't leak into the namespace of its new instance
+            model_key = (model.name, model.version)
+            generation = self._cache_generations.get(model_key, 0)
+            digest = _get_settings_digest(model)
+            namespace = f"{model.name}:{model.version or ''}:{digest}:{generation}"
+            pinned = namespace, generation
+            self._cache_namespaces[model] = pinned
+
+        namespace, _ = pinned
+        return namespace
+
+    def _is_cache_current(self, model: MLModel) -> bool:
+        """
+        Check whether a model instance's namespace is still current (i.e. it
+        hasn't been invalidated by a reload or unload of the model).
+        Responses of in-flight requests to outdated instances shouldn't get
+        cached, as they would land on an already invalidated namespace.
+        """
+        pinned = self._cache_namespaces.get(model)
+        if pinned is None:
+            return True
+
+        _, generation = pinned
+        model_key = (model.name, model.version)
+        return generation == self._cache_generations.get(model_key, 0)
+
+    async def reload_response_cache(
+        self, old_model: MLModel, new_model: MLModel
+    ) -> MLModel:
+        await self._invalidate_response_cache(old_model)
+        return new_model
+
+    async def unload_response_cache(self, model: MLModel) -> MLModel:
+        await self._invalidate_response_cache(model)
+        return model
+
+    async def _invalidate_response_cache(self, model: MLModel):
+        """
+        Invalidate all the cached responses of a given model version.
+        Bumping the namespace's generation makes the invalidation O(1), as
+        the new model instance will use a new namespace.
+        The old namespace will also get dropped from the cache, to free up
+        the space held by its entries.
+        """
+        namespace = self._get_cache_namespace(model)
+
+        model_key = (model.name, model.version)
+        self._cache_generations[model_key] = (
+            self._cache_generations.get(model_key, 0) + 1
+        )
+
+        if self._response_cache is None:
+            return
+
+        try:
+            await self._response_cache.invalidate(namespace)
+        except Exception as err:
+            # NOTE: The old namespace won't get looked up anymore, so failing
+            # to drop its entries shouldn't stop the model from being reloaded
+            logger.warning(
+                f"Failed to invalidate cached responses of model {model.name} "
+                f"with version {model.version}: {err}"
+            )
+
+    async def close(self):
+        """
+        Release the resources held by the response cache (e.g. open
+        connections or files).
+        """
+        if self._response_cache is not None:
+            await self._response_cache.close()
 
     def _create_response_cache(self) -> ResponseCache:
-        return LocalCache(size=self._settings.cache_size)
+        if self._settings.cache_implementation:
+            return self._settings.cache_implementation(
+                **self._settings.cache_implementation_args
+            )
+
+        if self._settings.cache_dir:
+            return SharedCache(
+                cache_dir=self._settings.cache_dir,
+                size=self._settings.cache_size,
+                ttl=self._settings.cache_ttl,
+                max_bytes=self._settings.cache_max_bytes,
+            )
+
+        return LocalCache(
+            size=self._settings.cache_size,
+            ttl=self._settings.cache_ttl,
+            max_bytes=self._settings.cache_max_bytes,
+        )
 
     def _get_response_cache(self) -> Optional[ResponseCache]:
         return self._response_cache
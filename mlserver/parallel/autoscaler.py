@@ -0,0 +1,107 @@
+import time
+
+from typing import Dict, List, Mapping, Optional
+
+from ..settings import Settings
+
+
+class Autoscaler:
+    """
+    Decides when an inference pool should scale its number of workers between
+    its minimum (i.e. `parallel_workers`) and maximum (i.e.
+    `parallel_workers_max`) sizes.
+
+    The pool will scale up when its workers have too many in-flight requests
+    on average (or when a request has been waiting for too long), and it will
+    scale down by retiring workers which have stayed idle for a while.
+    """
+
+    def __init__(self, settings: Settings):
+        self.min_workers = settings.parallel_workers
+        self.max_workers = settings.parallel_workers_max or self.min_workers
+        self.target_in_flight = settings.parallel_autoscaling_target_in_flight
+        self.max_wait = settings.parallel_autoscaling_max_wait
+        self.idle_timeout = settings.parallel_autoscaling_idle_timeout
+        self._last_busy: Dict[int, float] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > self.min_workers
+
+    def observe(
+        self,
+        worker_pids: List[int],
+        in_flight: Mapping[int, int],
+        now: Optional[float] = None,
+    ):
+        """
+        Keeps track of when each worker was last busy.
+        """
+        if now is None:
+            now = time.monotonic()
+
+        # NOTE: Workers seen for the first time (e.g. which have just started)
+        # count as busy, so that they don't get retired straight away
+        last_busy = {}
+        for worker_pid in worker_pids:
+            if in_flight.get(worker_pid, 0) > 0:
+                last_busy[worker_pid] = now
+            else:
+                last_busy[worker_pid] = self._last_busy.get(worker_pid, now)
+
+        self._last_busy = last_busy
+
+    def should_scale_up(
+        self, worker_pids: List[int], in_flight: Mapping[int, int], oldest_wait: float
+    ) -> bool:
+        if len(worker_pids) >= self.max_workers:
+            return False
+
+        if self.max_wait is not None and oldest_wait > self.max_wait:
+            return True
+
+        return self._average_in_flight(worker_pids, in_flight) > self.target_in_flight
+
+    def get_idle_worker(
+        self,
+        worker_pids: List[int],
+        in_flight: Mapping[int, int],
+        now: Optional[float] = None,
+    ) -> Optional[int]:
+        """
+        Returns the PID of the worker which should get retired (if any).
+        """
+        if len(worker_pids) <= self.min_workers:
+            return None
+
+        if now is None:
+            now = time.monotonic()
+
+        idle = [
+            worker_pid
+            for worker_pid in worker_pids
+            if in_flight.get(worker_pid, 0) == 0
+            and now - self._last_busy.get(worker_pid, now) >= self.idle_timeout
+        ]
+        if not idle:
+            return None
+
+        # Avoid retiring a worker if the remaining ones would go over the
+        # target straight away (which would just trigger a scale up again)
+        total_in_flight = sum(in_flight.get(pid, 0) for pid in worker_pids)
+        if total_in_flight / (len(worker_pids) - 1) > self.target_in_flight:
+            return None
+
+        return min(idle, key=lambda worker_pid: self._last_busy[worker_pid])
+
+    def _average_in_flight(
+        self, worker_pids: List[int], in_flight: Mapping[int, int]
+    ) -> float:
+        if not worker_pids:
+            return 0.0
+
+        total_in_flight = sum(in_flight.get(pid, 0) for pid in worker_pids)
+        return total_in_flight / len(worker_pids)
+
+    def remove(self, worker_pid: int):
+        self._last_busy.pop(worker_pid, None)
@@ -1,42 +1,70 @@
 import asyncio
+import time
 
 from collections import defaultdict
-from typing import Dict, List, Tuple, Set, Iterator
-from itertools import cycle
-from multiprocessing import Queue
-from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Set
 from asyncio import Future
 
-from ..utils import schedule_with_callback, generate_uuid
 from ..metrics import REGISTRY
 
-from .errors import WorkerStop
+from .errors import NoWorkersAvailable, WorkerStop
 from .worker import Worker
 from .logging import logger
-from .utils import END_OF_QUEUE, cancel_task
 from .messages import (
     Message,
     ModelUpdateMessage,
     ModelRequestMessage,
     ModelResponseMessage,
+    next_message_id,
 )
-from prometheus_client import Histogram
+from .placement import ModelPlacement
+from .policies import DispatchPolicy, RoundRobin
+from .shared_memory import SharedMemoryPool
+from .utils import MessageReader
+from prometheus_client import Gauge, Histogram
 
 QUEUE_METRIC_NAME = "parallel_request_queue"
+WORKER_IN_FLIGHT_METRIC_NAME = "parallel_worker_in_flight"
+
+
+def _get_running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _resolve_future(
+    future: Future[ModelResponseMessage], response: ModelResponseMessage
+):
+    if future.done():
+        # Request may have been cancelled while waiting for its response
+        return
+
+    if response.exception:
+        future.set_exception(response.exception)
+    else:
+        future.set_result(response)
 
 
 class AsyncResponses:
     def __init__(self) -> None:
-        self._futures: Dict[str, Future[ModelResponseMessage]] = {}
+        self._futures: Dict[int, Future[ModelResponseMessage]] = {}
 
         # _workers_map keeps track of which in-flight requests are being served
         # by each worker
-        self._workers_map: Dict[int, Set[str]] = defaultdict(set)
+        self._workers_map: Dict[int, Set[int]] = defaultdict(set)
         # _futures_map keeps track of which worker is serving each in-flight
         # request
-        self._futures_map: Dict[str, int] = {}
+        self._futures_map: Dict[int, int] = {}
+        # _scheduled_at keeps track of when each in-flight request was sent
+        self._scheduled_at: Dict[int, float] = {}
+        # _service_times keeps track of how long each worker took to process
+        # the requests which have been resolved, but not yet collected
+        self._service_times: Dict[int, float] = {}
 
         self.parallel_request_queue_size = self._get_or_create_metric()
+        self.worker_in_flight = self._get_or_create_worker_metric()
 
     def _get_or_create_metric(self) -> Histogram:
         if QUEUE_METRIC_NAME in REGISTRY:
@@ -48,6 +76,36 @@ class AsyncResponses:
             registry=REGISTRY,
         )
 
+    def _get_or_create_worker_metric(self) -> Gauge:
+        if WORKER_IN_FLIGHT_METRIC_NAME in REGISTRY:
+            return REGISTRY[WORKER_IN_FLIGHT_METRIC_NAME]  # type: ignore
+
+        return Gauge(
+            WORKER_IN_FLIGHT_METRIC_NAME,
+            "Number of in-flight requests for each worker",
+            labelnames=["worker_pid"],
+            registry=REGISTRY,
+        )
+
+    def in_flight(self) -> Dict[int, int]:
+        """
+        Returns the number of in-flight requests for each worker.
+        """
+        return {
+            worker_pid: len(message_ids)
+            for worker_pid, message_ids in self._workers_map.items()
+        }
+
+    def oldest_wait(self) -> float:
+        """
+        Returns how long (in seconds) the oldest in-flight request has been
+        waiting for a response.
+        """
+        if not self._scheduled_at:
+            return 0.0
+
+        return time.perf_counter() - min(self._scheduled_at.values())
+
     async def schedule_and_wait(
         self, message: Message, worker: Worker
     ) -> ModelResponseMessage:
@@ -66,6 +124,7 @@ class AsyncResponses:
         future = loop.create_future()
         message_id = message.id
         self._futures[message_id] = future
+        self._scheduled_at[message_id] = time.perf_counter()
 
         # Keep track of allocation for in-flight requests
         self._track_message(message, worker)
@@ -78,9 +137,11 @@ class AsyncResponses:
 
     def _track_message(self, message: Message, worker: Worker) -> None:
         self._futures_map[message.id] = worker.pid  # type: ignore
-        self._workers_map[worker.pid].add(message.id)  # type: ignore
+        worker_in_flight = self._workers_map[worker.pid]  # type: ignore
+        worker_in_flight.add(message.id)
+        self.worker_in_flight.labels(worker.pid).set(len(worker_in_flight))
 
-    async def _wait(self, message_id: str) -> ModelResponseMessage:
+    async def _wait(self, message_id: int) -> ModelResponseMessage:
         future = self._futures[message_id]
 
         try:
@@ -89,33 +150,62 @@ class AsyncResponses:
         finally:
             self._clear_message(message_id)
 
-    def _clear_message(self, message_id: str) -> None:
+    def _clear_message(self, message_id: int) -> None:
         del self._futures[message_id]
+        self._scheduled_at.pop(message_id, None)
         worker_pid = self._futures_map.pop(message_id)
-        self._workers_map[worker_pid].remove(message_id)
+        worker_in_flight = self._workers_map.get(worker_pid)
+        if worker_in_flight is None:
+            # Worker has already been removed
+            return
+
+        worker_in_flight.remove(message_id)
+        self.worker_in_flight.labels(worker_pid).set(len(worker_in_flight))
 
     def resolve(self, response: ModelResponseMessage):
         """
         Resolve a previously scheduled response future.
         """
         message_id = response.id
-        future = self._futures[message_id]
+        future = self._futures.get(message_id)
+        if future is None:
+            # Request may have been cancelled (and cleared) before its
+            # response arrived
+            logger.debug(f"Ignoring response {message_id} for unknown request")
+            return
+
+        if response.service_time is not None:
+            self._service_times[message_id] = response.service_time
+
+        loop = future.get_loop()
+        if loop is _get_running_loop():
+            _resolve_future(future, response)
+            return
 
         # NOTE: Use call_soon_threadsafe to cover cases where `model.predict()`
         # (or other methods) get called from a separate thread (and a separate
         # AsyncIO loop)
-        loop = future.get_loop()
-        if response.exception:
-            loop.call_soon_threadsafe(future.set_exception, response.exception)
-        else:
-            loop.call_soon_threadsafe(future.set_result, response)
+        loop.call_soon_threadsafe(_resolve_future, future, response)
+
+    def pop_service_time(self, message_id: int) -> Optional[float]:
+        """
+        Returns (and forgets) how long the worker took to process a request,
+        if it sent back a response for it.
+        """
+        return self._service_times.pop(message_id, None)
 
     def cancel(self, worker: Worker, exit_code: int):
         """
         Cancel in-flight requests for worker (e.g. because it died
         unexpectedly).
         """
-        in_flight = self._workers_map[worker.pid]  # type: ignore
+        in_flight = self._workers_map.pop(worker.pid, set())  # type: ignore
+        try:
+            self.worker_in_flight.remove(worker.pid)
+        except KeyError:
+            # Worker never served any requests
+            pass
+
         if in_flight:
             logger.info(
                 f"Cancelling {len(in_flight)} in-flight requests for "
@@ -130,20 +220,39 @@ class AsyncResponses:
 
 
 class Dispatcher:
-    def __init__(self, workers: Dict[int, Worker], responses: Queue):
-        self._responses = responses
+    def __init__(
+        self,
+        workers: Dict[int, Worker],
+        shared_memory: Optional[SharedMemoryPool] = None,
+        policy: Optional[DispatchPolicy] = None,
+        placement: Optional[ModelPlacement] = None,
+    ):
+        self._shared_memory = shared_memory
+        self._policy = policy or RoundRobin()
+        self._placement = placement or ModelPlacement()
         self._workers = workers
-        self._workers_round_robin = self._reset_round_robin()
+        # Workers which have started but are not yet ready to receive traffic
+        self._starting: Set[int] = set()
+        self._worker_pids = self._reset_worker_pids()
         self._worker_starting_lock = asyncio.Lock()
         self._active = False
-        self._process_responses_task = None
-        self._executor = ThreadPoolExecutor()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Readers of the response queues being watched, indexed by worker PID
+        self._responses_readers: Dict[int, MessageReader] = {}
         self._async_responses = AsyncResponses()
 
-    def _reset_round_robin(self) -> Iterator[int]:
-        worker_pids = list(self._workers.keys())
-        self._workers_round_robin = cycle(worker_pids)
-        return self._workers_round_robin
+    def _reset_worker_pids(self) -> List[int]:
+        # NOTE: Only workers in this list (i.e. which are ready) will receive
+        # traffic
+        self._worker_pids = [pid for pid in self._workers if pid not in self._starting]
+        return self._worker_pids
+
+    @property
+    def ready_workers(self) -> List[int]:
+        """
+        Returns the PIDs of the workers which are ready to receive traffic.
+        """
+        return list(self._worker_pids)
 
     async def on_worker_start(self, worker: Worker):
         """
@@ -155,95 +264,184 @@ class Dispatcher:
         # Lock while worker is coming up to ensure no model updates get lost in
         # translation
         async with self._worker_starting_lock:
+            self._starting.add(worker.pid)  # type: ignore
             self._workers[worker.pid] = worker  # type: ignore
+            self._reset_worker_pids()
+            self._start_reading(worker)
 
     def on_worker_ready(self, worker: Worker):
         """
         Handler for workers who are now ready to receive traffic.
         """
-        self._reset_round_robin()
+        self._starting.discard(worker.pid)  # type: ignore
+        self._reset_worker_pids()
+
+    def on_worker_retire(self, worker: Worker):
+        """
+        Handler for workers which are getting retired (e.g. when scaling down
+        the pool).
+        These will stop receiving any new traffic, although their in-flight
+        requests will still get resolved.
+        """
+        pid = worker.pid
+        if pid in self._workers:
+            del self._workers[pid]
+
+        self._reset_worker_pids()
+        self._policy.remove(pid)  # type: ignore
+
+    def in_flight(self) -> Dict[int, int]:
+        """
+        Returns the number of in-flight requests for each worker.
+        """
+        return self._async_responses.in_flight()
+
+    def oldest_wait(self) -> float:
+        """
+        Returns how long the oldest in-flight request has been waiting for.
+        """
+        return self._async_responses.oldest_wait()
 
     def on_worker_stop(self, worker: Worker, exit_code: int):
         """
         Handler used for workers who stopped unexpectedly and there need to be
-        removed from the round robin rotation.
+        removed from the rotation.
         """
         pid = worker.pid
         if pid in self._workers:
             del self._workers[pid]
 
-        self._reset_round_robin()
+        self._starting.discard(pid)  # type: ignore
+        self._reset_worker_pids()
+        self._stop_reading(worker)
+        self._policy.remove(pid)  # type: ignore
         self._async_responses.cancel(worker, exit_code)
 
+        if self._shared_memory is not None:
+            # Reclaim any segments which the worker won't be able to free
+            self._shared_memory.release(pid)  # type: ignore
+
     def start(self):
+        logger.debug("Starting response processing loop...")
         self._active = True
-        self._process_responses_task = schedule_with_callback(
-            self._process_responses(), self._process_responses_cb
-        )
+        self._loop = asyncio.get_event_loop()
+        for worker in self._workers.values():
+            self._start_reading(worker)
 
-    def _process_responses_cb(self, process_responses):
-        try:
-            process_responses.result()
-        except asyncio.CancelledError:
-            # NOTE: The response loop was cancelled from the outside, so don't
-            # restart
+    def _start_reading(self, worker: Worker):
+        if self._loop is None or worker.pid in self._responses_readers:
             return
-        except Exception:
-            logger.exception("Response processing loop crashed. Restarting the loop...")
-            # If process loop crashed, restart it
-            self.start()
 
-    async def _process_responses(self):
-        logger.debug("Starting response processing loop...")
-        loop = asyncio.get_event_loop()
-        while self._active:
-            response = await loop.run_in_executor(self._executor, self._responses.get)
+        # NOTE: Each worker sends its responses through its own queue, so
+        # that they don't contend with each other on a single shared lock.
+        # Instead of blocking a separate thread per queue, we let the event
+        # loop tell us when any of them has new responses.
+        responses_reader = MessageReader(worker.responses, self._process_response)
+        responses_reader.start(self._loop)
+        self._responses_readers[worker.pid] = responses_reader  # type: ignore
+
+    def _process_response(self, response: ModelResponseMessage):
+        response = self._decode_response(response)
+        self._async_responses.resolve(response)
 
-            # If the queue gets terminated, detect the "sentinel value" and
-            # stop reading
-            if response is END_OF_QUEUE:
-                return
+    def _stop_reading(self, worker: Worker):
+        responses_reader = self._responses_readers.pop(worker.pid, None)  # type: ignore
+        if responses_reader is not None:
+            responses_reader.stop()
 
-            self._async_responses.resolve(response)
+    def _decode_response(self, response: ModelResponseMessage) -> ModelResponseMessage:
+        if self._shared_memory is None:
+            return response
+
+        try:
+            return self._shared_memory.decode_response(response)
+        except Exception as err:
+            logger.exception(f"Unable to read response {response.id}")
+            return ModelResponseMessage(id=response.id, exception=err)
 
     async def dispatch_request(
         self, request_message: ModelRequestMessage
     ) -> ModelResponseMessage:
-        worker, wpid = self._get_worker()
-        worker.send_request(request_message)
+        worker, wpid = self._get_worker(
+            request_message.model_name, request_message.model_version
+        )
+        if self._shared_memory is not None:
+            request_message = self._shared_memory.encode_request(request_message, wpid)
 
-        return await self._async_responses.schedule_and_wait(request_message, worker)
+        worker.send_request(request_message)
 
-    def _get_worker(self) -> Tuple[Worker, int]:
+        try:
+            return await self._async_responses.schedule_and_wait(
+                request_message, worker
+            )
+        finally:
+            # NOTE: Only the worker's own service time gets observed (i.e.
+            # excluding any time spent queueing, which the policy accounts
+            # for separately), including for requests that failed
+            service_time = self._async_responses.pop_service_time(request_message.id)
+            if service_time is not None:
+                self._policy.observe(wpid, service_time)
+
+    def _get_worker(
+        self, model_name: Optional[str] = None, model_version: Optional[str] = None
+    ) -> Tuple[Worker, int]:
         """
         Get next available worker.
         By default, this is just a round-robin through all the workers.
+        If the model has only been loaded on a subset of workers, only these
+        will be considered.
         """
-        worker_pid = next(self._workers_round_robin)
+        worker_pids = self._worker_pids
+        if model_name is not None:
+            placed = self._placement.get_workers(model_name, model_version)
+            if placed is not None:
+                worker_pids = [pid for pid in worker_pids if pid in placed]
+
+        if not worker_pids:
+            raise NoWorkersAvailable(model_name or "", model_version)
+
+        in_flight = self._async_responses.in_flight()
+        worker_pid = self._policy.select(worker_pids, in_flight)
         return self._workers[worker_pid], worker_pid
 
     async def dispatch_update(
-        self, model_update: ModelUpdateMessage
+        self,
+        model_update: ModelUpdateMessage,
+        worker_pids: Optional[Iterable[int]] = None,
     ) -> List[ModelResponseMessage]:
+        """
+        Sends a model update to a set of workers (or to every worker, if none
+        are specified).
+        """
         async with self._worker_starting_lock:
+            workers = list(self._workers.values())
+            if worker_pids is not None:
+                workers = [
+                    self._workers[pid] for pid in worker_pids if pid in self._workers
+                ]
+
             return await asyncio.gather(
                 *[
                     self.dispatch_update_to_worker(worker, model_update)
-                    for worker in self._workers.values()
+                    for worker in workers
                 ]
             )
 
     async def dispatch_update_to_worker(
         self, worker: Worker, model_update: ModelUpdateMessage
     ) -> ModelResponseMessage:
-        # NOTE: Need to rewrite the UUID to ensure each worker sends back a
+        # NOTE: Need to rewrite the ID to ensure each worker sends back a
         # unique result
-        worker_update = model_update.copy()
-        worker_update.id = generate_uuid()
+        worker_update = model_update.copy(id=next_message_id())
         worker.send_update(worker_update)
         return await self._async_responses.schedule_and_wait(worker_update, worker)
 
     async def stop(self):
-        self._executor.shutdown()
-        if self._process_responses_task is not None:
-            await cancel_task(self._process_responses_task)
+        self._active = False
+        for responses_reader in self._responses_readers.values():
+            responses_reader.stop()
+
+        self._responses_readers.clear()
+
+        if self._shared_memory is not None:
+            self._shared_memory.close()
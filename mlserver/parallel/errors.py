@@ -1,4 +1,5 @@
 from fastapi import status
+from typing import List, Optional
 
 from ..model import MLModel
 from ..errors import MLServerError
@@ -16,6 +17,12 @@ class EnvironmentNotFound(MLServerError):
         super().__init__(msg, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class DedicatedPoolNotFound(MLServerError):
+    def __init__(self, model: MLModel):
+        msg = f"Dedicated inference pool was not found for model '{model.name}'"
+        super().__init__(msg, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class WorkerStop(MLServerError):
     def __init__(self, exit_code: int):
         msg = f"Worker process stopped unexpectedly with exit code {exit_code}."
@@ -44,3 +51,21 @@ class WorkerError(MLServerError):
             status_code = exc.status_code
 
         super().__init__(msg, status_code)
+
+
+class InvalidDispatchPolicy(MLServerError):
+    def __init__(self, name: str, available: List[str]):
+        msg = (
+            f"Invalid dispatch policy '{name}' "
+            f"(available policies are {', '.join(available)})"
+        )
+        super().__init__(msg, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class NoWorkersAvailable(MLServerError):
+    def __init__(self, model_name: str, model_version: Optional[str] = None):
+        msg = f"No inference workers are currently serving model '{model_name}'"
+        if model_version:
+            msg += f" with version '{model_version}'"
+
+        super().__init__(msg, status.HTTP_503_SERVICE_UNAVAILABLE)
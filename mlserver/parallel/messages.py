@@ -2,55 +2,168 @@ import json
 
 from asyncio import CancelledError
 from enum import IntEnum
-from pydantic import BaseModel, Field
-from typing import Any, Dict, List, Optional, Union
+from itertools import count
+from typing import Any, Dict, Optional, Sequence, Tuple, Type, Union
 
-from ..utils import generate_uuid
 from ..settings import ModelSettings
 
+_message_ids = count(1)
+
+
+def next_message_id() -> int:
+    """
+    Returns a new sequential message ID, unique within the current process.
+    """
+    # NOTE: Calling `next()` on an `itertools.count` is atomic, so this is
+    # also safe to use across threads
+    return next(_message_ids)
+
+
+def _rebuild_message(message_class: Type["Message"], fields: Tuple[Any, ...]):
+    return message_class(**dict(zip(message_class._field_names, fields)))
+
 
 class ModelUpdateType(IntEnum):
     Load = 1
     Unload = 2
 
 
-class Message(BaseModel):
-    id: str = Field(default_factory=generate_uuid)
+class Message:
+    """
+    Base class for the messages exchanged between the main process and the
+    inference pool workers.
+
+    Messages get created and pickled for every request, so they are kept as
+    plain slotted objects, which get pickled as a flat tuple of their fields.
+    """
+
+    __slots__ = ("id",)
+    _field_names: Tuple[str, ...] = ("id",)
+
+    def __init__(self, id: Optional[int] = None):
+        self.id = next_message_id() if id is None else id
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Public fields, in the order they get pickled
+        cls._field_names = tuple(
+            field
+            for klass in reversed(cls.__mro__)
+            for field in getattr(klass, "__slots__", ())
+            if not field.startswith("_")
+        )
+
+    def _fields(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, field) for field in self._field_names)
+
+    def __reduce__(self):
+        return _rebuild_message, (self.__class__, self._fields())
+
+    def copy(self, **changes):
+        """
+        Returns a copy of the message, with any changes applied to it.
+        """
+        fields = dict(zip(self._field_names, self._fields()))
+        fields.update(changes)
+        return self.__class__(**fields)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, self.__class__):
+            return NotImplemented
+
+        return self._fields() == other._fields()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{field}={value!r}"
+            for field, value in zip(self._field_names, self._fields())
+        )
+        return f"{self.__class__.__name__}({fields})"
 
 
 class ModelRequestMessage(Message):
-    model_name: str
-    model_version: Optional[str] = None
-    method_name: str
-    method_args: List[Any] = []
-    method_kwargs: Dict[str, Any] = {}
+    __slots__ = (
+        "model_name",
+        "model_version",
+        "method_name",
+        "method_args",
+        "method_kwargs",
+    )
+
+    def __init__(
+        self,
+        model_name: str,
+        method_name: str,
+        model_version: Optional[str] = None,
+        method_args: Sequence[Any] = (),
+        method_kwargs: Optional[Dict[str, Any]] = None,
+        id: Optional[int] = None,
+    ):
+        super().__init__(id)
+        self.model_name = model_name
+        self.model_version = model_version
+        self.method_name = method_name
+        self.method_args = list(method_args)
+        self.method_kwargs = method_kwargs or {}
 
 
 class ModelResponseMessage(Message):
-    class Config:
-        # This is to allow having an Exception field
-        arbitrary_types_allowed = True
-
-    return_value: Optional[Any]
-    exception: Optional[Union[Exception, CancelledError]]
+    # NOTE: The `service_time` is the time (in seconds) that the worker took
+    # to process the request, excluding any time spent waiting to be sent
+    __slots__ = ("return_value", "exception", "service_time")
+
+    def __init__(
+        self,
+        id: int,
+        return_value: Optional[Any] = None,
+        exception: Optional[Union[Exception, CancelledError]] = None,
+        service_time: Optional[float] = None,
+    ):
+        super().__init__(id)
+        self.return_value = return_value
+        self.exception = exception
+        self.service_time = service_time
 
 
 class ModelUpdateMessage(Message):
-    update_type: ModelUpdateType
-    serialised_model_settings: str
+    # NOTE: The deserialised `_model_settings` are only cached locally, and
+    # never get pickled
+    __slots__ = ("update_type", "serialised_model_settings", "_model_settings")
+
+    def __init__(
+        self,
+        update_type: ModelUpdateType,
+        serialised_model_settings: Optional[str] = None,
+        model_settings: Optional[ModelSettings] = None,
+        id: Optional[int] = None,
+    ):
+        super().__init__(id)
+        self.update_type = ModelUpdateType(update_type)
+        # NOTE: Keep the given settings around, so that they don't need to get
+        # deserialised again within the same process
+        self._model_settings: Optional[ModelSettings] = model_settings
 
-    def __init__(self, *args, **kwargs):
-        model_settings = kwargs.pop("model_settings", None)
         if model_settings:
             as_dict = model_settings.dict()
             # Ensure the private `_source` attr also gets serialised
             if model_settings._source:
                 as_dict["_source"] = model_settings._source
 
-            kwargs["serialised_model_settings"] = json.dumps(as_dict)
+            serialised_model_settings = json.dumps(as_dict)
 
-        return super().__init__(*args, **kwargs)
+        if serialised_model_settings is None:
+            raise TypeError(
+                "Either `model_settings` or `serialised_model_settings` "
+                "need to be provided"
+            )
+
+        self.serialised_model_settings = serialised_model_settings
 
     @property
     def model_settings(self) -> ModelSettings:
-        return ModelSettings.parse_raw(self.serialised_model_settings)
+        if self._model_settings is None:
+            self._model_settings = ModelSettings.parse_raw(
+                self.serialised_model_settings
+            )
+
+        return self._model_settings
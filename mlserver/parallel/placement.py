@@ -0,0 +1,88 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..settings import ModelSettings
+
+PlacementKey = Tuple[str, Optional[str]]
+
+
+def _get_key(model_name: str, model_version: Optional[str]) -> PlacementKey:
+    return (model_name, model_version)
+
+
+class ModelPlacement:
+    """
+    Keeps track of which workers each model has been loaded on, for models
+    which only get loaded on a subset of the inference pool workers (i.e.
+    which set a number of `parallel_replicas`).
+
+    Models without a number of replicas get loaded on every worker, and thus
+    are not tracked here.
+    """
+
+    def __init__(self) -> None:
+        self._placements: Dict[PlacementKey, Set[int]] = {}
+
+    def get_workers(
+        self, model_name: str, model_version: Optional[str] = None
+    ) -> Optional[Set[int]]:
+        """
+        Returns the PIDs of the workers where the model has been loaded, or
+        `None` if the model gets loaded on every worker.
+        """
+        return self._placements.get(_get_key(model_name, model_version))
+
+    def place(
+        self, model_settings: ModelSettings, worker_pids: Iterable[int]
+    ) -> Optional[List[int]]:
+        """
+        Returns the PIDs of the workers where the model should be loaded, out
+        of the given list of available workers, or `None` if the model should
+        get loaded on every worker.
+
+        Workers which already hold the model are kept.
+        Any remaining replicas get placed on the workers holding the fewest
+        models.
+        """
+        replicas = model_settings.parallel_replicas
+        if replicas is None:
+            return None
+
+        worker_pids = list(worker_pids)
+        placed = self.get_workers(model_settings.name, model_settings.version)
+        placed = placed or set()
+
+        current = [pid for pid in worker_pids if pid in placed]
+        if len(current) >= replicas:
+            return current[:replicas]
+
+        # NOTE: Sorting is stable, so ties will follow the workers' order
+        candidates = sorted(
+            [pid for pid in worker_pids if pid not in placed],
+            key=self._num_models,
+        )
+        return current + candidates[: replicas - len(current)]
+
+    def _num_models(self, worker_pid: int) -> int:
+        return sum(worker_pid in placed for placed in self._placements.values())
+
+    def set_workers(
+        self, model_settings: ModelSettings, worker_pids: Optional[Iterable[int]]
+    ):
+        key = _get_key(model_settings.name, model_settings.version)
+        if worker_pids is None:
+            self._placements.pop(key, None)
+            return
+
+        self._placements[key] = set(worker_pids)
+
+    def remove(self, model_settings: ModelSettings):
+        key = _get_key(model_settings.name, model_settings.version)
+        self._placements.pop(key, None)
+
+    def remove_worker(self, worker_pid: int):
+        """
+        Forgets about a worker which is no longer available, so that its
+        replicas can get placed elsewhere.
+        """
+        for placed in self._placements.values():
+            placed.discard(worker_pid)
@@ -0,0 +1,125 @@
+import random
+
+from abc import ABC, abstractmethod
+from typing import Dict, List, Mapping, Tuple, Type
+
+from .errors import InvalidDispatchPolicy
+
+
+class DispatchPolicy(ABC):
+    """
+    Chooses which worker each new request gets dispatched to.
+    """
+
+    @abstractmethod
+    def select(self, worker_pids: List[int], in_flight: Mapping[int, int]) -> int:
+        """
+        Returns the PID of the worker which should serve the next request,
+        given the number of in-flight requests for each worker.
+        """
+        ...
+
+    def observe(self, worker_pid: int, latency: float):
+        """
+        Keeps track of how long a worker took to serve a request.
+        """
+        pass
+
+    def remove(self, worker_pid: int):
+        """
+        Forgets about a worker which is no longer available.
+        """
+        pass
+
+
+class RoundRobin(DispatchPolicy):
+    def __init__(self):
+        self._counter = 0
+
+    def select(self, worker_pids: List[int], in_flight: Mapping[int, int]) -> int:
+        worker_pid = worker_pids[self._counter % len(worker_pids)]
+        self._counter += 1
+        return worker_pid
+
+
+class LeastInFlight(DispatchPolicy):
+    def __init__(self):
+        self._counter = 0
+
+    def select(self, worker_pids: List[int], in_flight: Mapping[int, int]) -> int:
+        # Rotate the starting point, so that ties don't always go to the same
+        # worker
+        start = self._counter % len(worker_pids)
+        self._counter += 1
+        rotated = worker_pids[start:] + worker_pids[:start]
+        return min(rotated, key=lambda worker_pid: in_flight.get(worker_pid, 0))
+
+
+class PowerOfTwoChoices(DispatchPolicy):
+    def select(self, worker_pids: List[int], in_flight: Mapping[int, int]) -> int:
+        if len(worker_pids) == 1:
+            return worker_pids[0]
+
+        candidates = random.sample(worker_pids, 2)
+        return min(candidates, key=lambda worker_pid: in_flight.get(worker_pid, 0))
+
+
+class LatencyAware(DispatchPolicy):
+    """
+    Sends requests to the worker with the lowest expected wait, estimated as
+    its (exponentially weighted) average service time times its number of
+    in-flight requests.
+
+    The observed latencies are the time each worker took to process a
+    request (whether it succeeded or failed), which excludes any queueing
+    time, as that is already accounted for by the number of in-flight
+    requests.
+    """
+
+    def __init__(self, smoothing: float = 0.2):
+        self.smoothing = smoothing
+        self._latencies: Dict[int, float] = {}
+
+    def select(self, worker_pids: List[int], in_flight: Mapping[int, int]) -> int:
+        # NOTE: Workers without any data yet (e.g. which have just started)
+        # are assumed to be as fast as the average worker, so that they don't
+        # get flooded with every request until their first response arrives
+        default_latency = 0.0
+        if self._latencies:
+            default_latency = sum(self._latencies.values()) / len(self._latencies)
+
+        def _expected_wait(worker_pid: int) -> Tuple[float, int]:
+            latency = self._latencies.get(worker_pid, default_latency)
+            worker_in_flight = in_flight.get(worker_pid, 0)
+            # Break ties (e.g. before any latency has been observed) with the
+            # number of in-flight requests
+            return latency * (worker_in_flight + 1), worker_in_flight
+
+        return min(worker_pids, key=_expected_wait)
+
+    def observe(self, worker_pid: int, latency: float):
+        average = self._latencies.get(worker_pid)
+        if average is None:
+            self._latencies[worker_pid] = latency
+            return
+
+        self._latencies[worker_pid] = average + self.smoothing * (latency - average)
+
+    def remove(self, worker_pid: int):
+        self._latencies.pop(worker_pid, None)
+
+
+DISPATCH_POLICIES: Dict[str, Type[DispatchPolicy]] = {
+    "round_robin": RoundRobin,
+    "least_in_flight": LeastInFlight,
+    "power_of_two_choices": PowerOfTwoChoices,
+    "latency_aware": LatencyAware,
+}
+
+
+def get_dispatch_policy(name: str) -> DispatchPolicy:
+    if name not in DISPATCH_POLICIES:
+        raise InvalidDispatchPolicy(name, list(DISPATCH_POLICIES.keys()))
+
+    policy_class = DISPATCH_POLICIES[name]
+    return policy_class()
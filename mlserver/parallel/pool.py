@@ -1,7 +1,8 @@
 import asyncio
+import time
 
 from multiprocessing import Queue
-from typing import Awaitable, Callable, Dict, Optional, List, Iterable
+from typing import Awaitable, Callable, Dict, Optional, List, Iterable, Set
 
 from ..model import MLModel
 from ..types import InferenceRequest, InferenceResponse
@@ -11,13 +12,17 @@ from ..env import Environment
 from .model import ParallelModel
 from .worker import Worker
 from .logging import logger
-from .utils import configure_inference_pool, terminate_queue
+from .utils import configure_inference_pool, cancel_task
 from .messages import (
     ModelResponseMessage,
     ModelUpdateMessage,
     ModelUpdateType,
 )
+from .autoscaler import Autoscaler
 from .dispatcher import Dispatcher
+from .placement import ModelPlacement
+from .policies import get_dispatch_policy
+from .shared_memory import SharedMemoryPool
 
 
 PredictMethod = Callable[[InferenceRequest], Awaitable[InferenceResponse]]
@@ -69,23 +74,46 @@ class InferencePool:
         settings: Settings,
         env: Optional[Environment] = None,
         on_worker_stop: List[InferencePoolHook] = [],
+        name: Optional[str] = None,
     ):
         configure_inference_pool(settings)
 
+        self._name = name
+
         self._on_worker_stop = on_worker_stop
         self._env = env
         self._workers: Dict[int, Worker] = {}
+        # NOTE: Workers which are getting retired are no longer part of the
+        # rotation, but still need to get stopped if the pool gets closed
+        # before they exit
+        self._retiring: Set[Worker] = set()
         self._worker_registry = WorkerRegistry()
         self._settings = settings
-        self._responses: Queue[ModelResponseMessage] = Queue()
         for idx in range(self._settings.parallel_workers):
-            worker = Worker(self._settings, self._responses, self._env)
+            worker = self._create_worker()
             worker.start()
             self._workers[worker.pid] = worker  # type: ignore
 
-        self._dispatcher = Dispatcher(self._workers, self._responses)
+        shared_memory = None
+        if self._settings.parallel_shared_memory_threshold is not None:
+            shared_memory = SharedMemoryPool(
+                self._settings.parallel_shared_memory_threshold,
+                self._settings.parallel_shared_memory_max_size,
+            )
+
+        policy = get_dispatch_policy(self._settings.parallel_dispatch_policy)
+        self._placement = ModelPlacement()
+        self._dispatcher = Dispatcher(
+            self._workers, shared_memory, policy, self._placement
+        )
         self._dispatcher.start()
 
+        self._autoscaler = Autoscaler(self._settings)
+        self._autoscaling_task: Optional[asyncio.Task] = None
+        if self._autoscaler.enabled:
+            loop = asyncio.get_event_loop()
+            self._autoscaling_task = loop.create_task(self._autoscale())
+
     @property
     def env_hash(self) -> Optional[str]:
         if not self._env:
@@ -95,6 +123,9 @@ class InferencePool:
 
     @property
     def name(self) -> str:
+        if self._name:
+            return self._name
+
         if self.env_hash:
             return f"inference pool with hash '{self.env_hash}'"
 
@@ -116,14 +147,26 @@ class InferencePool:
             # NOTE: worker may be removed by dispatcher
             del self._workers[pid]
 
+        # Any replicas held by the worker will get placed again (most likely,
+        # on the new worker started below)
+        self._placement.remove_worker(pid)
+        self._autoscaler.remove(pid)
+        worker.responses.close()
+
         # Call attached on_worker_stop hooks
         await asyncio.gather(*[callback(worker) for callback in self._on_worker_stop])
 
         # Start a new worker
         await self._start_worker()
 
+    def _create_worker(self) -> Worker:
+        # NOTE: Each worker gets its own responses queue, so that workers don't
+        # contend with each other to send back their responses
+        responses: Queue[ModelResponseMessage] = Queue()
+        return Worker(self._settings, responses, self._env)
+
     async def _start_worker(self) -> Worker:
-        worker = Worker(self._settings, self._responses, self._env)
+        worker = self._create_worker()
         worker.start()
         logger.info(f"Starting new worker with PID {worker.pid} on {self.name}...")
 
@@ -132,6 +175,39 @@ class InferencePool:
         self._workers[worker.pid] = worker  # type: ignore
         await self._dispatcher.on_worker_start(worker)
 
+        # NOTE: List the new worker first, so that it gets preferred when
+        # placing any missing replicas (e.g. from a worker which died)
+        available = [worker.pid, *self._dispatcher.ready_workers]
+        to_load = []
+        for model_settings in self._worker_registry.models:
+            worker_pids = self._placement.place(model_settings, available)
+            if worker_pids is None:
+                to_load.append(model_settings)
+            elif worker.pid in worker_pids:
+                # NOTE: If more than one replica went missing (e.g. if several
+                # workers died), other ready workers may have been picked as
+                # well, so these need to load the model before getting any
+                # traffic
+                placed = self._placement.get_workers(
+                    model_settings.name, model_settings.version
+                )
+                new_pids = [
+                    pid
+                    for pid in worker_pids
+                    if pid != worker.pid and pid not in (placed or set())
+                ]
+                if new_pids:
+                    load_message = ModelUpdateMessage(
+                        update_type=ModelUpdateType.Load,
+                        model_settings=model_settings,
+                    )
+                    await self._dispatcher.dispatch_update(load_message, new_pids)
+
+                # NOTE: The new worker won't receive any traffic until it's
+                # ready, so it's safe to record it as a replica already
+                to_load.append(model_settings)
+                self._placement.set_workers(model_settings, worker_pids)
+
         await asyncio.gather(
             *[
                 self._dispatcher.dispatch_update_to_worker(
@@ -141,7 +217,7 @@ class InferencePool:
                         model_settings=model_settings,  # type: ignore
                     ),
                 )
-                for model_settings in self._worker_registry.models
+                for model_settings in to_load
             ]
         )
 
@@ -152,30 +228,155 @@ class InferencePool:
         logger.info(f"New worker with PID {worker.pid} on {self.name} is now ready.")
         return worker
 
+    async def _autoscale(self):
+        while True:
+            await asyncio.sleep(self._settings.parallel_autoscaling_interval)
+            try:
+                await self._scale()
+            except Exception:
+                logger.exception(f"An error occurred autoscaling the {self.name}")
+
+    async def _scale(self):
+        worker_pids = self._dispatcher.ready_workers
+        if len(worker_pids) < len(self._workers):
+            # NOTE: Hold off scaling while any worker is still starting (e.g.
+            # after a restart), as it can't take any traffic yet
+            return
+
+        in_flight = self._dispatcher.in_flight()
+        self._autoscaler.observe(worker_pids, in_flight)
+
+        oldest_wait = self._dispatcher.oldest_wait()
+        if self._autoscaler.should_scale_up(worker_pids, in_flight, oldest_wait):
+            logger.info(
+                f"Scaling up {self.name} from {len(worker_pids)} workers "
+                f"({sum(in_flight.values())} in-flight requests)..."
+            )
+            # NOTE: New workers will have every model loaded before they
+            # start receiving any traffic
+            await self._start_worker()
+            return
+
+        idle_pid = self._autoscaler.get_idle_worker(worker_pids, in_flight)
+        if idle_pid is not None:
+            logger.info(f"Scaling down {self.name} from {len(worker_pids)} workers...")
+            await self._retire_worker(self._workers[idle_pid])
+
+    async def _retire_worker(self, worker: Worker):
+        logger.info(f"Retiring idle worker with PID {worker.pid} on {self.name}...")
+
+        # Move any replicas held by the worker elsewhere before taking it out
+        # of the rotation, so that these models stay available
+        ready_workers = self._dispatcher.ready_workers
+        remaining = [pid for pid in ready_workers if pid != worker.pid]
+        await self._place_missing_replicas(remaining)
+
+        self._retiring.add(worker)
+        self._dispatcher.on_worker_retire(worker)
+        await self._drain_worker(worker)
+        self._placement.remove_worker(worker.pid)  # type: ignore
+        self._autoscaler.remove(worker.pid)  # type: ignore
+
+        await worker.stop()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, worker.join, self._settings.parallel_workers_timeout
+        )
+        if worker.exitcode is None:
+            worker.kill()
+
+        self._retiring.discard(worker)
+
+        # NOTE: Only stop tracking the worker once it has exited, so that any
+        # shared memory segments still in use can get safely reclaimed
+        self._dispatcher.on_worker_stop(worker, 0)
+        worker.responses.close()
+        await asyncio.gather(*[callback(worker) for callback in self._on_worker_stop])
+        logger.info(f"Worker with PID {worker.pid} on {self.name} is now retired.")
+
+    async def _place_missing_replicas(self, worker_pids: List[int]):
+        for model_settings in self._worker_registry.models:
+            placed = self._placement.get_workers(
+                model_settings.name, model_settings.version
+            )
+            if placed is None:
+                # Model is loaded on every worker
+                continue
+
+            targets = self._placement.place(model_settings, worker_pids)
+            new_pids = [pid for pid in targets or [] if pid not in placed]
+            if not new_pids:
+                continue
+
+            load_message = ModelUpdateMessage(
+                update_type=ModelUpdateType.Load, model_settings=model_settings
+            )
+            await self._dispatcher.dispatch_update(load_message, new_pids)
+            self._placement.set_workers(model_settings, targets)
+
+    async def _drain_worker(self, worker: Worker):
+        # Wait (up to a grace period) for any in-flight requests to finish
+        deadline = time.monotonic() + self._settings.parallel_workers_timeout
+        while time.monotonic() < deadline:
+            if self._dispatcher.in_flight().get(worker.pid, 0) == 0:  # type: ignore
+                return
+
+            await asyncio.sleep(0.1)
+
     async def load_model(self, model: MLModel) -> MLModel:
+        model_settings: ModelSettings = model.settings  # type: ignore
+        # NOTE: Replicas only get placed on workers which are ready, as any
+        # worker still starting up won't receive any traffic yet
+        worker_pids = self._placement.place(
+            model_settings, self._dispatcher.ready_workers
+        )
         load_message = ModelUpdateMessage(
-            update_type=ModelUpdateType.Load,
-            model_settings=model.settings,  # type: ignore
+            update_type=ModelUpdateType.Load, model_settings=model_settings
         )
-        await self._dispatcher.dispatch_update(load_message)
+        await self._dispatcher.dispatch_update(load_message, worker_pids)
 
-        self._worker_registry.add(model.settings)
+        # NOTE: Only route traffic to the new replicas once they are loaded
+        self._placement.set_workers(model_settings, worker_pids)
+        self._worker_registry.add(model_settings)
         return ParallelModel(model, self._dispatcher)
 
     async def reload_model(self, old_model: MLModel, new_model: MLModel) -> MLModel:
+        previous = self._get_model_workers(old_model)
+
         # The model registries within each worker will take care of reloading
         # the model internally
         self._worker_registry.remove(old_model.settings)
         self._worker_registry.add(new_model.settings)
-        return await self.load_model(new_model)
+        parallel_model = await self.load_model(new_model)
+
+        # If the number of replicas has changed, unload the model from any
+        # workers which no longer hold it
+        stale = previous - self._get_model_workers(new_model)
+        if stale:
+            unload_message = ModelUpdateMessage(
+                update_type=ModelUpdateType.Unload,
+                model_settings=old_model.settings,  # type: ignore
+            )
+            await self._dispatcher.dispatch_update(unload_message, stale)
+
+        return parallel_model
+
+    def _get_model_workers(self, model: MLModel) -> Set[int]:
+        worker_pids = self._placement.get_workers(model.name, model.version)
+        if worker_pids is None:
+            return set(self._workers)
+
+        return set(worker_pids)
 
     async def unload_model(self, model: MLModel) -> MLModel:
         unload_message = ModelUpdateMessage(
             update_type=ModelUpdateType.Unload,
             model_settings=model.settings,  # type: ignore
         )
-        await self._dispatcher.dispatch_update(unload_message)
+        worker_pids = self._placement.get_workers(model.name, model.version)
+        await self._dispatcher.dispatch_update(unload_message, worker_pids)
 
+        self._placement.remove(model.settings)
         self._worker_registry.remove(model.settings)
         return ParallelModel(model, self._dispatcher)
 
@@ -183,14 +384,20 @@ class InferencePool:
         return len(self._worker_registry) == 0
 
     async def close(self):
+        if self._autoscaling_task is not None:
+            await cancel_task(self._autoscaling_task)
+
+        workers = [*self._workers.values(), *self._retiring]
         await self._close_workers()
-        await terminate_queue(self._responses)
-        self._responses.close()
+        # NOTE: Stop the dispatcher before closing the responses queues, to
+        # ensure it's no longer watching their readers
         await self._dispatcher.stop()
+        for worker in workers:
+            worker.responses.close()
 
     async def _close_workers(self):
         # First close down model updates loop
-        for pid, worker in self._workers.items():
+        for worker in [*self._workers.values(), *self._retiring]:
             await worker.stop()
             worker.join(self._settings.parallel_workers_timeout)
             if worker.exitcode is None:
@@ -200,3 +407,4 @@ class InferencePool:
             )
 
         self._workers.clear()
+        self._retiring.clear()
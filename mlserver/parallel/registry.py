@@ -12,7 +12,7 @@ from ..settings import Settings
 from ..env import Environment, compute_hash
 from ..registry import model_initialiser
 
-from .errors import EnvironmentNotFound
+from .errors import DedicatedPoolNotFound, EnvironmentNotFound
 from .logging import logger
 from .pool import InferencePool, InferencePoolHook
 
@@ -39,10 +39,16 @@ def _get_env_tarball(model: MLModel) -> Optional[str]:
     return to_absolute_path(model_settings, env_tarball)
 
 
+def _get_pool_workers(model: MLModel) -> Optional[int]:
+    return model.settings.parallel_pool_workers
+
+
 class InferencePoolRegistry:
     """
     Keeps track of the different inference pools loaded in the server.
     Each inference pool will generally be used to load a different environment.
+    Models can also opt into their own dedicated inference pool (with its own
+    number of workers), which won't be shared with any other model.
     """
 
     def __init__(
@@ -54,6 +60,8 @@ class InferencePoolRegistry:
             self._settings, on_worker_stop=on_worker_stop
         )
         self._pools: Dict[str, InferencePool] = {}
+        # Dedicated pools, indexed by model name
+        self._dedicated_pools: Dict[str, InferencePool] = {}
 
         os.makedirs(self._settings.environments_dir, exist_ok=True)
 
@@ -72,10 +80,16 @@ class InferencePoolRegistry:
 
         await self._default_pool.on_worker_stop(pid, exit_code)
         await asyncio.gather(
-            *[pool.on_worker_stop(pid) for pool in self._pools.values()]
+            *[
+                pool.on_worker_stop(pid, exit_code)
+                for pool in [*self._pools.values(), *self._dedicated_pools.values()]
+            ]
         )
 
     async def _get_or_create(self, model: MLModel) -> InferencePool:
+        if _get_pool_workers(model) is not None:
+            return await self._get_or_create_dedicated(model)
+
         env_tarball = _get_env_tarball(model)
         if not env_tarball:
             return self._default_pool
@@ -91,6 +105,36 @@ class InferencePoolRegistry:
         self._pools[env_hash] = pool
         return pool
 
+    async def _get_or_create_dedicated(self, model: MLModel) -> InferencePool:
+        # NOTE: Any changes to the number of workers will only apply once the
+        # dedicated pool gets re-created (i.e. once every version of the model
+        # has been unloaded)
+        if model.name in self._dedicated_pools:
+            return self._dedicated_pools[model.name]
+
+        env = None
+        env_tarball = _get_env_tarball(model)
+        if env_tarball:
+            env_hash = await compute_hash(env_tarball)
+            env = await self._extract_tarball(env_hash, env_tarball)
+
+        # NOTE: Dedicated pools only autoscale if the model sets its own
+        # maximum size
+        settings = self._settings.copy(
+            update={
+                "parallel_workers": _get_pool_workers(model),
+                "parallel_workers_max": model.settings.parallel_pool_workers_max,
+            }
+        )
+        pool = InferencePool(
+            settings,
+            env=env,
+            on_worker_stop=self._on_worker_stop,
+            name=f"dedicated inference pool for model '{model.name}'",
+        )
+        self._dedicated_pools[model.name] = pool
+        return pool
+
     async def _extract_tarball(self, env_hash: str, env_tarball: str) -> Environment:
         env_path = self._get_env_path(env_hash)
         if os.path.isdir(env_path):
@@ -104,6 +148,12 @@ class InferencePoolRegistry:
         return os.path.join(self._settings.environments_dir, env_hash)
 
     async def _find(self, model: MLModel) -> InferencePool:
+        if _get_pool_workers(model) is not None:
+            if model.name not in self._dedicated_pools:
+                raise DedicatedPoolNotFound(model)
+
+            return self._dedicated_pools[model.name]
+
         env_hash = _get_environment_hash(model)
         if not env_hash:
             return self._default_pool
@@ -179,14 +229,20 @@ class InferencePoolRegistry:
             # Skip reload if model has disabled parallel workers
             return new_model
 
-        old_hash = _get_environment_hash(old_model)
+        old_pool = await self._find(old_model)
         new_pool = await self._get_or_create(new_model)
 
-        loaded = await new_pool.reload_model(old_model, new_model)
+        if old_pool == new_pool:
+            loaded = await new_pool.reload_model(old_model, new_model)
+            _set_environment_hash(loaded, new_pool.env_hash)
+            return loaded
+
+        # Environment (or dedicated pool) has changed in the new version, so
+        # the new pool has never seen the old version: load the new one there
+        # and unload the old one from its own pool
+        loaded = await new_pool.load_model(new_model)
         _set_environment_hash(loaded, new_pool.env_hash)
-        if old_hash != new_pool.env_hash:
-            # Environment has changed in the new version, so unload the old one
-            await self.unload_model(old_model)
+        await self.unload_model(old_model)
 
         return loaded
 
@@ -198,7 +254,10 @@ class InferencePoolRegistry:
         pool = await self._find(model)
         unloaded = await pool.unload_model(model)
 
-        if pool != self._default_pool and pool.empty():
+        if _get_pool_workers(model) is not None and pool.empty():
+            logger.info(f"The {pool.name} is now empty")
+            await self._close_dedicated_pool(model.name)
+        elif pool != self._default_pool and pool.empty():
             logger.info(f"Inference pool with hash '{pool.env_hash}' is now empty")
             await self._close_pool(pool.env_hash)
 
@@ -210,6 +269,7 @@ class InferencePoolRegistry:
         await asyncio.gather(
             self._close_pool(None),
             *[self._close_pool(env_hash) for env_hash in self._pools],
+            *[self._close_dedicated_pool(name) for name in self._dedicated_pools],
         )
 
     async def _close_pool(self, env_hash: Optional[str] = None):
@@ -223,5 +283,25 @@ class InferencePoolRegistry:
 
         if env_hash:
             del self._pools[env_hash]
-            env_path = self._get_env_path(env_hash)
-            shutil.rmtree(env_path)
+            self._remove_env(env_hash)
+
+    async def _close_dedicated_pool(self, model_name: str):
+        pool = self._dedicated_pools[model_name]
+
+        logger.info(f"Waiting for shutdown of {pool.name}...")
+        await pool.close()
+        logger.info(f"Shutdown of {pool.name} complete")
+
+        del self._dedicated_pools[model_name]
+        if pool.env_hash:
+            self._remove_env(pool.env_hash)
+
+    def _remove_env(self, env_hash: str):
+        # NOTE: The same environment may be shared by an environment pool and
+        # any number of dedicated pools
+        pools = [*self._pools.values(), *self._dedicated_pools.values()]
+        if any(pool.env_hash == env_hash for pool in pools):
+            return
+
+        env_path = self._get_env_path(env_hash)
+        shutil.rmtree(env_path)
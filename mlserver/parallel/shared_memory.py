@@ -0,0 +1,373 @@
+import os
+import secrets
+import numpy as np
+
+from collections import OrderedDict
+from math import prod
+from multiprocessing.shared_memory import SharedMemory
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional, TypeVar
+
+from ..codecs.numpy import to_dtype
+from ..types import (
+    InferenceRequest,
+    InferenceResponse,
+    RequestInput,
+    ResponseOutput,
+    TensorData,
+)
+from .logging import logger
+from .messages import ModelRequestMessage, ModelResponseMessage
+
+# Each segment starts with a header, whose first byte flags whether the
+# segment is currently in use.
+# The header is padded so that the tensor data stays aligned.
+HEADER_SIZE = 64
+SEGMENT_FREE = 0
+SEGMENT_IN_USE = 1
+
+# Smallest segment that will get allocated, to make it easier to recycle
+# segments across payloads of slightly different sizes
+MIN_SEGMENT_SIZE = 64 * 1024
+
+# Segment names are prefixed with the PID of the process that owns them, so
+# that they can get cleaned up if that process dies.
+# NOTE: Names are kept short, as some platforms (e.g. macOS) limit them to 31
+# characters.
+SEGMENT_NAME_PREFIX = "mls_"
+
+_Tensor = TypeVar("_Tensor", RequestInput, ResponseOutput)
+_Payload = TypeVar("_Payload", InferenceRequest, InferenceResponse)
+
+
+class SharedTensor(BaseModel):
+    """
+    Descriptor of a tensor whose data lives in a shared memory segment.
+    """
+
+    segment_name: str
+    dtype: str
+    size: int
+
+
+def _get_owner_prefix(pid: int) -> str:
+    return f"{SEGMENT_NAME_PREFIX}{pid}_"
+
+
+def _get_segment_owner_prefix(segment_name: str) -> str:
+    return segment_name[: segment_name.rindex("_") + 1]
+
+
+def _create_segment(size: int) -> SharedMemory:
+    while True:
+        name = _get_owner_prefix(os.getpid()) + secrets.token_hex(6)
+        try:
+            return SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            continue
+
+
+def _unlink_segment(segment: SharedMemory):
+    try:
+        segment.unlink()
+    except FileNotFoundError:
+        # Segment has already been unlinked (e.g. by a different process)
+        pass
+
+
+def _get_segment_size(nbytes: int) -> int:
+    # Round up to the next power of two
+    size = max(HEADER_SIZE + nbytes, MIN_SEGMENT_SIZE)
+    return 1 << (size - 1).bit_length()
+
+
+class SharedMemoryPool:
+    """
+    Moves large tensors between processes through shared memory segments,
+    so that only their descriptors need to get pickled.
+
+    Segments are owned (i.e. created and unlinked) by the process which
+    writes into them, and get flagged as free again by the process which
+    reads from them, so that they can get recycled across payloads without
+    any extra messages.
+    The total size of the owned segments is bounded by ``max_size``, above
+    which tensors will get sent inline instead.
+    Likewise, the total size of the segments attached from each owner is
+    bounded by ``max_size``, so that segments dropped by their owner don't
+    stay mapped forever.
+    """
+
+    def __init__(self, threshold: int, max_size: Optional[int] = None):
+        self.threshold = threshold
+        self.max_size = max_size
+        self._owned: List[SharedMemory] = []
+        # Attached segments, from least to most recently used
+        self._attached: "OrderedDict[str, SharedMemory]" = OrderedDict()
+        # PID of the process expected to read each owned segment (if known)
+        self._readers: Dict[str, int] = {}
+
+    def encode_request(
+        self, message: ModelRequestMessage, reader: Optional[int] = None
+    ) -> ModelRequestMessage:
+        """
+        Moves any large tensors in a request into shared memory.
+        If the PID of the ``reader`` is given, its segments can get reclaimed
+        through ``release()`` if the reader dies before freeing them.
+        """
+        method_args = [self.encode(arg, reader) for arg in message.method_args]
+        method_kwargs = {
+            key: self.encode(value, reader)
+            for key, value in message.method_kwargs.items()
+        }
+        return message.copy(method_args=method_args, method_kwargs=method_kwargs)
+
+    def decode_request(self, message: ModelRequestMessage) -> ModelRequestMessage:
+        method_args = [self.decode(arg) for arg in message.method_args]
+        method_kwargs = {
+            key: self.decode(value) for key, value in message.method_kwargs.items()
+        }
+        return message.copy(method_args=method_args, method_kwargs=method_kwargs)
+
+    def encode_response(self, message: ModelResponseMessage) -> ModelResponseMessage:
+        return_value = self.encode(message.return_value)
+        if return_value is message.return_value:
+            return message
+
+        return message.copy(return_value=return_value)
+
+    def decode_response(self, message: ModelResponseMessage) -> ModelResponseMessage:
+        return_value = self.decode(message.return_value)
+        if return_value is message.return_value:
+            return message
+
+        return message.copy(return_value=return_value)
+
+    def encode(self, value: Any, reader: Optional[int] = None) -> Any:
+        """
+        Moves the data of any large tensors in an inference request or
+        response into shared memory.
+        Any other value will be returned as-is.
+        """
+        if isinstance(value, InferenceRequest):
+            return self._encode_payload(value, "inputs", reader)
+
+        if isinstance(value, InferenceResponse):
+            return self._encode_payload(value, "outputs", reader)
+
+        return value
+
+    def decode(self, value: Any) -> Any:
+        """
+        Reads back the data of any tensors in an inference request or
+        response which was moved into shared memory.
+        Any other value will be returned as-is.
+        """
+        if isinstance(value, InferenceRequest):
+            return self._decode_payload(value, "inputs")
+
+        if isinstance(value, InferenceResponse):
+            return self._decode_payload(value, "outputs")
+
+        return value
+
+    def _encode_payload(
+        self, payload: _Payload, field: str, reader: Optional[int]
+    ) -> _Payload:
+        tensors = getattr(payload, field)
+        encoded = [self._encode_tensor(tensor, reader) for tensor in tensors]
+        if all(new is old for new, old in zip(encoded, tensors)):
+            return payload
+
+        # NOTE: Copy the payload to avoid modifying the caller's object
+        return payload.copy(update={field: encoded})
+
+    def _decode_payload(self, payload: _Payload, field: str) -> _Payload:
+        tensors = getattr(payload, field)
+        decoded = [self._decode_tensor(tensor) for tensor in tensors]
+        if all(new is old for new, old in zip(decoded, tensors)):
+            return payload
+
+        return payload.copy(update={field: decoded})
+
+    def _encode_tensor(self, tensor: _Tensor, reader: Optional[int]) -> _Tensor:
+        if tensor.datatype == "BYTES":
+            # Variable-length data can't be described just by its dtype
+            return tensor
+
+        dtype = to_dtype(tensor)
+        if prod(tensor.shape) * dtype.itemsize < self.threshold:
+            return tensor
+
+        data = getattr(tensor.data, "__root__", tensor.data)
+        try:
+            array = np.asarray(data, dtype=dtype).ravel()
+        except ValueError:
+            # Data doesn't fit in an array (e.g. because it's ragged), so
+            # leave it to the regular path
+            return tensor
+
+        try:
+            segment = self._lease(array.nbytes, reader)
+        except OSError:
+            segment = None
+
+        if segment is None:
+            logger.warning(
+                f"Unable to allocate {array.nbytes} bytes of shared memory, "
+                "falling back to sending tensor data inline"
+            )
+            return tensor
+
+        shared: np.ndarray = np.ndarray(
+            array.shape, dtype=dtype, buffer=segment.buf, offset=HEADER_SIZE
+        )
+        shared[:] = array
+        del shared
+
+        descriptor = SharedTensor(
+            segment_name=segment.name, dtype=dtype.str, size=array.size
+        )
+        return tensor.copy(update={"data": TensorData(__root__=descriptor)})
+
+    def _decode_tensor(self, tensor: _Tensor) -> _Tensor:
+        descriptor = getattr(tensor.data, "__root__", tensor.data)
+        if not isinstance(descriptor, SharedTensor):
+            return tensor
+
+        segment = self._attach(descriptor.segment_name)
+        array = np.frombuffer(
+            segment.buf,
+            dtype=descriptor.dtype,
+            count=descriptor.size,
+            offset=HEADER_SIZE,
+        ).copy()
+
+        # Once the data has been copied out, the segment can get reused
+        segment.buf[0] = SEGMENT_FREE
+        return tensor.copy(update={"data": TensorData(__root__=array)})
+
+    def _lease(self, nbytes: int, reader: Optional[int]) -> Optional[SharedMemory]:
+        required = HEADER_SIZE + nbytes
+        free = [
+            segment
+            for segment in self._owned
+            if segment.size >= required and segment.buf[0] == SEGMENT_FREE
+        ]
+
+        if free:
+            segment = min(free, key=lambda segment: segment.size)
+        else:
+            size = _get_segment_size(nbytes)
+            if not self._reserve(size):
+                return None
+
+            segment = _create_segment(size)
+            self._owned.append(segment)
+
+        segment.buf[0] = SEGMENT_IN_USE
+        if reader is None:
+            self._readers.pop(segment.name, None)
+        else:
+            self._readers[segment.name] = reader
+
+        return segment
+
+    def _reserve(self, size: int) -> bool:
+        """
+        Ensures there is room for a new segment of the given size, dropping
+        free segments (starting by the smallest ones) if needed.
+        """
+        if self.max_size is None:
+            return True
+
+        if size > self.max_size:
+            return False
+
+        total = sum(segment.size for segment in self._owned)
+        free = sorted(
+            [segment for segment in self._owned if segment.buf[0] == SEGMENT_FREE],
+            key=lambda segment: segment.size,
+        )
+        while total + size > self.max_size and free:
+            segment = free.pop(0)
+            total -= segment.size
+            self._drop(segment)
+
+        return total + size <= self.max_size
+
+    def _drop(self, segment: SharedMemory):
+        self._owned.remove(segment)
+        self._readers.pop(segment.name, None)
+        segment.close()
+        _unlink_segment(segment)
+
+    def _attach(self, segment_name: str) -> SharedMemory:
+        segment = self._attached.get(segment_name)
+        if segment is not None:
+            self._attached.move_to_end(segment_name)
+            return segment
+
+        segment = SharedMemory(name=segment_name)
+        self._attached[segment_name] = segment
+        self._evict(_get_segment_owner_prefix(segment_name))
+        return segment
+
+    def _evict(self, owner_prefix: str):
+        """
+        Detaches from the least recently used segments of an owner, once
+        their total size goes above ``max_size``.
+        As owners never keep more than ``max_size`` worth of segments, these
+        will usually have been dropped by their owner already (otherwise,
+        they will just get attached again next time they are used).
+        """
+        if self.max_size is None:
+            return
+
+        attached = [
+            segment_name
+            for segment_name in self._attached
+            if segment_name.startswith(owner_prefix)
+        ]
+        total = sum(self._attached[segment_name].size for segment_name in attached)
+
+        # NOTE: The most recently used segment (i.e. the one just attached)
+        # is never evicted
+        for segment_name in attached[:-1]:
+            if total <= self.max_size:
+                break
+
+            segment = self._attached.pop(segment_name)
+            total -= segment.size
+            segment.close()
+
+    def release(self, pid: int):
+        """
+        Reclaims the segments shared with a process which has stopped (e.g.
+        a worker which died or got retired).
+        That is, it frees any owned segments which that process was
+        expected to read, and it detaches from (and unlinks) any segments
+        which were owned by that process.
+        """
+        for segment in self._owned:
+            if self._readers.get(segment.name) == pid:
+                segment.buf[0] = SEGMENT_FREE
+                del self._readers[segment.name]
+
+        owner_prefix = _get_owner_prefix(pid)
+        for segment_name in list(self._attached):
+            if segment_name.startswith(owner_prefix):
+                segment = self._attached.pop(segment_name)
+                segment.close()
+                _unlink_segment(segment)
+
+    def close(self):
+        for segment in self._attached.values():
+            segment.close()
+
+        for segment in self._owned:
+            segment.close()
+            _unlink_segment(segment)
+
+        self._attached.clear()
+        self._owned.clear()
+        self._readers.clear()
@@ -1,8 +1,12 @@
 import asyncio
 import multiprocessing
+import struct
 
-from asyncio import Task
+from asyncio import AbstractEventLoop, Future, Task
 from multiprocessing import Queue
+from multiprocessing.connection import Connection
+from multiprocessing.reduction import ForkingPickler
+from typing import Any, Callable, Optional
 
 from ..settings import Settings
 
@@ -10,6 +14,10 @@ from .logging import logger
 
 END_OF_QUEUE = None
 
+# Messages larger than this (in bytes, once pickled) get read and unpickled on
+# a separate thread, to avoid stalling the event loop
+LARGE_MESSAGE_SIZE = 1024 * 1024
+
 
 def configure_inference_pool(settings: Settings):
     if not settings.parallel_workers:
@@ -37,6 +45,116 @@ async def terminate_queue(queue: Queue):
         return
 
 
+def _recv_size(connection: Connection) -> int:
+    # NOTE: `Connection` doesn't expose a public way to read a message's
+    # length and its contents separately, which is what lets us unpickle large
+    # messages on a separate thread. This follows the same framing as
+    # `Connection.recv_bytes()`, which has been stable across Python versions.
+    buf = connection._recv(4)  # type: ignore
+    (size,) = struct.unpack("!i", buf.getvalue())
+    if size == -1:
+        buf = connection._recv(8)  # type: ignore
+        (size,) = struct.unpack("!Q", buf.getvalue())
+
+    return size
+
+
+def _recv_payload(connection: Connection, size: int) -> Any:
+    buf = connection._recv(size)  # type: ignore
+    return ForkingPickler.loads(buf.getbuffer())
+
+
+class MessageReader:
+    """
+    Watches a queue from the event loop, passing each of its messages to the
+    ``callback`` in the same order they were sent.
+    Large messages get read and unpickled on a separate thread. The queue
+    stops being watched meanwhile, so that no later message can overtake
+    them.
+    """
+
+    def __init__(self, queue: Queue, callback: Callable[[Any], None]):
+        # NOTE: Reading straight from the queue's pipe skips the queue's read
+        # lock. This is fine as long as there is a single reader per queue,
+        # which is always the case between the dispatcher and its workers.
+        self._connection: Connection = queue._reader  # type: ignore
+        self._fd = self._connection.fileno()
+        self._callback = callback
+        self._loop: Optional[AbstractEventLoop] = None
+        self._active = False
+
+    def start(self, loop: AbstractEventLoop):
+        self._loop = loop
+        self._active = True
+        self._loop.add_reader(self._fd, self._read_messages)
+
+    def stop(self):
+        self._active = False
+        if self._loop is not None:
+            self._loop.remove_reader(self._fd)
+
+    def _read_messages(self):
+        # Drain every message which is already available, so that they all get
+        # handled within a single wake up
+        while self._active and self._poll():
+            try:
+                size = _recv_size(self._connection)
+                if size >= LARGE_MESSAGE_SIZE:
+                    self._read_large_message(size)
+                    return
+
+                message = _recv_payload(self._connection, size)
+            except (EOFError, OSError):
+                self._on_broken_queue()
+                return
+            except Exception:
+                logger.exception("An error occurred reading a message")
+                continue
+
+            self._process_message(message)
+
+    def _poll(self) -> bool:
+        try:
+            return self._connection.poll()
+        except (EOFError, OSError):
+            self._on_broken_queue()
+            return False
+
+    def _read_large_message(self, size: int):
+        self._loop.remove_reader(self._fd)  # type: ignore
+        read = self._loop.run_in_executor(  # type: ignore
+            None, _recv_payload, self._connection, size
+        )
+        read.add_done_callback(self._on_large_message)
+
+    def _on_large_message(self, read: Future):
+        try:
+            message = read.result()
+        except (EOFError, OSError):
+            self._on_broken_queue()
+            return
+        except Exception:
+            logger.exception("An error occurred reading a large message")
+        else:
+            self._process_message(message)
+
+        # Resume watching the queue, unless we've been stopped meanwhile
+        if self._active:
+            self._loop.add_reader(self._fd, self._read_messages)  # type: ignore
+
+    def _process_message(self, message: Any):
+        try:
+            self._callback(message)
+        except Exception:
+            logger.exception("An error occurred processing a message")
+
+    def _on_broken_queue(self):
+        # NOTE: The other end went away (e.g. the writer died mid-message), so
+        # any later read would just fail again
+        logger.exception("Stopped watching queue after an error reading from it")
+        self.stop()
+
+
 async def cancel_task(task: Task):
     try:
         task.cancel()
@@ -1,10 +1,9 @@
 import asyncio
-import select
 import signal
+import time
 
-from asyncio import Task, CancelledError
+from asyncio import Event, Lock, Task, CancelledError
 from multiprocessing import Process, Queue
-from concurrent.futures import ThreadPoolExecutor
 from contextlib import nullcontext
 from typing import Optional
 
@@ -22,7 +21,8 @@ from .messages import (
     ModelUpdateMessage,
     ModelResponseMessage,
 )
-from .utils import terminate_queue, END_OF_QUEUE
+from .shared_memory import SharedMemoryPool
+from .utils import terminate_queue, MessageReader, END_OF_QUEUE
 from .logging import logger
 from .errors import WorkerError
 
@@ -44,19 +44,12 @@ class Worker(Process):
         self._model_updates: Queue[ModelUpdateMessage] = Queue()
         self._env = env
 
-        self.__executor = None
-
     @property
-    def _executor(self):
+    def responses(self) -> Queue:
         """
-        Helper property to initialise a threadpool executor on demand.
-        This is required to avoid having to pickle the executor object into a
-        separate process.
+        Queue where the worker sends back its responses.
         """
-        if self.__executor is None:
-            self.__executor = ThreadPoolExecutor()
-
-        return self.__executor
+        return self._responses
 
     def run(self):
         ctx = nullcontext()
@@ -90,43 +83,62 @@ class Worker(Process):
         Internal __init__ method that needs to run within the worker process.
         """
         self._model_registry = MultiModelRegistry()
-        self._active = True
+        self._stopped = Event()
+        # NOTE: Model updates get applied one at a time, in the order they
+        # arrived (e.g. so that an unload never runs before the load it
+        # follows)
+        self._model_updates_lock = Lock()
+        self._requests_reader = MessageReader(self._requests, self._schedule_request)
+        self._model_updates_reader = MessageReader(
+            self._model_updates, self._schedule_model_update
+        )
+
+        self._shared_memory: Optional[SharedMemoryPool] = None
+        threshold = self._settings.parallel_shared_memory_threshold
+        if threshold is not None:
+            self._shared_memory = SharedMemoryPool(
+                threshold, self._settings.parallel_shared_memory_max_size
+            )
 
     async def coro_run(self):
         self.__inner_init__()
+
+        # NOTE: Let the event loop tell us when there are new messages,
+        # instead of blocking a separate thread to wait for them
         loop = asyncio.get_event_loop()
-        while self._active:
-            readable = await loop.run_in_executor(self._executor, self._select)
-            for r in readable:
-                if r is self._requests._reader:
-                    request = self._requests.get()
-
-                    schedule_with_callback(
-                        self._process_request(request), self._handle_response
-                    )
-                elif r is self._model_updates._reader:
-                    model_update = self._model_updates.get()
-                    # If the queue gets terminated, detect the "sentinel value"
-                    # and stop reading
-                    if model_update is END_OF_QUEUE:
-                        self._active = False
-                        return
-
-                    schedule_with_callback(
-                        self._process_model_update(model_update), self._handle_response
-                    )
-
-    def _select(self):
-        readable, _, _ = select.select(
-            [self._requests._reader, self._model_updates._reader],
-            [],
-            [],
-        )
+        self._requests_reader.start(loop)
+        self._model_updates_reader.start(loop)
 
-        return readable
+        try:
+            await self._stopped.wait()
+        finally:
+            self._requests_reader.stop()
+            self._model_updates_reader.stop()
+
+            if self._shared_memory is not None:
+                self._shared_memory.close()
+
+    def _schedule_request(self, request: ModelRequestMessage):
+        schedule_with_callback(self._process_request(request), self._handle_response)
+
+    def _schedule_model_update(self, model_update: Optional[ModelUpdateMessage]):
+        # If the queue gets terminated, detect the "sentinel value" and stop
+        # reading
+        if model_update is END_OF_QUEUE:
+            self._model_updates_reader.stop()
+            self._stopped.set()
+            return
+
+        schedule_with_callback(
+            self._process_model_update(model_update), self._handle_response
+        )
 
     async def _process_request(self, request) -> ModelResponseMessage:
+        started = time.perf_counter()
         try:
+            if self._shared_memory is not None:
+                request = self._shared_memory.decode_request(request)
+
             model = await self._model_registry.get_model(
                 request.model_name, request.model_version
             )
@@ -136,14 +148,26 @@ class Worker(Process):
                 return_value = await method(
                     *request.method_args, **request.method_kwargs
                 )
-            return ModelResponseMessage(id=request.id, return_value=return_value)
+            response = ModelResponseMessage(
+                id=request.id,
+                return_value=return_value,
+                service_time=time.perf_counter() - started,
+            )
+            if self._shared_memory is not None:
+                response = self._shared_memory.encode_response(response)
+
+            return response
         except (Exception, CancelledError) as e:
             logger.exception(
                 f"An error occurred calling method '{request.method_name}' "
                 f"from model '{request.model_name}'."
             )
             worker_error = WorkerError(e)
-            return ModelResponseMessage(id=request.id, exception=worker_error)
+            return ModelResponseMessage(
+                id=request.id,
+                exception=worker_error,
+                service_time=time.perf_counter() - started,
+            )
 
     def _handle_response(self, process_task: Task):
         response_message = process_task.result()
@@ -151,6 +175,12 @@ class Worker(Process):
 
     async def _process_model_update(
         self, update: ModelUpdateMessage
+    ) -> ModelResponseMessage:
+        async with self._model_updates_lock:
+            return await self._apply_model_update(update)
+
+    async def _apply_model_update(
+        self, update: ModelUpdateMessage
     ) -> ModelResponseMessage:
         try:
             model_settings = update.model_settings
@@ -196,4 +226,3 @@ class Worker(Process):
         await terminate_queue(self._model_updates)
         self._model_updates.close()
         self._requests.close()
-        self._executor.shutdown()
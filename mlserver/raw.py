@@ -1,4 +1,5 @@
 import struct
+import numpy as np
 
 from functools import reduce
 from operator import mul
@@ -84,6 +85,13 @@ def _unpack_tensor(elem: InputOrOutput, raw: bytes) -> list:
 
 
 def _pack_tensor(elem: InputOrOutput) -> bytes:
+    data = getattr(elem.data, "__root__", elem.data)
+    if isinstance(data, np.ndarray):
+        # Copy the array's buffer directly, using the same (native) layout as
+        # `struct`
+        ctype = _DatatypeToCtype[Datatype(elem.datatype)]
+        return np.ascontiguousarray(data, dtype=ctype).tobytes()
+
     tensor_format = _tensor_format(elem)
     return struct.pack(tensor_format, *elem.data)
 
@@ -14,6 +14,7 @@ from .responses import Response
 from .errors import _EXCEPTION_HANDLERS
 
 from ..settings import Settings
+from ..types import InferenceResponse
 from ..handlers import DataPlane, ModelRepositoryHandlers
 from ..tracing import get_tracer_provider
 
@@ -303,11 +304,13 @@ def create_app(
             "/v2/models/{model_name}/infer",
             endpoints.infer,
             methods=["POST"],
+            response_model=InferenceResponse,
         ),
         APIRoute(
             "/v2/models/{model_name}/versions/{model_version}/infer",
             endpoints.infer,
             methods=["POST"],
+            response_model=InferenceResponse,
         ),
         # Model metadata
         APIRoute(
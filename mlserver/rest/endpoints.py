@@ -8,14 +8,14 @@ from ..types import (
     MetadataModelResponse,
     MetadataServerResponse,
     InferenceRequest,
-    InferenceResponse,
     RepositoryIndexRequest,
     RepositoryIndexResponse,
 )
 from ..handlers import DataPlane, ModelRepositoryHandlers
-from ..utils import insert_headers, extract_headers
+from ..utils import insert_headers
 
 from .openapi import get_openapi_schema, get_model_schema_uri, get_model_schema
+from .responses import InferenceResponseSerializer
 from .utils import to_status_code
 
 
@@ -28,6 +28,7 @@ class Endpoints:
 
     def __init__(self, data_plane: DataPlane):
         self._data_plane = data_plane
+        self._response_serializer = InferenceResponseSerializer()
 
     async def live(self) -> Response:
         is_live = await self._data_plane.live()
@@ -88,11 +89,10 @@ class Endpoints:
     async def infer(
         self,
         raw_request: Request,
-        raw_response: Response,
         payload: InferenceRequest,
         model_name: str,
         model_version: Optional[str] = None,
-    ) -> InferenceResponse:
+    ) -> Response:
         # print("rest endpoint Endpoints infer raw_request:", raw_request)
         # rest endpoint Endpoints infer raw_request: <mlserver.rest.requests.Request object at 0x7d685516f2e0>
         ###################################################
@@ -243,115 +243,15 @@ class Endpoints:
         #     ]
         #     outputs=None
 
-        inference_response = await self._data_plane.infer(
-            payload, model_name, model_version
+        body, response_headers = await self._data_plane.infer_serialized(
+            payload, model_name, model_version, self._response_serializer
         )
-        # print("rest endpoint Endpoints infer inference_response:", inference_response)
-        # rest endpoint Endpoints infer inference_response:
-        #     model_name='mnist-svm'
-        #     model_version='v0.1.0'
-        #     id='516e7dc1-b1c0-48e5-9a3e-d391e7657c68'
-        #     parameters=Parameters(
-        #         content_type=None,
-        #         headers={
-        #             'Ce-Specversion': '0.3',
-        #             'Ce-Source': 'io.seldon.serving.deployment.mlserver',
-        #             'Ce-Type': 'io.seldon.serving.inference.response',
-        #             'Ce-Modelid': 'mnist-svm',
-        #             'Ce-Inferenceservicename': 'mlserver',
-        #             'Ce-Endpoint': 'mnist-svm',
-        #             'Ce-Id': '516e7dc1-b1c0-48e5-9a3e-d391e7657c68',
-        #             'Ce-Requestid': '516e7dc1-b1c0-48e5-9a3e-d391e7657c68'
-        #         }
-        #     )
-        #     outputs=[
-        #         ResponseOutput(
-        #             name='predict',
-        #             shape=[1, 1],
-        #             datatype='INT64',
-        #             parameters=Parameters(
-        #                 content_type='np',
-        #                 headers=None
-        #             ),
-        #             data=TensorData(
-        #                 __root__=[8]
-        #             )
-        #         )
-        #     ]
-        ###################################################
-        # rest endpoint Endpoints infer inference_response:
-        #     model_name='transformer'
-        #     model_version=None
-        #     id='4ad7ec9a-4f8b-43dc-9eae-9aca81377840'
-        #     parameters=Parameters(
-        #         content_type=None,
-        #         headers={
-        #             'Ce-Specversion': '0.3',
-        #             'Ce-Source': 'io.seldon.serving.deployment.mlserver',
-        #             'Ce-Type': 'io.seldon.serving.inference.response',
-        #             'Ce-Modelid': 'transformer',
-        #             'Ce-Inferenceservicename': 'mlserver',
-        #             'Ce-Endpoint': 'transformer',
-        #             'Ce-Id': '4ad7ec9a-4f8b-43dc-9eae-9aca81377840',
-        #             'Ce-Requestid': '4ad7ec9a-4f8b-43dc-9eae-9aca81377840'
-        #         }
-        #     )
-        #     outputs=[
-        #         ResponseOutput(
-        #             name='output',
-        #             shape=[1, 1],
-        #             datatype='BYTES',
-        #             parameters=Parameters(
-        #                 content_type='hg_jsonlist',
-        #                 headers=None
-        #             ),
-        #             data=TensorData(
-        #                 __root__=[
-        #                     b'{"generated_text": "this is a test of the function I put in the \\"Test.\\" If I wasn\'t there then the function for that function would have been called; if you got the test I would have called it; if I didn\'t call the function in the"}'
-        #                 ]
-        #             )
-        #         )
-        #     ]
-
-        response_headers = extract_headers(inference_response)
-        # print("rest endpoint Endpoints infer response_headers:", response_headers)
-        # rest endpoint Endpoints infer response_headers:
-        # {
-        #     'Ce-Specversion': '0.3',
-        #     'Ce-Source': 'io.seldon.serving.deployment.mlserver',
-        #     'Ce-Type': 'io.seldon.serving.inference.response',
-        #     'Ce-Modelid': 'mnist-svm',
-        #     'Ce-Inferenceservicename': 'mlserver',
-        #     'Ce-Endpoint': 'mnist-svm',
-        #     'Ce-Id': '516e7dc1-b1c0-48e5-9a3e-d391e7657c68',
-        #     'Ce-Requestid': '516e7dc1-b1c0-48e5-9a3e-d391e7657c68'
-        # }
-        ###################################################
-        # rest endpoint Endpoints infer response_headers:
-        # {
-        #     'Ce-Specversion': '0.3',
-        #     'Ce-Source': 'io.seldon.serving.deployment.mlserver',
-        #     'Ce-Type': 'io.seldon.serving.inference.response',
-        #     'Ce-Modelid': 'transformer',
-        #     'Ce-Inferenceservicename': 'mlserver',
-        #     'Ce-Endpoint': 'transformer',
-        #     'Ce-Id': '4ad7ec9a-4f8b-43dc-9eae-9aca81377840',
-        #     'Ce-Requestid': '4ad7ec9a-4f8b-43dc-9eae-9aca81377840'
-        # }
 
-        if response_headers:
-            raw_response.headers.update(response_headers)
-        # print("rest endpoint Endpoints infer raw_response:", raw_response)
-        # rest endpoint Endpoints infer raw_response: <starlette.responses.Response object at 0x7fd4ad4910f0>
-        ###################################################
-        # rest endpoint Endpoints infer raw_response: <starlette.responses.Response object at 0x7b1441333d00>
-
-        # print("rest endpoint Endpoints infer inference_response:", inference_response)
-        # rest endpoint Endpoints infer inference_response: model_name='mnist-svm' model_version='v0.1.0' id='516e7dc1-b1c0-48e5-9a3e-d391e7657c68' parameters=Parameters(content_type=None, headers=None) outputs=[ResponseOutput(name='predict', shape=[1, 1], datatype='INT64', parameters=Parameters(content_type='np', headers=None), data=TensorData(__root__=[8]))]
-        ###################################################
-        # rest endpoint Endpoints infer inference_response: model_name='transformer' model_version=None id='4ad7ec9a-4f8b-43dc-9eae-9aca81377840' parameters=Parameters(content_type=None, headers=None) outputs=[ResponseOutput(name='output', shape=[1, 1], datatype='BYTES', parameters=Parameters(content_type='hg_jsonlist', headers=None), data=TensorData(__root__=[b'{"generated_text": "this is a test of the function I put in the \\"Test.\\" If I wasn\'t there then the function for that function would have been called; if you got the test I would have called it; if I didn\'t call the function in the"}']))]
-
-        return inference_response
+        # NOTE: The response body is already serialised, so we return it as-is
+        # (skipping FastAPI's own validation and serialisation)
+        return Response(
+            content=body, media_type="application/json", headers=response_headers
+        )
 
 
 class ModelRepositoryEndpoints:
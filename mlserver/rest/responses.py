@@ -1,10 +1,13 @@
 import json
+import numpy as np
 
-from typing import Any
+from typing import Any, Optional
 
 from starlette.responses import JSONResponse as _JSONResponse
 
+from ..cache.serializer import ResponseSerializer
 from ..codecs.string import decode_str
+from ..types import InferenceResponse
 
 try:
     import orjson
@@ -19,6 +22,9 @@ class BytesJSONEncoder(json.JSONEncoder):
             # "best effort" basis
             return decode_str(obj)
 
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+
         return super().default(self, obj)
 
 
@@ -31,25 +37,63 @@ class Response(_JSONResponse):
     media_type = "application/json"
 
     def render(self, content: Any) -> bytes:
-        if orjson is None:
-            # Original implementation of starlette's JSONResponse, using our
-            # custom encoder (capable of "encoding" bytes).
-            # Original implementation can be seen here:
-            # https://github.com/encode/starlette/blob/
-            # f53faba229e3fa2844bc3753e233d9c1f54cca52/starlette/responses.py#L173-L180
-            return json.dumps(
-                content,
-                ensure_ascii=False,
-                allow_nan=False,
-                indent=None,
-                separators=(",", ":"),
-                cls=BytesJSONEncoder,
-            ).encode("utf-8")
-
-        # This is equivalent to the ORJSONResponse implementation in FastAPI:
-        # https://github.com/tiangolo/fastapi/blob/
-        # 864643ef7608d28ac4ed321835a7fb4abe3dfc13/fastapi/responses.py#L32-L34
-        return orjson.dumps(content, default=_encode_bytes)
+        return encode_json(content)
+
+
+def encode_json(content: Any) -> bytes:
+    if orjson is None:
+        # Original implementation of starlette's JSONResponse, using our
+        # custom encoder (capable of "encoding" bytes).
+        # Original implementation can be seen here:
+        # https://github.com/encode/starlette/blob/
+        # f53faba229e3fa2844bc3753e233d9c1f54cca52/starlette/responses.py#L173-L180
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+            cls=BytesJSONEncoder,
+        ).encode("utf-8")
+
+    # This is equivalent to the ORJSONResponse implementation in FastAPI:
+    # https://github.com/tiangolo/fastapi/blob/
+    # 864643ef7608d28ac4ed321835a7fb4abe3dfc13/fastapi/responses.py#L32-L34
+    # NOTE: Numpy arrays (e.g. views over a batched output) can get serialised
+    # natively by `orjson`, without converting them to lists first
+    return orjson.dumps(
+        content, default=_encode_bytes, option=orjson.OPT_SERIALIZE_NUMPY
+    )
+
+
+class InferenceResponseSerializer(ResponseSerializer[bytes]):
+    """
+    Serializes inference responses into the JSON body of a REST response.
+    """
+
+    name = "rest"
+
+    def serialize(self, response: InferenceResponse) -> bytes:
+        # NOTE: Mirror the options used by our `APIRoute` to serialise responses
+        as_dict = response.dict(
+            by_alias=True, exclude_unset=True, exclude_none=True, exclude={"id"}
+        )
+        return encode_json(as_dict)
+
+    def with_id(self, serialized: bytes, response_id: Optional[str]) -> bytes:
+        if response_id is None:
+            return serialized
+
+        # NOTE: The order of the JSON object's keys is irrelevant, so we can
+        # just splice the `id` field at the start of the (already serialised)
+        # object
+        return b"".join([b'{"id":', encode_json(response_id), b",", serialized[1:]])
+
+    def dumps(self, serialized: bytes) -> bytes:
+        return serialized
+
+    def loads(self, data: bytes) -> bytes:
+        return data
 
 
 def _encode_bytes(obj: Any) -> str:
@@ -61,4 +105,8 @@ def _encode_bytes(obj: Any) -> str:
         # "best effort" basis
         return decode_str(obj)
 
+    if isinstance(obj, np.ndarray):
+        # Arrays which can't be serialised natively (e.g. non-contiguous ones)
+        return obj.tolist()
+
     raise TypeError
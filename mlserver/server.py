@@ -61,8 +61,8 @@ class MLServer:
             self.add_custom_handlers,
             load_batching,
         ]
-        on_model_reload = [self.reload_custom_handlers]
-        on_model_unload = [self.remove_custom_handlers]
+        on_model_reload = [self.reload_custom_handlers, self.reload_response_cache]
+        on_model_unload = [self.remove_custom_handlers, self.unload_response_cache]
 
         if not self._inference_pool_registry:
             return MultiModelRegistry(
@@ -79,10 +79,12 @@ class MLServer:
         on_model_reload = [
             self._inference_pool_registry.reload_model,  # type: ignore
             self.reload_custom_handlers,
+            self.reload_response_cache,
         ]
         on_model_unload = [
             self._inference_pool_registry.unload_model,  # type: ignore
             self.remove_custom_handlers,
+            self.unload_response_cache,
         ]
 
         return MultiModelRegistry(
@@ -165,6 +167,14 @@ class MLServer:
 
         return model
 
+    async def reload_response_cache(
+        self, old_model: MLModel, new_model: MLModel
+    ) -> MLModel:
+        return await self._data_plane.reload_response_cache(old_model, new_model)
+
+    async def unload_response_cache(self, model: MLModel) -> MLModel:
+        return await self._data_plane.unload_response_cache(model)
+
     def _add_signal_handlers(self):
         loop = asyncio.get_event_loop()
 
@@ -186,5 +196,8 @@ class MLServer:
         if self._rest_server:
             await self._rest_server.stop(sig)
 
+        if self._data_plane:
+            await self._data_plane.close()
+
         if self._metrics_server:
             await self._metrics_server.stop(sig)
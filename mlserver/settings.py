@@ -141,6 +141,49 @@ class Settings(BaseSettings):
     parallel_workers_timeout: int = 5
     """Grace timeout to wait until the workers shut down when stopping MLServer."""
 
+    parallel_dispatch_policy: str = "round_robin"
+    """When parallel inference is enabled, policy used to choose which worker
+    each request gets sent to.
+    The available policies are ``round_robin``, ``least_in_flight``,
+    ``power_of_two_choices`` and ``latency_aware``."""
+
+    parallel_shared_memory_threshold: Optional[int] = None
+    """When parallel inference is enabled, minimum size (in bytes) of a tensor
+    for its data to get sent to (or back from) the workers through shared
+    memory, instead of getting serialised through the workers' queues.
+    By default, shared memory won't be used."""
+
+    parallel_shared_memory_max_size: Optional[int] = 256 * 1024 * 1024
+    """When shared memory is enabled, maximum total size (in bytes) of the
+    shared memory segments allocated by each process (i.e. the main MLServer
+    process and each inference pool worker).
+    Above this size, tensors will get serialised through the workers' queues
+    instead."""
+
+    parallel_workers_max: Optional[int] = None
+    """When parallel inference is enabled, maximum number of workers that each
+    inference pool can scale up to, based on its load.
+    Pools will never scale below ``parallel_workers``.
+    By default, the number of workers is fixed."""
+
+    parallel_autoscaling_target_in_flight: float = 4.0
+    """When autoscaling is enabled (i.e. ``parallel_workers_max`` is set),
+    average number of in-flight requests per worker above which a new worker
+    will get started."""
+
+    parallel_autoscaling_max_wait: Optional[float] = None
+    """When autoscaling is enabled, maximum time (in seconds) that a request
+    can wait for a response before a new worker gets started.
+    By default, only the number of in-flight requests will be considered."""
+
+    parallel_autoscaling_idle_timeout: float = 60.0
+    """When autoscaling is enabled, time (in seconds) that a worker needs to
+    stay idle before it gets retired."""
+
+    parallel_autoscaling_interval: float = 1.0
+    """When autoscaling is enabled, time (in seconds) between each check of the
+    inference pools' load."""
+
     environments_dir: str = DEFAULT_ENVIRONMENTS_DIR
     """
     Directory used to store custom environments.
@@ -242,10 +285,49 @@ class Settings(BaseSettings):
     _custom_grpc_server_settings: Optional[dict] = None
 
     cache_enabled: bool = False
-    """Enable caching for the model predictions."""
+    """Enable caching for the model predictions.
+    Cached responses get invalidated whenever a model gets reloaded or
+    unloaded.
+    Note that persistent or shared caches (i.e. when ``cache_dir`` or
+    ``cache_implementation`` are set) won't get invalidated by a server
+    restart, unless the model's settings have changed."""
 
     cache_size: int = 100
-    """Cache size to be used if caching is enabled."""
+    """Cache size (i.e. maximum number of entries) to be used if caching is
+    enabled."""
+
+    cache_ttl: Optional[float] = None
+    """Time (in seconds) after which cached responses expire.
+    By default, cached responses never expire."""
+
+    cache_max_bytes: Optional[int] = None
+    """Maximum total size (in bytes) of the responses held in the cache.
+    Once this budget is exceeded, the least recently used responses will get
+    evicted.
+    By default, the cache is only bounded by ``cache_size``."""
+
+    cache_dir: Optional[str] = None
+    """
+    Directory used to store a memory-mapped response cache, which can be
+    shared across multiple MLServer instances running on the same node and
+    which will persist across restarts.
+    By default, the cache will be kept in-memory within each MLServer process.
+    """
+
+    cache_implementation: Optional[PyObject] = None
+    """
+    *Python path* to a custom response cache implementation (e.g.
+    ``mlserver.cache.redis.RedisCache``), which can be used to share the cache
+    across multiple MLServer replicas.
+    By default, either an in-memory cache or (if ``cache_dir`` is set) a
+    memory-mapped cache will be used.
+    """
+
+    cache_implementation_args: dict = {}
+    """
+    Extra parameters passed to the custom response cache implementation (e.g.
+    ``{"host": "redis", "lookup_timeout": 0.01}``).
+    """
 
 
 class ModelParameters(BaseSettings):
@@ -389,7 +471,6 @@ class ModelSettings(BaseSettings):
 
         return model_settings
 
-
     @property
     def implementation(self) -> Type["MLModel"]:
         if not self._source:
@@ -443,6 +524,27 @@ class ModelSettings(BaseSettings):
         description="Inference workers will now always be `warmed up` at start time.",
     )
 
+    parallel_pool_workers: Optional[int] = Field(None, ge=1)
+    """When parallel inference is enabled, number of workers of a dedicated
+    inference pool for this model.
+    If set, the model will get loaded on its own separate inference pool,
+    instead of sharing it with other models.
+    By default, the model will share the server-wide inference pool, sized by
+    the server-level ``parallel_workers`` setting."""
+
+    parallel_pool_workers_max: Optional[int] = Field(None, ge=1)
+    """When the model has a dedicated inference pool, maximum number of
+    workers that this pool can scale up to, based on its load.
+    Note that dedicated pools won't use the server-level
+    ``parallel_workers_max`` setting.
+    By default, the dedicated pool will keep a fixed number of workers."""
+
+    parallel_replicas: Optional[int] = Field(None, ge=1)
+    """When parallel inference is enabled, number of inference pool workers
+    where the model will get loaded.
+    Requests to the model will only get routed to these workers.
+    By default, the model will get loaded on every worker."""
+
     # Adaptive Batching settings (disabled by default)
     max_batch_size: int = 0
     """When adaptive batching is enabled, maximum number of requests to group
@@ -452,6 +554,57 @@ class ModelSettings(BaseSettings):
     """When adaptive batching is enabled, maximum amount of time (in seconds)
     to wait for enough requests to build a full batch."""
 
+    target_batch_latency: Optional[float] = None
+    """When adaptive batching is enabled, target p99 latency (in seconds) of
+    the requests going through the batcher.
+    If set, the batch size and the time to wait for a batch to fill up will
+    get tuned on the fly (based on the observed model latency and request
+    arrival rate), using ``max_batch_size`` and ``max_batch_time`` as upper
+    bounds."""
+
+    batch_bucket_input: Optional[str] = None
+    """When adaptive batching is enabled, name of the input used to group
+    requests into separate batches (i.e. buckets) based on their length.
+    Each bucket will get flushed independently, once it fills up or once its
+    oldest request has waited for ``max_batch_time``.
+    For text inputs, the length of the longest string will be used.
+    By default, all requests will get batched together."""
+
+    batch_bucket_dim: int = -1
+    """Dimension of the ``batch_bucket_input`` shape used as the input's
+    length (e.g. its sequence length).
+    By default, the last dimension will be used."""
+
+    batch_bucket_boundaries: List[int] = []
+    """Upper bounds of the length of each bucket (e.g. ``[32, 64, 128]``).
+    Any length above the last boundary will get its own bucket.
+    Only applies to text inputs, as tensors with different lengths can't be
+    merged together without padding them.
+    By default, each distinct length will get its own bucket."""
+
+    max_concurrent_batches: Optional[int] = None
+    """When adaptive batching is enabled, maximum number of batches which can
+    be processed concurrently.
+    Once this limit is reached, new batches will wait until one of the
+    in-flight batches finishes.
+    By default, there is no limit."""
+
+    max_queued_requests: Optional[int] = None
+    """When adaptive batching is enabled, maximum number of requests which can
+    wait to get batched (i.e. which haven't been sent to the model yet).
+    Once this limit is reached, new requests will get rejected with an
+    overload error (i.e. HTTP 429 or gRPC ``RESOURCE_EXHAUSTED``).
+    By default, new requests will instead wait until there is room in the
+    queue (which can hold up to ``max_batch_size`` requests)."""
+
+    batch_priority_max_wait: Optional[float] = 1.0
+    """When adaptive batching is enabled, maximum time (in seconds) that a
+    request can wait in its priority lane while being overtaken by
+    higher-priority requests.
+    Requests which wait for longer will get batched first, regardless of their
+    priority.
+    Setting it to ``None`` will disable this protection."""
+
     # Custom model class implementation
     # NOTE: The `implementation_` attr will only point to the string import.
     # The actual import will occur within the `implementation` property - think
@@ -474,3 +627,25 @@ class ModelSettings(BaseSettings):
     """Enable caching for a specific model. This parameter can be used to disable
     cache for a specific model, if the server level caching is enabled. If the
     server level caching is disabled, this parameter value will have no effect."""
+
+    cache_key_parameters: List[str] = []
+    """List of request (and input) parameters which should be taken into account
+    when computing the cache key of a request (e.g. ``content_type``).
+    By default, only the inputs' names, datatypes, shapes and contents are
+    considered."""
+
+    cache_rows: bool = False
+    """Cache predictions row by row (i.e. along the batch dimension of the
+    inputs), so that only the rows missing from the cache get sent to the
+    model.
+    This requires the model to process each row independently, as it's usually
+    the case with tabular (e.g. ``pd``) or ``np`` inputs.
+    If the model's outputs can't be split into rows, row-level caching gets
+    disabled for the model until it's reloaded.
+    This parameter only has effect if caching is enabled."""
+
+    coalesce_requests: bool = False
+    """Coalesce concurrent identical requests to this model (i.e. requests with
+    the same cache key), so that only one of them gets sent to the model and
+    the rest share its response.
+    This parameter is independent of caching."""
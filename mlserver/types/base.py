@@ -1,3 +1,5 @@
+import numpy as np
+
 from pydantic import BaseModel as _BaseModel
 
 
@@ -22,3 +24,6 @@ class BaseModel(_BaseModel):
 
     class Config:
         use_enum_values = True
+        # Tensor data can be kept as Numpy arrays (e.g. views over a batched
+        # output), which need to be converted back when serialising to JSON
+        json_encoders = {np.ndarray: lambda arr: arr.tolist()}
@@ -1,11 +1,19 @@
 import asyncio
 import pytest
 
-from typing import List
+from typing import Dict, List
 
 from mlserver.batching.adaptive import AdaptiveBatcher
+from mlserver.batching.requests import BatchedRequests
 from mlserver.batching.shape import Shape
-from mlserver.types import InferenceRequest, RequestInput
+from mlserver.batching.signatures import InvalidBatchRequest
+from mlserver.errors import InferenceError, ModelOverloaded
+from mlserver.types import (
+    InferenceRequest,
+    InferenceResponse,
+    Parameters,
+    RequestInput,
+)
 from mlserver.model import MLModel
 from mlserver.utils import generate_uuid
 
@@ -202,3 +210,462 @@ async def test_predict(
 
         expected = await sum_model.predict(req)
         assert res == expected
+
+
+async def test_predict_target_latency(sum_model: MLModel):
+    sum_model.settings.target_batch_latency = 0.5
+    adaptive_batcher = AdaptiveBatcher(sum_model)
+    latency_tuner = adaptive_batcher._tuner
+    latency_tuner.min_samples = 1
+
+    requests = [
+        InferenceRequest(
+            id=f"request-{idx}",
+            inputs=[
+                RequestInput(
+                    name="input-0",
+                    shape=[1, 3],
+                    datatype="INT32",
+                    data=[idx, idx + 1, idx + 2],
+                )
+            ],
+        )
+        for idx in range(5)
+    ]
+    await asyncio.gather(*[adaptive_batcher.predict(request) for request in requests])
+
+    assert len(latency_tuner._samples) > 0
+    assert adaptive_batcher._get_batch_limits() == (
+        latency_tuner.batch_size,
+        latency_tuner.batch_time,
+    )
+
+    batching_metrics = adaptive_batcher._metrics
+    assert batching_metrics.batch_size._value.get() == latency_tuner.batch_size
+    assert batching_metrics.batch_time._value.get() == latency_tuner.batch_time
+
+
+async def test_batch_requests_buckets(sum_model: MLModel):
+    sum_model.settings.max_batch_time = 0.1
+    sum_model.settings.batch_bucket_input = "input-0"
+    adaptive_batcher = AdaptiveBatcher(sum_model)
+
+    for idx, length in enumerate([3, 5, 3, 5, 3]):
+        inference_request = InferenceRequest(
+            id=f"request-{idx}",
+            inputs=[
+                RequestInput(
+                    name="input-0",
+                    shape=[1, length],
+                    datatype="INT32",
+                    data=list(range(length)),
+                )
+            ],
+        )
+        await adaptive_batcher._queue_request(inference_request)
+
+    adaptive_batcher._max_batch_size = 2
+    batched_requests = [
+        batched_req async for batched_req in adaptive_batcher._batch_requests()
+    ]
+
+    # The last request will be on its own, after reaching its deadline
+    batched_ids = [
+        [req.id for req in batched_req.inference_requests.values()]
+        for batched_req in batched_requests
+    ]
+    assert batched_ids == [
+        ["request-0", "request-2"],
+        ["request-1", "request-3"],
+        ["request-4"],
+    ]
+
+
+async def test_batch_requests_bucket_boundaries(sum_model: MLModel):
+    sum_model.settings.max_batch_time = 0.1
+    sum_model.settings.batch_bucket_input = "input-0"
+    sum_model.settings.batch_bucket_boundaries = [8]
+    adaptive_batcher = AdaptiveBatcher(sum_model)
+
+    for idx, text in enumerate(["hey", "hello", "hello world"]):
+        inference_request = InferenceRequest(
+            id=f"request-{idx}",
+            inputs=[
+                RequestInput(name="input-0", shape=[1], datatype="BYTES", data=[text])
+            ],
+        )
+        await adaptive_batcher._queue_request(inference_request)
+
+    adaptive_batcher._max_batch_size = 2
+    batched_requests = [
+        batched_req async for batched_req in adaptive_batcher._batch_requests()
+    ]
+
+    # Texts with different lengths within the same bucket get merged together
+    merged_inputs = [
+        batched_req.merged_request.inputs[0] for batched_req in batched_requests
+    ]
+    assert [merged_input.shape for merged_input in merged_inputs] == [[2], [1]]
+    assert [merged_input.data.__root__ for merged_input in merged_inputs] == [
+        ["hey", "hello"],
+        ["hello world"],
+    ]
+
+
+async def test_batch_requests_signatures(adaptive_batcher: AdaptiveBatcher):
+    for idx, datatype in enumerate(["INT32", "INT64", "INT32"]):
+        inference_request = InferenceRequest(
+            id=f"request-{idx}",
+            inputs=[
+                RequestInput(
+                    name="input-0", shape=[1, 3], datatype=datatype, data=[1, 2, 3]
+                )
+            ],
+        )
+        await adaptive_batcher._queue_request(inference_request)
+
+    batched_requests = [
+        batched_req async for batched_req in adaptive_batcher._batch_requests()
+    ]
+
+    batched_ids = sorted(
+        [req.id for req in batched_req.inference_requests.values()]
+        for batched_req in batched_requests
+    )
+    assert batched_ids == [["request-0", "request-2"], ["request-1"]]
+
+
+async def test_predict_invalid_request(adaptive_batcher: AdaptiveBatcher):
+    valid_request = InferenceRequest(
+        inputs=[
+            RequestInput(name="input-0", shape=[1, 3], datatype="INT32", data=[1, 2, 3])
+        ]
+    )
+    invalid_request = InferenceRequest(
+        inputs=[
+            RequestInput(name="input-0", shape=[2, 3], datatype="INT32", data=[1, 2, 3])
+        ]
+    )
+
+    responses = await asyncio.gather(
+        adaptive_batcher.predict(valid_request),
+        adaptive_batcher.predict(invalid_request),
+        return_exceptions=True,
+    )
+
+    assert isinstance(responses[0], InferenceResponse)
+    assert isinstance(responses[1], InvalidBatchRequest)
+
+
+async def test_predict_isolates_failures(adaptive_batcher: AdaptiveBatcher):
+    predict_fn = adaptive_batcher._predict_fn
+
+    async def _failing_predict(payload: InferenceRequest) -> InferenceResponse:
+        if -1 in payload.inputs[0].data:
+            raise InferenceError("Negative values are not supported")
+
+        return await predict_fn(payload)
+
+    adaptive_batcher._predict_fn = _failing_predict
+    requests = [
+        InferenceRequest(
+            inputs=[
+                RequestInput(
+                    name="input-0", shape=[1, 3], datatype="INT32", data=[idx, 1, 2]
+                )
+            ],
+        )
+        for idx in [1, -1, 2]
+    ]
+
+    responses = await asyncio.gather(
+        *[adaptive_batcher.predict(request) for request in requests],
+        return_exceptions=True,
+    )
+
+    assert isinstance(responses[0], InferenceResponse)
+    assert isinstance(responses[1], InferenceError)
+    assert isinstance(responses[2], InferenceResponse)
+
+
+async def test_predict_bisects_failures(adaptive_batcher: AdaptiveBatcher):
+    predict_fn = adaptive_batcher._predict_fn
+    bisections = adaptive_batcher._metrics.bisections._value.get()
+    calls = []
+
+    async def _failing_predict(payload: InferenceRequest) -> InferenceResponse:
+        calls.append(payload)
+        if -1 in payload.inputs[0].data:
+            raise InferenceError("Negative values are not supported")
+
+        return await predict_fn(payload)
+
+    adaptive_batcher._predict_fn = _failing_predict
+    batched = BatchedRequests(
+        {
+            f"request-{idx}": InferenceRequest(
+                inputs=[
+                    RequestInput(
+                        name="input-0",
+                        shape=[1, 3],
+                        datatype="INT32",
+                        data=[-1 if idx == 5 else idx, 1, 2],
+                    )
+                ],
+            )
+            for idx in range(16)
+        }
+    )
+
+    responses = await adaptive_batcher._predict(batched)
+
+    assert len(responses) == 16
+    for internal_id, response in responses.items():
+        if internal_id == "request-5":
+            assert isinstance(response, InferenceError)
+        else:
+            assert isinstance(response, InferenceResponse)
+
+    # A single failing request should only need 2 extra calls for each level
+    # of the bisection (i.e. 2 * log2(16)), instead of 1 call per request
+    assert len(calls) == 1 + 2 * 4
+    assert adaptive_batcher._metrics.bisections._value.get() == bisections + 4
+
+
+async def test_predict_bisects_failures_limit(adaptive_batcher: AdaptiveBatcher):
+    calls = []
+
+    async def _failing_predict(payload: InferenceRequest) -> InferenceResponse:
+        calls.append(payload)
+        raise InferenceError("Negative values are not supported")
+
+    adaptive_batcher._predict_fn = _failing_predict
+    batched = BatchedRequests(
+        {
+            f"request-{idx}": InferenceRequest(
+                inputs=[
+                    RequestInput(
+                        name="input-0", shape=[1, 3], datatype="INT32", data=[-1, 1, 2]
+                    )
+                ],
+            )
+            for idx in range(16)
+        }
+    )
+
+    responses = await adaptive_batcher._predict(batched)
+
+    assert len(responses) == 16
+    assert all(isinstance(response, InferenceError) for response in responses.values())
+
+    # As both halves fail, each request should get retried on its own, instead
+    # of bisecting all the way down (i.e. 2 * 16 - 1 calls)
+    assert len(calls) == 1 + 2 + 16
+
+
+async def test_queue_request_overloaded(sum_model: MLModel):
+    sum_model.settings.max_queued_requests = 2
+    adaptive_batcher = AdaptiveBatcher(sum_model)
+    rejected = adaptive_batcher._metrics.rejected._value.get()
+
+    inference_request = InferenceRequest(
+        inputs=[
+            RequestInput(name="input-0", shape=[1, 3], datatype="INT32", data=[1, 2, 3])
+        ]
+    )
+    await adaptive_batcher._queue_request(inference_request)
+    await adaptive_batcher._queue_request(inference_request)
+
+    with pytest.raises(ModelOverloaded) as err:
+        await adaptive_batcher._queue_request(inference_request)
+
+    assert err.value.status_code == 429
+    assert len(adaptive_batcher._async_responses) == 2
+    assert adaptive_batcher._metrics.rejected._value.get() == rejected + 1
+
+
+async def test_predict_overloaded_buckets(sum_model: MLModel):
+    sum_model.settings.max_queued_requests = 2
+    sum_model.settings.max_batch_time = 0.1
+    adaptive_batcher = AdaptiveBatcher(sum_model)
+
+    inference_request = InferenceRequest(
+        inputs=[
+            RequestInput(name="input-0", shape=[1, 3], datatype="INT32", data=[1, 2, 3])
+        ]
+    )
+    predictions = [
+        asyncio.create_task(adaptive_batcher.predict(inference_request))
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0.01)
+
+    # Both requests are now waiting in their bucket (and not in the queue),
+    # but they should still count towards the limit
+    assert adaptive_batcher._requests.empty()
+    with pytest.raises(ModelOverloaded):
+        await adaptive_batcher.predict(inference_request)
+
+    responses = await asyncio.gather(*predictions)
+    assert len(responses) == 2
+
+    # Once they have been sent to the model, new requests get accepted again
+    await adaptive_batcher.predict(inference_request)
+
+
+async def test_predict_max_concurrent_batches(sum_model: MLModel):
+    sum_model.settings.max_batch_size = 1
+    sum_model.settings.max_concurrent_batches = 2
+    adaptive_batcher = AdaptiveBatcher(sum_model)
+    predict_fn = adaptive_batcher._predict_fn
+
+    in_flight = []
+    max_in_flight = 0
+
+    async def _slow_predict(payload: InferenceRequest) -> InferenceResponse:
+        nonlocal max_in_flight
+        in_flight.append(payload)
+        max_in_flight = max(max_in_flight, len(in_flight))
+        await asyncio.sleep(0.05)
+        in_flight.remove(payload)
+        return await predict_fn(payload)
+
+    adaptive_batcher._predict_fn = _slow_predict
+    requests = [
+        InferenceRequest(
+            inputs=[
+                RequestInput(
+                    name="input-0", shape=[1, 3], datatype="INT32", data=[idx, 1, 2]
+                )
+            ],
+        )
+        for idx in range(6)
+    ]
+
+    responses = await asyncio.gather(
+        *[adaptive_batcher.predict(request) for request in requests]
+    )
+
+    assert len(responses) == len(requests)
+    assert max_in_flight == 2
+
+    batching_metrics = adaptive_batcher._metrics
+    assert batching_metrics.in_flight._value.get() == 0
+
+
+async def test_predict_queue_wait(adaptive_batcher: AdaptiveBatcher):
+    queue_wait = adaptive_batcher._metrics.queue_wait
+    observed = queue_wait._sum.get()
+    split_time = adaptive_batcher._metrics.split_time
+    split = split_time._sum.get()
+
+    inference_request = InferenceRequest(
+        inputs=[
+            RequestInput(name="input-0", shape=[1, 3], datatype="INT32", data=[1, 2, 3])
+        ]
+    )
+    await adaptive_batcher.predict(inference_request)
+
+    assert queue_wait._sum.get() > observed
+    assert split_time._sum.get() > split
+    assert adaptive_batcher._queued_at == {}
+
+
+async def test_batch_requests_priority(adaptive_batcher: AdaptiveBatcher):
+    for idx, priority in enumerate([0, 1, 0, 1]):
+        inference_request = InferenceRequest(
+            id=f"request-{idx}",
+            parameters=Parameters(priority=priority),
+            inputs=[
+                RequestInput(
+                    name="input-0", shape=[1, 3], datatype="INT32", data=[1, 2, 3]
+                )
+            ],
+        )
+        await adaptive_batcher._queue_request(inference_request)
+
+    adaptive_batcher._max_batch_size = 2
+    batched_requests = [
+        batched_req async for batched_req in adaptive_batcher._batch_requests()
+    ]
+
+    batched_ids = [
+        [req.id for req in batched_req.inference_requests.values()]
+        for batched_req in batched_requests
+    ]
+    assert batched_ids == [["request-1", "request-3"], ["request-0", "request-2"]]
+
+
+async def test_batch_requests_priority_late(adaptive_batcher: AdaptiveBatcher):
+    def _get_request(request_id: str, priority: int) -> InferenceRequest:
+        return InferenceRequest(
+            id=request_id,
+            parameters=Parameters(priority=priority),
+            inputs=[
+                RequestInput(
+                    name="input-0", shape=[1, 3], datatype="INT32", data=[1, 2, 3]
+                )
+            ],
+        )
+
+    for idx in range(4):
+        await adaptive_batcher._queue_request(_get_request(f"bulk-{idx}", 0))
+
+    adaptive_batcher._max_batch_size = 2
+    batch_requests = adaptive_batcher._batch_requests()
+    first = await batch_requests.__anext__()
+
+    # Requests which arrive later should still get picked ahead of any bulk
+    # requests already waiting in their bucket
+    await adaptive_batcher._queue_request(_get_request("high", 1))
+    rest = [batched_req async for batched_req in batch_requests]
+
+    batched_ids = [
+        [req.id for req in batched_req.inference_requests.values()]
+        for batched_req in [first, *rest]
+    ]
+    assert batched_ids == [["bulk-0", "bulk-1"], ["high", "bulk-2"], ["bulk-3"]]
+
+
+@pytest.mark.parametrize(
+    "max_batch_time, expected_reasons",
+    [(0.1, {"size": 1, "timeout": 1}), (0, {"size": 1, "drain": 1})],
+)
+async def test_batch_requests_metrics(
+    sum_model: MLModel, max_batch_time: float, expected_reasons: Dict[str, int]
+):
+    sum_model.settings.max_batch_time = max_batch_time
+    adaptive_batcher = AdaptiveBatcher(sum_model)
+    batching_metrics = adaptive_batcher._metrics
+
+    reasons = ["size", "timeout", "drain"]
+    flushes = {
+        reason: batching_metrics.flushes(reason)._value.get() for reason in reasons
+    }
+    sizes = batching_metrics.sizes._sum.get()
+    fill_ratio = batching_metrics.fill_ratio._sum.get()
+
+    for idx in range(3):
+        inference_request = InferenceRequest(
+            id=f"request-{idx}",
+            inputs=[
+                RequestInput(
+                    name="input-0", shape=[1, 3], datatype="INT32", data=[1, 2, 3]
+                )
+            ],
+        )
+        await adaptive_batcher._queue_request(inference_request)
+
+    adaptive_batcher._max_batch_size = 2
+    batched_requests = [
+        batched_req async for batched_req in adaptive_batcher._batch_requests()
+    ]
+
+    assert len(batched_requests) == 2
+    for reason in reasons:
+        flushed = batching_metrics.flushes(reason)._value.get() - flushes[reason]
+        assert flushed == expected_reasons.get(reason, 0)
+
+    assert batching_metrics.sizes._sum.get() - sizes == 3
+    assert batching_metrics.fill_ratio._sum.get() - fill_ratio == 1.5
+    assert batching_metrics.merge_time._sum.get() > 0
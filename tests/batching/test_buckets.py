@@ -0,0 +1,45 @@
+import pytest
+
+from typing import Hashable, List, Optional
+
+from mlserver.batching.buckets import BucketKey
+from mlserver.types import InferenceRequest, RequestInput
+
+
+def _build_request(shape: List[int], data: list, datatype: str = "INT32"):
+    return InferenceRequest(
+        inputs=[
+            RequestInput(name="other", shape=[1], datatype="INT32", data=[1]),
+            RequestInput(name="tokens", shape=shape, datatype=datatype, data=data),
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "boundaries, inference_request, expected",
+    [
+        (None, _build_request([1, 3], [1, 2, 3]), 3),
+        (None, _build_request([1, 5], [1, 2, 3, 4, 5]), 5),
+        # Boundaries don't apply to tensors, which can't be padded
+        ([4, 8], _build_request([1, 3], [1, 2, 3]), 3),
+        ([4, 8], _build_request([1, 5], [1, 2, 3, 4, 5]), 5),
+        (None, _build_request([2], ["hey", "hello"], "BYTES"), 5),
+        ([4, 8], _build_request([1], ["hey"], "BYTES"), 0),
+        ([4, 8], _build_request([2], [b"hey", b"hello"], "BYTES"), 1),
+        ([4, 8], _build_request([1], ["hello world"], "BYTES"), 2),
+        (
+            None,
+            InferenceRequest(
+                inputs=[RequestInput(name="foo", shape=[1], datatype="INT32", data=[1])]
+            ),
+            None,
+        ),
+    ],
+)
+def test_bucket_key(
+    boundaries: Optional[List[int]],
+    inference_request: InferenceRequest,
+    expected: Hashable,
+):
+    bucket_key = BucketKey(input_name="tokens", boundaries=boundaries)
+    assert bucket_key(inference_request) == expected
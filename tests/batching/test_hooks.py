@@ -37,3 +37,14 @@ async def test_load_batching_disabled(
     await load_batching(sum_model)
 
     assert expected == sum_model.predict  # type: ignore
+
+
+async def test_load_batching_target_latency(sum_model: MLModel):
+    sum_model.settings.max_batch_size = 10
+    sum_model.settings.max_batch_time = 0
+    sum_model.settings.target_batch_latency = 0.1
+
+    not_expected = sum_model.predict
+    await load_batching(sum_model)
+
+    assert not_expected != sum_model.predict  # type: ignore
@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+
+from typing import Optional
+
+from mlserver.batching.lanes import (
+    InvalidPriority,
+    Lanes,
+    PRIORITY_HEADER,
+    get_priority,
+)
+from mlserver.batching.metrics import BatchingMetrics
+from mlserver.types import InferenceRequest, Parameters, RequestInput
+
+
+def _get_request(
+    request_id: str,
+    parameters: Optional[Parameters] = None,
+) -> InferenceRequest:
+    return InferenceRequest(
+        id=request_id,
+        parameters=parameters,
+        inputs=[
+            RequestInput(name="input-0", shape=[1, 3], datatype="INT32", data=[1, 2, 3])
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    "parameters, expected",
+    [
+        (None, 0),
+        (Parameters(content_type="np"), 0),
+        (Parameters(priority=3), 3),
+        (Parameters(headers={PRIORITY_HEADER: "-1"}), -1),
+        (Parameters(priority=2, headers={PRIORITY_HEADER: "5"}), 2),
+    ],
+)
+def test_get_priority(parameters: Optional[Parameters], expected: int):
+    inference_request = _get_request("request-0", parameters)
+    assert get_priority(inference_request) == expected
+
+
+def test_get_priority_invalid():
+    inference_request = _get_request("request-0", Parameters(priority="high"))
+    with pytest.raises(InvalidPriority):
+        get_priority(inference_request)
+
+
+def test_lanes_priority():
+    lanes = Lanes()
+    for request_id, priority in [("low", 0), ("high", 2), ("mid", 1), ("high-2", 2)]:
+        inference_request = _get_request(request_id, Parameters(priority=priority))
+        lanes.append((request_id, inference_request))
+
+    assert len(lanes) == 4
+
+    request_ids = [lanes.popleft()[0] for _ in range(4)]
+    assert request_ids == ["high", "high-2", "mid", "low"]
+    assert len(lanes) == 0
+
+
+async def test_lanes_starvation():
+    lanes = Lanes(max_wait=0.05)
+    lanes.append(("low", _get_request("low", Parameters(priority=0))))
+    await asyncio.sleep(0.1)
+    lanes.append(("high", _get_request("high", Parameters(priority=1))))
+
+    # The low-priority request has waited for too long, so it goes first
+    assert lanes.popleft()[0] == "low"
+    assert lanes.popleft()[0] == "high"
+
+
+def test_lanes_metrics():
+    metrics = BatchingMetrics("lanes-model", "v1")
+    lanes = Lanes(metrics=metrics)
+    other_lanes = Lanes(metrics=metrics)
+    lanes.append(("request-0", _get_request("request-0", Parameters(priority=1))))
+    lanes.append(("request-1", _get_request("request-1", Parameters(priority=1))))
+    other_lanes.append(("request-2", _get_request("request-2", Parameters(priority=1))))
+
+    # Lane sizes get tracked across every set of lanes
+    assert metrics.lane_size(1)._value.get() == 3
+
+    lanes.popleft()
+    assert metrics.lane_size(1)._value.get() == 2
+    assert metrics.lane_wait(1)._sum.get() > 0
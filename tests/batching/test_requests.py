@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 
 from typing import Dict, List
 
@@ -9,7 +10,31 @@ from mlserver.types import (
     InferenceResponse,
     Parameters,
 )
-from mlserver.batching.requests import BatchedRequests
+from mlserver.batching.requests import BatchedRequests, _merge_data
+
+
+@pytest.mark.parametrize(
+    "all_data, expected",
+    [
+        ([[1, 2, 3], [4, 5, 6], [7]], [1, 2, 3, 4, 5, 6, 7]),
+        ([[[1, 2]], [[3, 4], [5, 6]]], [[1, 2], [3, 4], [5, 6]]),
+        (["abc", "def"], "abcdef"),
+        ([b"abc", b"def"], b"abcdef"),
+        (
+            [np.array([[1, 2]]), np.array([[3, 4], [5, 6]])],
+            np.array([[1, 2], [3, 4], [5, 6]]),
+        ),
+        ([np.array([1, 2]), [3, 4]], [1, 2, 3, 4]),
+    ],
+)
+def test_merge_data(all_data: list, expected):
+    merged = _merge_data(all_data)
+
+    assert type(merged) is type(expected)
+    if isinstance(expected, np.ndarray):
+        np.testing.assert_array_equal(merged, expected)
+    else:
+        assert merged == expected
 
 
 @pytest.mark.parametrize(
@@ -367,6 +392,23 @@ def test_merged_request(
                 ResponseOutput(name="foo", datatype="BYTES", shape=[1, 3], data=b"ghi"),
             ],
         ),
+        (
+            {"req-1": 1, "req-2": 2},
+            ResponseOutput(
+                name="foo",
+                datatype="INT32",
+                shape=[3, 2],
+                data=[[1, 2], [3, 4], [5, 6]],
+            ),
+            [
+                ResponseOutput(
+                    name="foo", datatype="INT32", shape=[1, 2], data=[[1, 2]]
+                ),
+                ResponseOutput(
+                    name="foo", datatype="INT32", shape=[2, 2], data=[[3, 4], [5, 6]]
+                ),
+            ],
+        ),
     ],
 )
 def test_split_response_output(
@@ -381,6 +423,34 @@ def test_split_response_output(
     assert list(split.values()) == expected
 
 
+@pytest.mark.parametrize(
+    "merged_data",
+    [
+        np.arange(12, dtype=np.int32).reshape(4, 3),
+        np.arange(12, dtype=np.int32),
+    ],
+)
+def test_split_response_output_array(merged_data: np.ndarray):
+    batched = BatchedRequests()
+    batched._minibatch_sizes = {"req-1": 1, "req-2": 2, "req-3": 1}
+    response_output = ResponseOutput(
+        name="foo", datatype="INT32", shape=[4, 3], data=merged_data
+    )
+    split = batched._split_response_output(response_output)
+
+    expected = merged_data.reshape(4, 3)
+    expected_rows = {
+        "req-1": expected[:1],
+        "req-2": expected[1:3],
+        "req-3": expected[3:],
+    }
+    for internal_id, expected_data in expected_rows.items():
+        data = split[internal_id].data.__root__
+        assert split[internal_id].shape == list(expected_data.shape)
+        assert np.shares_memory(data, merged_data)
+        np.testing.assert_array_equal(data.reshape(expected_data.shape), expected_data)
+
+
 @pytest.mark.parametrize(
     "inference_requests, inference_response, expected",
     [
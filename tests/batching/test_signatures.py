@@ -0,0 +1,93 @@
+import pytest
+
+from mlserver.batching.signatures import (
+    InvalidBatchRequest,
+    get_signature,
+    validate_request,
+)
+from mlserver.types import InferenceRequest, Parameters, RequestInput, RequestOutput
+
+
+def _build_request(**kwargs) -> InferenceRequest:
+    request_input = {
+        "name": "input-0",
+        "shape": [1, 3],
+        "datatype": "INT32",
+        "data": [1, 2, 3],
+        **kwargs,
+    }
+    return InferenceRequest(inputs=[RequestInput(**request_input)])
+
+
+@pytest.mark.parametrize(
+    "inference_request, other, expected",
+    [
+        (_build_request(), _build_request(), True),
+        (_build_request(), _build_request(shape=[2, 3], data=list(range(6))), True),
+        (_build_request(), _build_request(name="input-1"), False),
+        (_build_request(), _build_request(datatype="INT64"), False),
+        (_build_request(), _build_request(shape=[1, 1, 3]), False),
+        (
+            _build_request(),
+            _build_request(parameters=Parameters(content_type="np")),
+            False,
+        ),
+        (
+            _build_request(),
+            InferenceRequest(
+                inputs=_build_request().inputs,
+                outputs=[RequestOutput(name="output-0")],
+            ),
+            False,
+        ),
+        (
+            InferenceRequest(
+                inputs=[
+                    *_build_request().inputs,
+                    *_build_request(name="input-1").inputs,
+                ]
+            ),
+            InferenceRequest(
+                inputs=[
+                    *_build_request(name="input-1").inputs,
+                    *_build_request().inputs,
+                ]
+            ),
+            True,
+        ),
+    ],
+)
+def test_get_signature(
+    inference_request: InferenceRequest, other: InferenceRequest, expected: bool
+):
+    assert (get_signature(inference_request) == get_signature(other)) == expected
+
+
+@pytest.mark.parametrize(
+    "inference_request",
+    [
+        _build_request(),
+        _build_request(shape=[2, 3], data=[[1, 2, 3], [4, 5, 6]]),
+        _build_request(shape=[2, 3], datatype="BYTES", data=[b"abcdef"]),
+    ],
+)
+def test_validate_request(inference_request: InferenceRequest):
+    validate_request(inference_request)
+
+
+@pytest.mark.parametrize(
+    "inference_request",
+    [
+        _build_request(shape=[]),
+        _build_request(shape=[2, 3]),
+        InferenceRequest(
+            inputs=[
+                *_build_request().inputs,
+                *_build_request(name="input-1", shape=[3], data=[1, 2, 3]).inputs,
+            ]
+        ),
+    ],
+)
+def test_validate_request_invalid(inference_request: InferenceRequest):
+    with pytest.raises(InvalidBatchRequest):
+        validate_request(inference_request)
@@ -0,0 +1,115 @@
+import pytest
+
+from mlserver.batching.tuning import LatencyTuner
+
+
+@pytest.fixture
+def latency_tuner() -> LatencyTuner:
+    return LatencyTuner(
+        target_latency=0.1, max_batch_size=32, max_batch_time=0.5, min_samples=4
+    )
+
+
+def _observe_arrivals(latency_tuner: LatencyTuner, rate: float, num: int = 10):
+    for idx in range(num):
+        latency_tuner.observe_arrival(now=idx / rate)
+
+
+def _observe_batches(latency_tuner: LatencyTuner, num: int = 8):
+    # Latency of 10ms + 1ms per request
+    for idx in range(num):
+        batch_size = idx + 1
+        latency_tuner.observe_batch(batch_size, 0.01 + 0.001 * batch_size)
+
+
+def test_default_limits(latency_tuner: LatencyTuner):
+    _observe_arrivals(latency_tuner, rate=1000)
+    latency_tuner.observe_batch(4, 0.05)
+
+    assert latency_tuner.batch_size == 32
+    assert latency_tuner.batch_time == 0.5
+
+
+def test_estimate_latency(latency_tuner: LatencyTuner):
+    _observe_batches(latency_tuner)
+
+    assert latency_tuner.estimate_latency(1) == pytest.approx(0.011)
+    assert latency_tuner.estimate_latency(20) == pytest.approx(0.03)
+
+
+def test_low_arrival_rate(latency_tuner: LatencyTuner):
+    _observe_arrivals(latency_tuner, rate=5)
+    _observe_batches(latency_tuner)
+
+    # Waiting for a second request would already exceed the target
+    assert latency_tuner.batch_size == 1
+    assert latency_tuner.batch_time == 0
+
+
+def test_high_arrival_rate(latency_tuner: LatencyTuner):
+    _observe_arrivals(latency_tuner, rate=1000)
+    _observe_batches(latency_tuner)
+
+    # Batch fills up at 1ms per request, plus a latency of 10ms + 1ms per
+    # request, so anything above 45 requests exceeds the 100ms target
+    assert latency_tuner.arrival_rate == pytest.approx(1000)
+    assert latency_tuner.batch_size == 32
+    assert latency_tuner.batch_time == pytest.approx(0.1 - 0.042)
+
+
+def test_medium_arrival_rate(latency_tuner: LatencyTuner):
+    _observe_arrivals(latency_tuner, rate=200)
+    _observe_batches(latency_tuner)
+
+    # Batch fills up at 5ms per request, plus a latency of 10ms + 1ms per
+    # request
+    assert latency_tuner.batch_size == 15
+    assert latency_tuner.batch_time == pytest.approx(0.1 - 0.025)
+
+
+def test_slow_model(latency_tuner: LatencyTuner):
+    _observe_arrivals(latency_tuner, rate=1000)
+    for _ in range(4):
+        latency_tuner.observe_batch(1, 0.2)
+
+    assert latency_tuner.batch_size == 1
+    assert latency_tuner.batch_time == 0
+
+
+def test_keeps_prior(latency_tuner: LatencyTuner):
+    _observe_arrivals(latency_tuner, rate=1000)
+    _observe_batches(latency_tuner)
+    assert latency_tuner.batch_size == 32
+
+    # Even if only small batches get observed for a while (e.g. due to a dip
+    # in traffic), the tuner shouldn't assume that latency scales linearly
+    for _ in range(300):
+        latency_tuner.observe_batch(1, 0.011)
+
+    assert latency_tuner.estimate_latency(20) == pytest.approx(0.03)
+    assert latency_tuner.batch_size == 32
+
+
+def test_explore(latency_tuner: LatencyTuner):
+    latency_tuner.explore_every = 8
+    _observe_arrivals(latency_tuner, rate=1000)
+
+    # Latency looks linear with a single batch size, so tuner settles on small
+    # batches
+    for _ in range(latency_tuner.min_samples):
+        latency_tuner.observe_batch(1, 0.011)
+
+    assert latency_tuner.batch_size == 8
+
+    # Tuner should eventually try a larger batch size
+    explored = []
+    for _ in range(latency_tuner.explore_every):
+        latency_tuner.observe_batch(1, 0.011)
+        explored.append(latency_tuner.batch_size)
+
+    assert explored.count(16) == 1
+    assert latency_tuner.batch_size == 8
+
+    # Once it observes how latency scales, it can pick larger batches
+    latency_tuner.observe_batch(16, 0.026)
+    assert latency_tuner.batch_size == 32
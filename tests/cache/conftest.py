@@ -1,11 +1,45 @@
 import pytest
 
 from mlserver.cache.local import LocalCache
+from mlserver.cache.shared import SharedCache
+from mlserver.cache.redis import RedisCache
 from mlserver.cache import ResponseCache
+from mlserver.metrics.registry import MetricsRegistry
+
+from .utils import FakeRedisServer
 
 CACHE_SIZE = 10
 
 
 @pytest.fixture
-def local_cache() -> ResponseCache:
+def local_cache(metrics_registry: MetricsRegistry) -> ResponseCache:
     return LocalCache(size=CACHE_SIZE)
+
+
+@pytest.fixture
+async def shared_cache(
+    tmp_path: str, metrics_registry: MetricsRegistry
+) -> ResponseCache:
+    shared_cache = SharedCache(cache_dir=str(tmp_path), size=CACHE_SIZE)
+    yield shared_cache
+
+    await shared_cache.close()
+
+
+@pytest.fixture
+async def redis_server() -> FakeRedisServer:
+    redis_server = FakeRedisServer()
+    await redis_server.start()
+    yield redis_server
+
+    await redis_server.stop()
+
+
+@pytest.fixture
+async def redis_cache(
+    redis_server: FakeRedisServer, metrics_registry: MetricsRegistry
+) -> ResponseCache:
+    redis_cache = RedisCache(host="127.0.0.1", port=redis_server.port, pool_size=2)
+    yield redis_cache
+
+    await redis_cache.close()
@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+
+from mlserver.cache.coalescing import RequestCoalescer
+from mlserver.types import InferenceResponse
+
+
+@pytest.fixture
+def request_coalescer() -> RequestCoalescer:
+    return RequestCoalescer()
+
+
+async def test_run_coalesces(request_coalescer: RequestCoalescer):
+    num_calls = 0
+
+    async def _predict() -> InferenceResponse:
+        nonlocal num_calls
+        num_calls += 1
+        await asyncio.sleep(0.1)
+        return InferenceResponse(model_name="foo", outputs=[])
+
+    responses = await asyncio.gather(
+        *[request_coalescer.run("my-key", _predict) for _ in range(3)]
+    )
+
+    assert num_calls == 1
+    assert len(request_coalescer) == 0
+    assert len(set(id(response) for response in responses)) == 3
+
+
+async def test_run_error(request_coalescer: RequestCoalescer):
+    async def _predict() -> InferenceResponse:
+        await asyncio.sleep(0.1)
+        raise ValueError("something went wrong")
+
+    results = await asyncio.gather(
+        *[request_coalescer.run("my-key", _predict) for _ in range(2)],
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(request_coalescer) == 0
+
+
+async def test_run_leader_cancelled(request_coalescer: RequestCoalescer):
+    async def _predict() -> InferenceResponse:
+        await asyncio.sleep(0.1)
+        return InferenceResponse(model_name="foo", outputs=[])
+
+    leader = asyncio.create_task(request_coalescer.run("my-key", _predict))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(request_coalescer.run("my-key", _predict))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    response = await follower
+
+    assert leader.cancelled()
+    assert response.model_name == "foo"
@@ -0,0 +1,177 @@
+import pytest
+import numpy as np
+
+from mlserver.cache import compute_cache_key, namespaced_key
+from mlserver.cache.key import CACHE_KEY_DIGEST_SIZE, get_namespace
+from mlserver.types import InferenceRequest, RequestInput, RequestOutput, Parameters
+
+
+def _request(data, datatype: str = "INT32", shape=[1, 3], **kwargs):
+    return InferenceRequest(
+        inputs=[
+            RequestInput(name="input-0", shape=shape, datatype=datatype, data=data)
+        ],
+        **kwargs,
+    )
+
+
+def test_key_size(inference_request: InferenceRequest):
+    cache_key = compute_cache_key(inference_request, name="sum-model")
+    assert len(cache_key) == CACHE_KEY_DIGEST_SIZE * 2
+
+
+def test_key_ignores_request_specific_fields(inference_request: InferenceRequest):
+    cache_key = compute_cache_key(inference_request, name="sum-model")
+
+    modified = inference_request.copy(deep=True)
+    modified.id = "my-request-id"
+    modified.parameters = Parameters(headers={"x-foo": "bar"})
+
+    assert compute_cache_key(modified, name="sum-model") == cache_key
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        (_request([1, 2, 3]), _request([1, 2, 4])),
+        (_request([1, 2, 3]), _request([1, 2, 3], shape=[3, 1])),
+        (_request([1, 2, 3]), _request([1, 2, 3], datatype="INT64")),
+        (_request([1, 2, 3]), _request([1.5, 2, 3], datatype="INT32")),
+        (
+            _request(["ab", "c"], datatype="BYTES", shape=[2]),
+            _request(["a", "bc"], datatype="BYTES", shape=[2]),
+        ),
+    ],
+)
+def test_key_differs(a: InferenceRequest, b: InferenceRequest):
+    assert compute_cache_key(a, name="sum-model") != compute_cache_key(
+        b, name="sum-model"
+    )
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        (
+            _request([1, 2, 3], outputs=[RequestOutput(name="proba")]),
+            _request([1, 2, 3], outputs=[RequestOutput(name="label")]),
+        ),
+        (
+            _request([1, 2, 3]),
+            _request([1, 2, 3], outputs=[]),
+        ),
+        (
+            _request([1, 2, 3], outputs=[RequestOutput(name="proba")]),
+            _request(
+                [1, 2, 3],
+                outputs=[
+                    RequestOutput(
+                        name="proba", parameters=Parameters(content_type="np")
+                    )
+                ],
+            ),
+        ),
+    ],
+)
+def test_key_outputs_differ(a: InferenceRequest, b: InferenceRequest):
+    assert compute_cache_key(a, name="sum-model") != compute_cache_key(
+        b, name="sum-model"
+    )
+
+
+def test_key_outputs_order():
+    a = _request(
+        [1, 2, 3], outputs=[RequestOutput(name="proba"), RequestOutput(name="label")]
+    )
+    b = _request(
+        [1, 2, 3], outputs=[RequestOutput(name="label"), RequestOutput(name="proba")]
+    )
+
+    assert compute_cache_key(a, name="sum-model") == compute_cache_key(
+        b, name="sum-model"
+    )
+
+
+def test_key_includes_model(inference_request: InferenceRequest):
+    cache_key = compute_cache_key(inference_request, name="sum-model")
+
+    assert compute_cache_key(inference_request, name="other-model") != cache_key
+    assert (
+        compute_cache_key(inference_request, name="sum-model", version="v2")
+        != cache_key
+    )
+
+
+def test_key_numpy_buffer():
+    as_list = _request([[1, 2, 3]], datatype="INT64")
+    as_array = _request(np.array([[1, 2, 3]], dtype=np.int64), datatype="INT64")
+
+    assert compute_cache_key(as_list, name="sum-model") == compute_cache_key(
+        as_array, name="sum-model"
+    )
+
+
+def test_key_numpy_object():
+    a = _request(np.array(["foo", b"bar", 1], dtype=object), datatype="BYTES")
+    # NOTE: Build the elements at runtime, so that they are different objects
+    b = _request(
+        np.array(["".join(["f", "oo"]), b"".join([b"b", b"ar"]), 1], dtype=object),
+        datatype="BYTES",
+    )
+    c = _request(np.array(["foo", b"bar", "1"], dtype=object), datatype="BYTES")
+
+    assert compute_cache_key(a, name="sum-model") == compute_cache_key(
+        b, name="sum-model"
+    )
+    assert compute_cache_key(a, name="sum-model") != compute_cache_key(
+        c, name="sum-model"
+    )
+
+
+def test_key_bytes_non_json():
+    a = _request(["foo", np.int64(1)], datatype="BYTES", shape=[2])
+    b = _request(["foo", np.int64(1)], datatype="BYTES", shape=[2])
+    c = _request(["foo", '"1"'], datatype="BYTES", shape=[2])
+
+    assert compute_cache_key(a, name="sum-model") == compute_cache_key(
+        b, name="sum-model"
+    )
+    assert compute_cache_key(a, name="sum-model") != compute_cache_key(
+        c, name="sum-model"
+    )
+
+
+def test_key_raw_contents():
+    raw = np.array([1, 2, 3], dtype=np.int32).tobytes()
+    a = _request(raw)
+    b = _request(raw)
+    c = _request(np.array([1, 2, 4], dtype=np.int32).tobytes())
+
+    assert compute_cache_key(a, name="sum-model") == compute_cache_key(
+        b, name="sum-model"
+    )
+    assert compute_cache_key(a, name="sum-model") != compute_cache_key(
+        c, name="sum-model"
+    )
+
+
+def test_key_parameters_allowlist(inference_request: InferenceRequest):
+    modified = inference_request.copy(deep=True)
+    modified.parameters = Parameters(content_type="np", foo="bar")
+
+    assert compute_cache_key(inference_request, name="sum-model") == (
+        compute_cache_key(modified, name="sum-model")
+    )
+    assert compute_cache_key(
+        inference_request, name="sum-model", parameters=["content_type"]
+    ) != compute_cache_key(modified, name="sum-model", parameters=["content_type"])
+
+
+@pytest.mark.parametrize("namespace", ["sum-model:v1:0", "my-org/sum-model::0", ""])
+def test_namespaced_key(namespace):
+    cache_key = compute_cache_key(_request([1, 2, 3]), name="sum-model")
+    key = namespaced_key(namespace, cache_key)
+
+    assert key.endswith(cache_key)
+    assert get_namespace(key) == namespace
+    assert get_namespace(f"{key}.rest") == namespace
@@ -1,5 +1,10 @@
+import asyncio
+
 from string import ascii_lowercase
 
+from mlserver.cache.local import LocalCache
+from mlserver.cache.local.local import _sizeof
+
 from .conftest import CACHE_SIZE
 
 
@@ -37,3 +42,88 @@ async def test_local_cache_rotate(local_cache):
             assert await local_cache.size() == CACHE_SIZE
             assert await local_cache.lookup(str(key)) == symbol
             assert await local_cache.lookup(str(key - CACHE_SIZE)) == ""
+
+
+async def test_local_cache_lru(local_cache):
+    for key in range(CACHE_SIZE):
+        await local_cache.insert(str(key), ascii_lowercase[key])
+
+    # Accessing the oldest entry should promote it
+    assert await local_cache.lookup("0") == "a"
+
+    await local_cache.insert("new key", "new value")
+    assert await local_cache.size() == CACHE_SIZE
+    assert await local_cache.lookup("0") == "a"
+    assert await local_cache.lookup("1") == ""
+
+
+async def test_local_cache_ttl(metrics_registry):
+    local_cache = LocalCache(size=CACHE_SIZE, ttl=0.1)
+    await local_cache.insert("key", "value")
+    assert await local_cache.lookup("key") == "value"
+
+    await asyncio.sleep(0.2)
+    assert await local_cache.lookup("key") == ""
+    assert await local_cache.size() == 0
+    assert local_cache.nbytes == 0
+
+
+async def test_local_cache_max_bytes(metrics_registry):
+    value = "x" * 100
+    entry_size = _sizeof("0", value)
+    local_cache = LocalCache(size=CACHE_SIZE, max_bytes=entry_size * 3)
+
+    for key in range(5):
+        await local_cache.insert(str(key), value)
+
+    assert await local_cache.size() == 3
+    assert local_cache.nbytes == entry_size * 3
+    assert await local_cache.lookup("0") == ""
+    assert await local_cache.lookup("4") == value
+
+    # Entries larger than the whole budget should never be admitted
+    await local_cache.insert("too-large", value * 10)
+    assert await local_cache.lookup("too-large") == ""
+    assert await local_cache.size() == 3
+
+    # Nor should they leave behind any stale value for the same key
+    await local_cache.insert("4", value * 10)
+    assert await local_cache.lookup("4") == ""
+    assert await local_cache.size() == 2
+    assert local_cache.nbytes == entry_size * 2
+
+
+async def test_local_cache_metrics(local_cache, metrics_registry):
+    for key in range(CACHE_SIZE + 2):
+        await local_cache.insert(str(key), ascii_lowercase[key])
+
+    await local_cache.lookup("0")
+    await local_cache.lookup(str(CACHE_SIZE))
+
+    labels = {"cache": "local"}
+    hits = metrics_registry.get_sample_value("response_cache_hits_total", labels)
+    misses = metrics_registry.get_sample_value("response_cache_misses_total", labels)
+    evictions = metrics_registry.get_sample_value(
+        "response_cache_evictions_total", labels
+    )
+    entries = metrics_registry.get_sample_value("response_cache_entries", labels)
+    nbytes = metrics_registry.get_sample_value("response_cache_bytes", labels)
+
+    assert hits == 1
+    assert misses == 1
+    assert evictions == 2
+    assert entries == CACHE_SIZE
+    assert nbytes == local_cache.nbytes
+
+
+async def test_local_cache_invalidate(local_cache):
+    await local_cache.insert("foo:1/a", "value")
+    await local_cache.insert("foo:1/b", "value")
+    await local_cache.insert("foo:2/a", "value")
+
+    await local_cache.invalidate("foo:1")
+
+    assert await local_cache.size() == 1
+    assert await local_cache.lookup("foo:1/a") == ""
+    assert await local_cache.lookup("foo:2/a") == "value"
+    assert local_cache.nbytes == _sizeof("foo:2/a", "value")
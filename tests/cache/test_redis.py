@@ -0,0 +1,191 @@
+import asyncio
+
+from mlserver.cache.key import namespaced_key
+from mlserver.cache.redis import RedisCache
+
+from .utils import FakeRedisServer
+
+
+async def test_redis_cache_lookup(redis_cache: RedisCache):
+    assert await redis_cache.size() == 0
+    assert await redis_cache.lookup("unknown key") == ""
+    assert await redis_cache.size() == 0
+
+
+async def test_redis_cache_insert(redis_cache: RedisCache):
+    await redis_cache.insert("key", "value")
+    assert await redis_cache.lookup("key") == "value"
+    assert await redis_cache.size() == 1
+
+    await redis_cache.insert("key", b"\x00\xffvalue")
+    assert await redis_cache.lookup("key") == b"\x00\xffvalue"
+    assert await redis_cache.size() == 1
+
+
+async def test_redis_cache_compression(
+    redis_cache: RedisCache, redis_server: FakeRedisServer
+):
+    value = "value" * redis_cache.compression_threshold
+    await redis_cache.insert("key", value)
+    assert await redis_cache.lookup("key") == value
+
+    stored = redis_server.data[0][b"mlserver:key"]
+    assert len(stored) < len(value)
+
+
+async def test_redis_cache_pipelining(
+    redis_cache: RedisCache, redis_server: FakeRedisServer
+):
+    items = [(f"key-{idx}", f"value-{idx}") for idx in range(5)]
+    await redis_cache.insert_many(items)
+
+    keys = [key for key, _ in items] + ["unknown key"]
+    values = await redis_cache.lookup_many(keys)
+    assert values == [value for _, value in items] + [""]
+
+
+async def test_redis_cache_ttl(redis_cache: RedisCache, redis_server: FakeRedisServer):
+    redis_cache.ttl = 1.5
+    await redis_cache.insert("key", "value")
+    assert await redis_cache.lookup("key") == "value"
+
+    set_command = next(cmd for cmd in redis_server.commands if cmd[0] == b"SET")
+    assert set_command[3:] == [b"PX", b"1500"]
+
+
+async def test_redis_cache_timeout(
+    redis_cache: RedisCache, redis_server: FakeRedisServer
+):
+    await redis_cache.insert("key", "value")
+    assert await redis_cache.lookup("key") == "value"
+
+    redis_server.delay = redis_cache.lookup_timeout * 4
+    assert await redis_cache.lookup("key") == ""
+
+
+async def test_redis_cache_unavailable():
+    redis_cache = RedisCache(host="127.0.0.1", port=1, connect_timeout=0.1)
+
+    await redis_cache.insert("key", "value")
+    assert await redis_cache.lookup("key") == ""
+    assert await redis_cache.size() == 0
+
+    # Invalidations should never raise
+    await redis_cache.invalidate("foo:v1:0")
+    await asyncio.gather(*redis_cache._invalidations)
+
+    await redis_cache.close()
+
+
+async def test_redis_cache_connect_timeout(metrics_registry):
+    # Handshake will take longer than the lookup timeout
+    redis_server = FakeRedisServer(password="secret", delay=0.2)
+    await redis_server.start()
+
+    redis_cache = RedisCache(
+        host="127.0.0.1", port=redis_server.port, password="secret", pool_size=1
+    )
+    assert await redis_cache.lookup("key") == ""
+
+    # The connection should still get opened (and reused), instead of being
+    # left half-open
+    connecting = list(redis_cache._connecting.values())
+    await asyncio.gather(*connecting)
+    assert redis_cache._connecting == {}
+    connection = redis_cache._pool[0]
+    assert connection is not None and not connection.closed
+
+    redis_server.delay = 0
+    await redis_cache.insert("key", "value")
+    assert await redis_cache.lookup("key") == "value"
+    assert redis_cache._pool[0] is connection
+
+    await redis_cache.close()
+    await redis_server.stop()
+
+
+async def test_redis_cache_max_pending(
+    redis_cache: RedisCache, redis_server: FakeRedisServer, metrics_registry
+):
+    keys = [f"key-{idx}" for idx in range(20)]
+    keys = [key for key in keys if redis_cache._get_connection_idx(key) == 0][:3]
+    await redis_cache.insert(keys[0], "value")
+    connection = await redis_cache._get_connection(0)
+
+    redis_server.delay = 0.1
+    redis_cache.max_pending = 2
+    labels = {"cache": "redis"}
+    before = metrics_registry.get_sample_value("response_cache_errors_total", labels)
+
+    # Once there are too many replies pending, inserts should get dropped
+    for key in keys:
+        await redis_cache.insert(key, "value")
+
+    assert connection.pending == 2
+    after = metrics_registry.get_sample_value("response_cache_errors_total", labels)
+    assert after - (before or 0) == 1
+
+    redis_server.delay = 0
+    await redis_cache._sync()
+
+
+async def test_redis_cache_insert_error(metrics_registry):
+    # Server will reject every command, as the cache doesn't authenticate
+    redis_server = FakeRedisServer(password="secret")
+    await redis_server.start()
+
+    labels = {"cache": "redis"}
+    redis_cache = RedisCache(host="127.0.0.1", port=redis_server.port)
+    before = metrics_registry.get_sample_value("response_cache_errors_total", labels)
+
+    await redis_cache.insert("key", "value")
+    await redis_cache._sync()
+
+    after = metrics_registry.get_sample_value("response_cache_errors_total", labels)
+    assert after - (before or 0) == 1
+
+    await redis_cache.close()
+    await redis_server.stop()
+
+
+async def test_redis_cache_same_connection(redis_cache: RedisCache):
+    # Inserts and lookups of the same key go through the same connection, so
+    # lookups always see earlier inserts
+    items = [(f"key-{idx}", f"value-{idx}") for idx in range(20)]
+    for key, value in items:
+        await redis_cache.insert(key, value)
+        assert await redis_cache.lookup(key) == value
+
+    used = {redis_cache._get_connection_idx(key) for key, _ in items}
+    assert used == set(range(len(redis_cache._pool)))
+
+
+async def test_redis_cache_auth(metrics_registry):
+    redis_server = FakeRedisServer(password="secret")
+    await redis_server.start()
+
+    redis_cache = RedisCache(
+        host="127.0.0.1", port=redis_server.port, password="secret", db=2
+    )
+    await redis_cache.insert("key", "value")
+    assert await redis_cache.lookup("key") == "value"
+    assert b"mlserver:key" in redis_server.data[2]
+
+    await redis_cache.close()
+    await redis_server.stop()
+
+
+async def test_redis_cache_invalidate(redis_cache: RedisCache):
+    await redis_cache.insert(namespaced_key("foo:v1:0", "a"), "value-a")
+    await redis_cache.insert(namespaced_key("foo:v1:0", "b"), "value-b")
+    await redis_cache.insert(namespaced_key("foo:v1:1", "a"), "value-c")
+    await redis_cache.insert(namespaced_key("bar:v1:0", "a"), "value-d")
+    assert await redis_cache.size() == 4
+
+    await redis_cache.invalidate("foo:v1:0")
+    await asyncio.gather(*redis_cache._invalidations)
+
+    assert await redis_cache.size() == 2
+    assert await redis_cache.lookup(namespaced_key("foo:v1:0", "a")) == ""
+    assert await redis_cache.lookup(namespaced_key("foo:v1:1", "a")) == "value-c"
+    assert await redis_cache.lookup(namespaced_key("bar:v1:0", "a")) == "value-d"
@@ -0,0 +1,146 @@
+import numpy as np
+import pytest
+
+from mlserver.cache.local import LocalCache
+from mlserver.cache.rows import (
+    RowPredictor,
+    RowRequests,
+    split_response,
+    merge_responses,
+)
+from mlserver.types import (
+    InferenceRequest,
+    InferenceResponse,
+    RequestInput,
+    ResponseOutput,
+)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        [1, 2, 3, 4, 5, 6],
+        [[1, 2, 3], [4, 5, 6]],
+    ],
+)
+def test_row_requests_take(data):
+    payload = InferenceRequest(
+        inputs=[RequestInput(name="foo", shape=[2, 3], datatype="INT32", data=data)]
+    )
+    row_requests = RowRequests.from_request(payload)
+
+    assert row_requests is not None
+    assert len(row_requests) == 2
+
+    row_request = row_requests.take([1])
+    assert row_request.inputs[0].shape == [1, 3]
+    assert row_request.inputs[0].data.__root__ in ([4, 5, 6], [[4, 5, 6]])
+
+
+@pytest.mark.parametrize(
+    "inputs",
+    [
+        # Different batch sizes
+        [
+            RequestInput(name="foo", shape=[2], datatype="INT32", data=[1, 2]),
+            RequestInput(name="bar", shape=[3], datatype="INT32", data=[1, 2, 3]),
+        ],
+        # Raw contents
+        [RequestInput(name="foo", shape=[1], datatype="BYTES", data=b"abc")],
+    ],
+)
+def test_row_requests_invalid(inputs):
+    payload = InferenceRequest(inputs=inputs)
+    assert RowRequests.from_request(payload) is None
+
+
+def test_row_requests_cache_keys(sum_model):
+    payload = InferenceRequest(
+        inputs=[
+            RequestInput(
+                name="foo", shape=[3, 2], datatype="INT32", data=[1, 2, 3, 4, 1, 2]
+            )
+        ]
+    )
+    row_requests = RowRequests.from_request(payload)
+
+    keys = row_requests.cache_keys(sum_model, namespace="sum-model::0")
+    assert len(keys) == 3
+    assert keys[0] != keys[1]
+    assert keys[0] == keys[2]
+
+
+def test_split_response_merge_responses():
+    response = InferenceResponse(
+        model_name="foo",
+        outputs=[
+            ResponseOutput(name="bar", shape=[3, 1], datatype="INT32", data=[1, 2, 3])
+        ],
+    )
+
+    rows = split_response(response, 3)
+    assert rows is not None
+    assert [row.outputs[0].data.__root__ for row in rows] == [[1], [2], [3]]
+
+    merged = merge_responses(rows)
+    assert merged == response
+
+
+def test_split_response_merge_responses_arrays():
+    response = InferenceResponse(
+        model_name="foo",
+        outputs=[
+            ResponseOutput(
+                name="bar",
+                shape=[3, 2],
+                datatype="INT32",
+                data=np.array([[1, 2], [3, 4], [5, 6]]),
+            )
+        ],
+    )
+
+    rows = split_response(response, 3)
+    assert rows is not None
+    assert [row.outputs[0].shape for row in rows] == [[1, 2]] * 3
+    np.testing.assert_array_equal(rows[1].outputs[0].data.__root__, [[3, 4]])
+
+    # Rows coming from the cache will be lists, which should still get merged
+    # with the array rows
+    cached = InferenceResponse.parse_raw(rows[0].json())
+    merged = merge_responses([cached, rows[2]])
+    assert merged.outputs[0].shape == [2, 2]
+    assert merged.outputs[0].data.__root__ == [[1, 2], [5, 6]]
+
+
+def test_split_response_invalid():
+    response = InferenceResponse(
+        model_name="foo",
+        outputs=[ResponseOutput(name="bar", shape=[1], datatype="INT32", data=[6])],
+    )
+
+    assert split_response(response, 3) is None
+
+
+async def test_row_predictor_state(sum_model, inference_request):
+    original_predict = sum_model.predict
+
+    async def _aggregated_predict(payload):
+        prediction = await original_predict(payload)
+        prediction.outputs[0].shape = [1]
+        prediction.outputs[0].data.__root__ = [sum(prediction.outputs[0].data)]
+        return prediction
+
+    inference_request.inputs[0].shape = [2, 3]
+    inference_request.inputs[0].data.__root__ = [1, 2, 3, 4, 5, 6]
+
+    # Once a predictor finds out that the model's outputs can't be split, it
+    # stops using the row-level cache for that model
+    response_cache = LocalCache()
+    await RowPredictor().predict(
+        sum_model, inference_request, response_cache, "ns", predict=_aggregated_predict
+    )
+    assert await response_cache.size() == 0
+
+    # Other predictors shouldn't be affected though
+    await RowPredictor().predict(sum_model, inference_request, response_cache, "ns")
+    assert await response_cache.size() == 2
@@ -0,0 +1,16 @@
+import pytest
+
+from mlserver.cache.serializer import pack_response, unpack_response
+
+
+@pytest.mark.parametrize(
+    "body, headers",
+    [
+        (b'{"model_name":"sum-model"}', {"x-foo": "bar"}),
+        (b"\x00\xff", None),
+        (b"", {"x-foo": "bar"}),
+    ],
+)
+def test_pack_response(body, headers):
+    packed = pack_response(body, headers)
+    assert unpack_response(packed) == (body, headers)
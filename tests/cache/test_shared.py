@@ -0,0 +1,184 @@
+import asyncio
+import fcntl
+import multiprocessing
+import os
+import pytest
+import struct
+
+from string import ascii_lowercase
+
+from mlserver.cache.shared import SharedCache
+from mlserver.cache.shared.shared import _SeqFormat, _digest
+
+from .conftest import CACHE_SIZE
+
+
+def _insert_from_other_process(cache_dir: str, key: str, value: str):
+    shared_cache = SharedCache(cache_dir=cache_dir, size=CACHE_SIZE)
+    asyncio.run(shared_cache.insert(key, value))
+    asyncio.run(shared_cache.close())
+
+
+async def test_shared_cache_lookup(shared_cache):
+    assert await shared_cache.size() == 0
+    assert await shared_cache.lookup("unknown key") == ""
+    assert await shared_cache.size() == 0
+
+
+async def test_shared_cache_insert(shared_cache):
+    await shared_cache.insert("key", "value")
+    assert await shared_cache.lookup("key") == "value"
+    assert await shared_cache.size() == 1
+
+    await shared_cache.insert("key", "new value")
+    assert await shared_cache.lookup("key") == "new value"
+    assert await shared_cache.size() == 1
+
+
+async def test_shared_cache_insert_bytes(shared_cache):
+    await shared_cache.insert("key", b"\x00\xffvalue")
+    assert await shared_cache.lookup("key") == b"\x00\xffvalue"
+
+    await shared_cache.insert("key", "value")
+    assert await shared_cache.lookup("key") == "value"
+
+
+async def test_shared_cache_invalidate(shared_cache):
+    await shared_cache.insert("foo:1/a", "value")
+    await shared_cache.insert("foo:1/b", "value")
+    await shared_cache.insert("foo:2/a", "value")
+
+    await shared_cache.invalidate("foo:1")
+
+    assert await shared_cache.size() == 1
+    assert await shared_cache.lookup("foo:1/a") == ""
+    assert await shared_cache.lookup("foo:2/a") == "value"
+
+
+async def test_shared_cache_eviction(tmp_path, metrics_registry):
+    # With a single set, the least recently used entry should get evicted
+    shared_cache = SharedCache(cache_dir=str(tmp_path), size=4, ways=4)
+    for key in range(4):
+        await shared_cache.insert(str(key), ascii_lowercase[key])
+
+    assert await shared_cache.lookup("0") == "a"
+    await shared_cache.insert("new key", "new value")
+
+    assert await shared_cache.size() == 4
+    assert await shared_cache.lookup("0") == "a"
+    assert await shared_cache.lookup("1") == ""
+    assert await shared_cache.lookup("new key") == "new value"
+
+    await shared_cache.close()
+
+
+async def test_shared_cache_ttl(tmp_path, metrics_registry):
+    shared_cache = SharedCache(cache_dir=str(tmp_path), size=CACHE_SIZE, ttl=0.1)
+    await shared_cache.insert("key", "value")
+    assert await shared_cache.lookup("key") == "value"
+
+    await asyncio.sleep(0.2)
+    assert await shared_cache.lookup("key") == ""
+    assert await shared_cache.size() == 0
+
+    await shared_cache.close()
+
+
+async def test_shared_cache_entry_too_large(tmp_path, metrics_registry):
+    # The byte budget gets split evenly across all 8 slots
+    shared_cache = SharedCache(cache_dir=str(tmp_path), size=8, max_bytes=8 * 64)
+    await shared_cache.insert("key", "x" * 128)
+    assert await shared_cache.lookup("key") == ""
+
+    await shared_cache.insert("key", "x" * 64)
+    assert await shared_cache.lookup("key") == "x" * 64
+
+    # Oversized values shouldn't leave behind a stale value for the same key
+    await shared_cache.insert("key", "x" * 128)
+    assert await shared_cache.lookup("key") == ""
+    assert await shared_cache.size() == 0
+
+    await shared_cache.close()
+
+
+async def test_shared_cache_budget_too_small(tmp_path, metrics_registry):
+    with pytest.raises(ValueError):
+        SharedCache(cache_dir=str(tmp_path), size=8, max_bytes=8 * 8)
+
+
+async def test_shared_cache_interrupted_write(shared_cache):
+    await shared_cache.insert("key", "value")
+
+    # Simulate a writer which crashed mid-write, leaving an odd sequence number
+    (offset,) = [
+        offset
+        for offset in shared_cache._slot_offsets(_digest("key"))
+        if shared_cache._read_slot(offset, _digest("key"))[0]
+    ]
+    (seq,) = struct.unpack_from(_SeqFormat, shared_cache._mmap, offset)
+    struct.pack_into(_SeqFormat, shared_cache._mmap, offset, seq + 1)
+    assert await shared_cache.lookup("key") == ""
+
+    # Later writes should leave the slot readable again
+    await shared_cache.insert("key", "new value")
+    assert await shared_cache.lookup("key") == "new value"
+
+
+async def test_shared_cache_insert_contended(tmp_path, shared_cache):
+    # Simulate another process holding the write lock
+    fd = os.open(shared_cache.path, os.O_RDWR)
+    fcntl.flock(fd, fcntl.LOCK_EX)
+
+    insert = asyncio.create_task(shared_cache.insert("key", "value"))
+    await asyncio.sleep(0.1)
+
+    # The insert should wait on a separate thread, without blocking the loop
+    assert not insert.done()
+
+    fcntl.flock(fd, fcntl.LOCK_UN)
+    os.close(fd)
+    await insert
+    assert await shared_cache.lookup("key") == "value"
+
+
+async def test_shared_cache_persists(tmp_path, shared_cache):
+    await shared_cache.insert("key", "value")
+    await shared_cache.close()
+
+    restarted = SharedCache(cache_dir=str(tmp_path), size=CACHE_SIZE)
+    assert await restarted.lookup("key") == "value"
+    await restarted.close()
+
+    # A cache with an incompatible layout should start from scratch on a
+    # separate file
+    resized = SharedCache(cache_dir=str(tmp_path), size=CACHE_SIZE * 2)
+    assert resized.path != restarted.path
+    assert await resized.lookup("key") == ""
+    await resized.close()
+
+    # Re-open to let the fixture close it again
+    shared_cache.__init__(cache_dir=str(tmp_path), size=CACHE_SIZE)
+
+
+async def test_shared_cache_incompatible_file(tmp_path, shared_cache):
+    with open(shared_cache.path, "r+b") as cache_file:
+        cache_file.write(b"corrupted")
+
+    # The file may be in use by other processes, so it shouldn't get wiped
+    size = os.path.getsize(shared_cache.path)
+    with pytest.raises(ValueError):
+        SharedCache(cache_dir=str(tmp_path), size=CACHE_SIZE)
+
+    assert os.path.getsize(shared_cache.path) == size
+
+
+async def test_shared_cache_across_processes(tmp_path, shared_cache):
+    ctx = multiprocessing.get_context("spawn")
+    process = ctx.Process(
+        target=_insert_from_other_process, args=(str(tmp_path), "key", "value")
+    )
+    process.start()
+    process.join()
+
+    assert process.exitcode == 0
+    assert await shared_cache.lookup("key") == "value"
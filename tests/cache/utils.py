@@ -0,0 +1,105 @@
+import asyncio
+import fnmatch
+import re
+
+from asyncio import StreamReader, StreamWriter
+from typing import Dict, List, Optional
+
+from mlserver.cache.redis.protocol import CRLF, read_reply
+
+
+def _bulk(value: Optional[bytes]) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+
+    return b"$%d\r\n" % len(value) + value + CRLF
+
+
+def _to_fnmatch(pattern: str) -> str:
+    # Redis escapes special characters with a backslash
+    return re.sub(r"\\(.)", lambda match: f"[{match.group(1)}]", pattern)
+
+
+def _array(items: List[bytes]) -> bytes:
+    return b"*%d\r\n" % len(items) + b"".join(items)
+
+
+class FakeRedisServer:
+    """
+    Minimal stand-in for a Redis server, which only supports the subset of
+    commands used by the ``RedisCache``.
+    Expiry times are accepted but ignored.
+    """
+
+    def __init__(self, password: Optional[str] = None, delay: float = 0):
+        self.password = password
+        self.delay = delay
+        self.data: Dict[int, Dict[bytes, bytes]] = {}
+        self.commands: List[List[bytes]] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]  # type: ignore
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+
+    async def stop(self):
+        self._server.close()  # type: ignore
+        await self._server.wait_closed()  # type: ignore
+
+    async def _handle(self, reader: StreamReader, writer: StreamWriter):
+        state = {"db": 0, "authenticated": self.password is None}
+        try:
+            while True:
+                command = await read_reply(reader)
+                self.commands.append(command)
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+
+                writer.write(self._execute(command, state))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _execute(self, command: List[bytes], state: dict) -> bytes:
+        name, args = command[0].upper(), command[1:]
+        if name == b"AUTH":
+            if args[0].decode() != self.password:
+                return b"-WRONGPASS invalid password\r\n"
+
+            state["authenticated"] = True
+            return b"+OK\r\n"
+
+        if not state["authenticated"]:
+            return b"-NOAUTH Authentication required\r\n"
+
+        data = self.data.setdefault(state["db"], {})
+        if name == b"PING":
+            return b"+PONG\r\n"
+
+        if name == b"SELECT":
+            state["db"] = int(args[0])
+            return b"+OK\r\n"
+
+        if name == b"GET":
+            return _bulk(data.get(args[0]))
+
+        if name == b"SET":
+            data[args[0]] = args[1]
+            return b"+OK\r\n"
+
+        if name == b"DEL":
+            deleted = [key for key in args if data.pop(key, None) is not None]
+            return b":%d\r\n" % len(deleted)
+
+        if name == b"SCAN":
+            # Return everything in a single page
+            pattern = _to_fnmatch(args[args.index(b"MATCH") + 1].decode())
+            keys = [key for key in data if fnmatch.fnmatchcase(key.decode(), pattern)]
+            return _array([_bulk(b"0"), _array([_bulk(key) for key in keys])])
+
+        return b"-ERR unknown command\r\n"
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 
 from google.protobuf import json_format
 
@@ -6,6 +7,7 @@ from mlserver import types
 from mlserver.grpc.converters import (
     ModelInferRequestConverter,
     ModelInferResponseConverter,
+    ModelInferResponseSerializer,
     ServerMetadataResponseConverter,
     ModelMetadataResponseConverter,
     RepositoryIndexRequestConverter,
@@ -216,6 +218,22 @@ def test_modelinferresponse_from_types(inference_response, use_raw, expected):
     )
 
 
+@pytest.mark.parametrize("use_raw", [True, False])
+def test_modelinferresponse_serializer(inference_response, use_raw):
+    serializer = ModelInferResponseSerializer(use_raw=use_raw)
+    expected = ModelInferResponseConverter.from_types(
+        inference_response.copy(deep=True), use_raw=use_raw
+    )
+
+    serialized = serializer.serialize(inference_response)
+    assert serialized.id == ""
+
+    model_infer_response = serializer.with_id(
+        serializer.loads(serializer.dumps(serialized)), expected.id
+    )
+    assert model_infer_response == expected
+
+
 @pytest.mark.parametrize(
     "model_infer_response",
     [
@@ -313,6 +331,34 @@ def test_parameters_from_types(grpc_parameters):
                 ),
             ),
         ),
+        (
+            types.ResponseOutput(
+                name="output-0",
+                datatype="FP32",
+                shape=[2, 2],
+                data=np.array([[1, 2], [3, 4]], dtype=np.float32),
+            ),
+            pb.ModelInferResponse.InferOutputTensor(
+                name="output-0",
+                datatype="FP32",
+                shape=[2, 2],
+                contents=pb.InferTensorContents(fp32_contents=[1, 2, 3, 4]),
+            ),
+        ),
+        (
+            types.ResponseOutput(
+                name="output-0",
+                datatype="BOOL",
+                shape=[2],
+                data=np.array([True, False]),
+            ),
+            pb.ModelInferResponse.InferOutputTensor(
+                name="output-0",
+                datatype="BOOL",
+                shape=[2],
+                contents=pb.InferTensorContents(bool_contents=[True, False]),
+            ),
+        ),
     ],
 )
 def test_inferoutputtensor_from_types(
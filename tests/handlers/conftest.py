@@ -23,9 +23,12 @@ def cached_settings() -> Settings:
 
 
 @pytest.fixture
-def cached_data_plane(
+async def cached_data_plane(
     cached_settings: Settings,
     model_registry: MultiModelRegistry,
     prometheus_registry: CollectorRegistry,
 ) -> DataPlane:
-    return DataPlane(settings=cached_settings, model_registry=model_registry)
+    data_plane = DataPlane(settings=cached_settings, model_registry=model_registry)
+    yield data_plane
+
+    await data_plane.close()
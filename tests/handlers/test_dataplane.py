@@ -1,10 +1,19 @@
+import asyncio
 import pytest
 import uuid
 
 from mlserver.errors import ModelNotReady
 from mlserver.settings import ModelSettings, ModelParameters
 from mlserver.types import MetadataTensor, InferenceResponse
-
+from mlserver.cache import SharedCache
+from mlserver.cache.rows import RowRequests
+from mlserver.cache.redis import RedisCache
+from mlserver.handlers import DataPlane
+from mlserver.cloudevents import CLOUDEVENTS_HEADER_ID
+from mlserver.rest.responses import InferenceResponseSerializer
+from mlserver.utils import insert_headers
+
+from ..cache.utils import FakeRedisServer
 from ..fixtures import SumModel
 
 
@@ -117,7 +126,7 @@ async def test_infer_generates_uuid(data_plane, sum_model, inference_request):
 
 
 async def test_infer_response_cache(cached_data_plane, sum_model, inference_request):
-    cache_key = inference_request.json()
+    cache_key = cached_data_plane._get_cache_key(sum_model, inference_request)
     payload = inference_request.copy(deep=True)
     prediction = await cached_data_plane.infer(
         payload=payload, name=sum_model.name, version=sum_model.version
@@ -146,6 +155,421 @@ async def test_infer_response_cache(cached_data_plane, sum_model, inference_requ
     assert cached_response.outputs == prediction.outputs
 
 
+async def test_infer_response_cache_ignores_id(
+    cached_data_plane, sum_model, inference_request
+):
+    response_cache = cached_data_plane._get_response_cache()
+    for request_id in ["first-request", "second-request"]:
+        payload = inference_request.copy(deep=True)
+        payload.id = request_id
+        prediction = await cached_data_plane.infer(
+            payload=payload, name=sum_model.name, version=sum_model.version
+        )
+
+        assert prediction.id == request_id
+        assert await response_cache.size() == 1
+
+
+async def test_infer_response_cache_disabled_for_model(
+    cached_data_plane, sum_model, inference_request
+):
+    sum_model.settings.cache_enabled = False
+    await cached_data_plane.infer(
+        payload=inference_request, name=sum_model.name, version=sum_model.version
+    )
+
+    response_cache = cached_data_plane._get_response_cache()
+    assert await response_cache.size() == 0
+
+
+async def test_infer_shared_response_cache(
+    cached_settings,
+    model_registry,
+    prometheus_registry,
+    sum_model,
+    inference_request,
+    tmp_path,
+):
+    cached_settings.cache_dir = str(tmp_path)
+    data_plane = DataPlane(settings=cached_settings, model_registry=model_registry)
+    response_cache = data_plane._get_response_cache()
+    assert isinstance(response_cache, SharedCache)
+
+    await data_plane.infer(
+        payload=inference_request, name=sum_model.name, version=sum_model.version
+    )
+    assert await response_cache.size() == 1
+
+    await data_plane.close()
+
+
+async def test_infer_custom_response_cache(
+    cached_settings,
+    model_registry,
+    prometheus_registry,
+    sum_model,
+    inference_request,
+):
+    redis_server = FakeRedisServer()
+    await redis_server.start()
+
+    cached_settings.cache_implementation = RedisCache
+    cached_settings.cache_implementation_args = {
+        "host": "127.0.0.1",
+        "port": redis_server.port,
+    }
+    data_plane = DataPlane(settings=cached_settings, model_registry=model_registry)
+    response_cache = data_plane._get_response_cache()
+    assert isinstance(response_cache, RedisCache)
+
+    for _ in range(2):
+        await data_plane.infer(
+            payload=inference_request, name=sum_model.name, version=sum_model.version
+        )
+    assert await response_cache.size() == 1
+
+    await data_plane.close()
+    assert response_cache._pool == [None] * len(response_cache._pool)
+    await redis_server.stop()
+
+
+async def test_infer_serialized(data_plane, sum_model, inference_request):
+    insert_headers(inference_request, {"x-foo": "bar"})
+    body, headers = await data_plane.infer_serialized(
+        payload=inference_request,
+        name=sum_model.name,
+        version=sum_model.version,
+        serializer=InferenceResponseSerializer(),
+    )
+
+    prediction = InferenceResponse.parse_raw(body)
+    assert prediction.id == inference_request.id
+    assert prediction.outputs[0].data.__root__ == [6]
+    assert prediction.parameters is None or prediction.parameters.headers is None
+
+    assert headers["x-foo"] == "bar"
+    assert headers[CLOUDEVENTS_HEADER_ID] == inference_request.id
+
+
+async def test_infer_serialized_response_cache(
+    cached_data_plane, sum_model, inference_request
+):
+    num_calls = 0
+    original_predict = sum_model.predict
+
+    async def _counted_predict(payload):
+        nonlocal num_calls
+        num_calls += 1
+        return await original_predict(payload)
+
+    sum_model.predict = _counted_predict
+
+    serializer = InferenceResponseSerializer()
+    response_cache = cached_data_plane._get_response_cache()
+    for request_id in ["first-request", "second-request"]:
+        payload = inference_request.copy(deep=True)
+        payload.id = request_id
+        insert_headers(payload, {"x-foo": "bar"})
+        body, headers = await cached_data_plane.infer_serialized(
+            payload=payload,
+            name=sum_model.name,
+            version=sum_model.version,
+            serializer=serializer,
+        )
+
+        prediction = InferenceResponse.parse_raw(body)
+        assert prediction.id == request_id
+        assert prediction.outputs[0].data.__root__ == [6]
+
+        assert headers["x-foo"] == "bar"
+        assert headers[CLOUDEVENTS_HEADER_ID] == request_id
+
+    assert num_calls == 1
+    assert await response_cache.size() == 1
+
+
+async def test_infer_response_cache_rows(
+    cached_data_plane, sum_model, inference_request
+):
+    sum_model.settings.cache_rows = True
+
+    batch_sizes = []
+    original_predict = sum_model.predict
+
+    async def _tracked_predict(payload):
+        batch_sizes.append(payload.inputs[0].shape[0])
+        return await original_predict(payload)
+
+    sum_model.predict = _tracked_predict
+
+    inference_request.inputs[0].shape = [2, 3]
+    inference_request.inputs[0].data.__root__ = [1, 2, 3, 4, 5, 6]
+    prediction = await cached_data_plane.infer(
+        payload=inference_request, name=sum_model.name, version=sum_model.version
+    )
+    assert prediction.outputs[0].data.__root__ == [6, 15]
+
+    # Only the last row should be sent to the model
+    inference_request.inputs[0].shape = [3, 3]
+    inference_request.inputs[0].data.__root__ = [4, 5, 6, 1, 2, 3, 7, 8, 9]
+    prediction = await cached_data_plane.infer(
+        payload=inference_request, name=sum_model.name, version=sum_model.version
+    )
+    assert prediction.outputs[0].shape == [3, 1]
+    assert prediction.outputs[0].data.__root__ == [15, 6, 24]
+    assert batch_sizes == [2, 1]
+
+    response_cache = cached_data_plane._get_response_cache()
+    assert await response_cache.size() == 3
+
+
+async def test_infer_response_cache_rows_unsplittable(
+    cached_data_plane, sum_model, inference_request
+):
+    sum_model.settings.cache_rows = True
+
+    num_calls = 0
+    original_predict = sum_model.predict
+
+    async def _aggregated_predict(payload):
+        nonlocal num_calls
+        num_calls += 1
+        # Aggregate all rows into a single one, so that the response can't
+        # be split into rows
+        prediction = await original_predict(payload)
+        prediction.outputs[0].shape = [1]
+        prediction.outputs[0].data.__root__ = [sum(prediction.outputs[0].data)]
+        return prediction
+
+    sum_model.predict = _aggregated_predict
+
+    inference_request.inputs[0].shape = [2, 3]
+    inference_request.inputs[0].data.__root__ = [1, 2, 3, 4, 5, 6]
+    for _ in range(2):
+        prediction = await cached_data_plane.infer(
+            payload=inference_request, name=sum_model.name, version=sum_model.version
+        )
+        assert prediction.outputs[0].data.__root__ == [21]
+
+    # The model should only run once per request
+    assert num_calls == 2
+    response_cache = cached_data_plane._get_response_cache()
+    assert await response_cache.size() == 0
+
+
+async def test_infer_response_cache_rows_partial_unsplittable(
+    cached_data_plane, sum_model, inference_request
+):
+    sum_model.settings.cache_rows = True
+
+    payloads = []
+    original_predict = sum_model.predict
+
+    async def _aggregated_predict(payload):
+        payloads.append(payload)
+        prediction = await original_predict(payload)
+        prediction.outputs[0].shape = [1]
+        prediction.outputs[0].data.__root__ = [sum(prediction.outputs[0].data)]
+        return prediction
+
+    sum_model.predict = _aggregated_predict
+
+    # Cache the first row (e.g. as if it had been cached by another worker)
+    inference_request.inputs[0].shape = [2, 3]
+    inference_request.inputs[0].data.__root__ = [1, 2, 3, 4, 5, 6]
+    row_requests = RowRequests.from_request(inference_request)
+    namespace = cached_data_plane._get_cache_namespace(sum_model)
+    row_key = row_requests.cache_keys(sum_model, namespace)[0]
+    response_cache = cached_data_plane._get_response_cache()
+    cached_row = await original_predict(row_requests.take([0]))
+    await response_cache.insert(row_key, cached_row.json())
+
+    prediction = await cached_data_plane.infer(
+        payload=inference_request, name=sum_model.name, version=sum_model.version
+    )
+
+    # As the model's outputs haven't been split before, the whole request
+    # should be sent to the model (and only once)
+    assert prediction.outputs[0].data.__root__ == [21]
+    assert len(payloads) == 1
+    assert payloads[0].inputs[0].shape == [2, 3]
+
+
+async def test_infer_response_cache_rows_coalesce(
+    cached_data_plane, sum_model, inference_request
+):
+    sum_model.settings.cache_rows = True
+    sum_model.settings.coalesce_requests = True
+
+    num_calls = 0
+    original_predict = sum_model.predict
+
+    async def _slow_predict(payload):
+        nonlocal num_calls
+        num_calls += 1
+        await asyncio.sleep(0.1)
+        return await original_predict(payload)
+
+    sum_model.predict = _slow_predict
+
+    predictions = await asyncio.gather(
+        *[
+            cached_data_plane.infer(
+                payload=inference_request.copy(deep=True),
+                name=sum_model.name,
+                version=sum_model.version,
+            )
+            for _ in range(5)
+        ]
+    )
+
+    assert num_calls == 1
+    for prediction in predictions:
+        assert prediction.outputs[0].data.__root__ == [6]
+
+
+@pytest.mark.parametrize("cache_enabled", [True, False])
+async def test_infer_coalesce_requests(
+    cached_data_plane, sum_model, inference_request, cache_enabled
+):
+    sum_model.settings.coalesce_requests = True
+    sum_model.settings.cache_enabled = cache_enabled
+
+    num_calls = 0
+    original_predict = sum_model.predict
+
+    async def _slow_predict(payload):
+        nonlocal num_calls
+        num_calls += 1
+        await asyncio.sleep(0.1)
+        return await original_predict(payload)
+
+    sum_model.predict = _slow_predict
+
+    payloads = []
+    for idx in range(5):
+        payload = inference_request.copy(deep=True)
+        payload.id = f"request-{idx}"
+        payloads.append(payload)
+
+    predictions = await asyncio.gather(
+        *[
+            cached_data_plane.infer(
+                payload=payload, name=sum_model.name, version=sum_model.version
+            )
+            for payload in payloads
+        ]
+    )
+
+    assert num_calls == 1
+    assert len(set(id(prediction) for prediction in predictions)) == len(payloads)
+    for payload, prediction in zip(payloads, predictions):
+        assert prediction.id == payload.id
+        assert prediction.outputs[0].data.__root__ == [6]
+
+
+async def test_infer_coalesce_requests_different_inputs(
+    data_plane, sum_model, inference_request
+):
+    sum_model.settings.coalesce_requests = True
+
+    other_request = inference_request.copy(deep=True)
+    other_request.inputs[0].data.__root__ = [2, 3, 4]
+
+    predictions = await asyncio.gather(
+        data_plane.infer(payload=inference_request, name=sum_model.name),
+        data_plane.infer(payload=other_request, name=sum_model.name),
+    )
+
+    assert predictions[0].outputs[0].data.__root__ == [6]
+    assert predictions[1].outputs[0].data.__root__ == [9]
+
+
+async def test_unload_response_cache(cached_data_plane, sum_model, inference_request):
+    await cached_data_plane.infer(
+        payload=inference_request, name=sum_model.name, version=sum_model.version
+    )
+
+    response_cache = cached_data_plane._get_response_cache()
+    assert await response_cache.size() == 1
+
+    await cached_data_plane.unload_response_cache(sum_model)
+    assert await response_cache.size() == 0
+
+
+async def test_reload_response_cache(
+    cached_data_plane, model_registry, sum_model, sum_model_settings, inference_request
+):
+    await cached_data_plane.infer(
+        payload=inference_request, name=sum_model.name, version=sum_model.version
+    )
+    old_key = cached_data_plane._get_cache_key(sum_model, inference_request)
+
+    new_model = SumModel(sum_model_settings)
+    await cached_data_plane.reload_response_cache(sum_model, new_model)
+
+    response_cache = cached_data_plane._get_response_cache()
+    assert await response_cache.size() == 0
+
+    # The old model should keep using its old namespace
+    assert cached_data_plane._get_cache_key(sum_model, inference_request) == old_key
+    new_key = cached_data_plane._get_cache_key(new_model, inference_request)
+    assert new_key != old_key
+
+
+async def test_reload_response_cache_in_flight(
+    cached_data_plane, sum_model, sum_model_settings, inference_request, mocker
+):
+    new_model = SumModel(sum_model_settings)
+    predict = sum_model.predict
+
+    async def _reload_while_predicting(payload):
+        # Reload the model while the request is still in flight
+        await cached_data_plane.reload_response_cache(sum_model, new_model)
+        return await predict(payload)
+
+    mocker.patch.object(sum_model, "predict", _reload_while_predicting)
+    await cached_data_plane.infer(
+        payload=inference_request, name=sum_model.name, version=sum_model.version
+    )
+
+    # The old model's response shouldn't land on its invalidated namespace
+    response_cache = cached_data_plane._get_response_cache()
+    assert await response_cache.size() == 0
+
+
+async def test_reload_response_cache_error(
+    cached_data_plane, sum_model, sum_model_settings, mocker
+):
+    response_cache = cached_data_plane._get_response_cache()
+    mocker.patch.object(
+        response_cache, "invalidate", side_effect=ConnectionRefusedError()
+    )
+
+    new_model = SumModel(sum_model_settings)
+    reloaded = await cached_data_plane.reload_response_cache(sum_model, new_model)
+    assert reloaded == new_model
+
+
+async def test_response_cache_namespace_settings(
+    cached_data_plane, sum_model, sum_model_settings, inference_request
+):
+    old_key = cached_data_plane._get_cache_key(sum_model, inference_request)
+
+    # Models with different settings (e.g. from a previous deployment) should
+    # never share a namespace, even if the generation is the same
+    new_settings = sum_model_settings.copy(deep=True)
+    new_settings.parameters.extra = {"foo": "bar"}
+    new_model = SumModel(new_settings)
+
+    new_key = cached_data_plane._get_cache_key(new_model, inference_request)
+    assert new_key != old_key
+
+    # Models with the same settings should share a namespace
+    same_model = SumModel(sum_model_settings)
+    assert cached_data_plane._get_cache_key(same_model, inference_request) == old_key
+
+
 async def test_response_cache_disabled(data_plane):
     response_cache = data_plane._get_response_cache()
     assert response_cache is None
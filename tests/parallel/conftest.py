@@ -5,14 +5,13 @@ from multiprocessing import Queue
 
 from mlserver.settings import Settings, ModelSettings, ModelParameters
 from mlserver.types import InferenceRequest
-from mlserver.utils import generate_uuid
 from mlserver.model import MLModel
 from mlserver.env import Environment
 from mlserver.parallel.dispatcher import Dispatcher
 from mlserver.parallel.model import ModelMethods
 from mlserver.parallel.pool import InferencePool
 from mlserver.parallel.worker import Worker
-from mlserver.parallel.utils import configure_inference_pool, cancel_task
+from mlserver.parallel.utils import configure_inference_pool, terminate_queue
 from mlserver.parallel.messages import (
     ModelUpdateMessage,
     ModelUpdateType,
@@ -99,8 +98,11 @@ async def worker(
 
     yield worker
 
+    # NOTE: As the worker runs within this same process, closing its queues
+    # would also close its end, so wait for it to stop first
+    await terminate_queue(worker._model_updates)
+    await worker_task
     await worker.stop()
-    await cancel_task(worker_task)
 
 
 @pytest.fixture
@@ -122,7 +124,6 @@ def inference_request_message(
     sum_model_settings: ModelSettings, inference_request: InferenceRequest
 ) -> ModelRequestMessage:
     return ModelRequestMessage(
-        id=generate_uuid(),
         model_name=sum_model_settings.name,
         model_version=sum_model_settings.parameters.version,
         method_name=ModelMethods.Predict.value,
@@ -133,7 +134,6 @@ def inference_request_message(
 @pytest.fixture
 def metadata_request_message(sum_model_settings: ModelSettings) -> ModelRequestMessage:
     return ModelRequestMessage(
-        id=generate_uuid(),
         model_name=sum_model_settings.name,
         model_version=sum_model_settings.parameters.version,
         method_name=ModelMethods.Metadata.value,
@@ -143,7 +143,6 @@ def metadata_request_message(sum_model_settings: ModelSettings) -> ModelRequestM
 @pytest.fixture
 def custom_request_message(sum_model_settings: ModelSettings) -> ModelRequestMessage:
     return ModelRequestMessage(
-        id=generate_uuid(),
         model_name=sum_model_settings.name,
         model_version=sum_model_settings.parameters.version,
         # From `SumModel` class in tests/fixtures.py
@@ -0,0 +1,90 @@
+import pytest
+
+from mlserver.settings import Settings
+from mlserver.parallel.autoscaler import Autoscaler
+
+WORKER_PIDS = [10, 11]
+
+
+@pytest.fixture
+def autoscaler(settings: Settings) -> Autoscaler:
+    settings = settings.copy(
+        update={
+            "parallel_workers": 1,
+            "parallel_workers_max": 3,
+            "parallel_autoscaling_target_in_flight": 2.0,
+            "parallel_autoscaling_max_wait": 0.5,
+            "parallel_autoscaling_idle_timeout": 10.0,
+        }
+    )
+    return Autoscaler(settings)
+
+
+@pytest.mark.parametrize(
+    "parallel_workers_max, expected", [(None, False), (1, False), (3, True)]
+)
+def test_enabled(settings: Settings, parallel_workers_max: int, expected: bool):
+    settings = settings.copy(
+        update={"parallel_workers": 1, "parallel_workers_max": parallel_workers_max}
+    )
+    autoscaler = Autoscaler(settings)
+
+    assert autoscaler.enabled == expected
+
+
+@pytest.mark.parametrize(
+    "worker_pids, in_flight, oldest_wait, expected",
+    [
+        (WORKER_PIDS, {10: 2, 11: 2}, 0.0, False),
+        (WORKER_PIDS, {10: 5, 11: 1}, 0.0, True),
+        (WORKER_PIDS, {10: 1, 11: 0}, 1.0, True),
+        (WORKER_PIDS + [12], {10: 9, 11: 9, 12: 9}, 1.0, False),
+    ],
+)
+def test_should_scale_up(
+    autoscaler: Autoscaler,
+    worker_pids: list,
+    in_flight: dict,
+    oldest_wait: float,
+    expected: bool,
+):
+    assert autoscaler.should_scale_up(worker_pids, in_flight, oldest_wait) == expected
+
+
+def test_get_idle_worker(autoscaler: Autoscaler):
+    autoscaler.observe(WORKER_PIDS, {10: 0, 11: 1}, now=0)
+    assert autoscaler.get_idle_worker(WORKER_PIDS, {10: 0, 11: 1}, now=5) is None
+
+    autoscaler.observe(WORKER_PIDS, {10: 0, 11: 0}, now=5)
+    assert autoscaler.get_idle_worker(WORKER_PIDS, {10: 0, 11: 0}, now=10) == 10
+    assert autoscaler.get_idle_worker(WORKER_PIDS, {10: 0, 11: 0}, now=15) == 10
+
+
+def test_get_idle_worker_new_worker(autoscaler: Autoscaler):
+    # New workers shouldn't get retired straight away
+    autoscaler.observe(WORKER_PIDS, {}, now=0)
+    autoscaler.observe(WORKER_PIDS + [12], {}, now=10)
+
+    worker_pids = WORKER_PIDS + [12]
+    assert autoscaler.get_idle_worker(worker_pids, {}, now=10) in WORKER_PIDS
+
+    autoscaler.remove(10)
+    autoscaler.remove(11)
+    assert autoscaler.get_idle_worker([12, 13], {}, now=15) is None
+
+
+@pytest.mark.parametrize(
+    "worker_pids, in_flight",
+    [
+        # Already at the minimum size
+        ([10], {}),
+        # Remaining worker would go over the target
+        (WORKER_PIDS, {11: 3}),
+    ],
+)
+def test_get_idle_worker_keeps_capacity(
+    autoscaler: Autoscaler, worker_pids: list, in_flight: dict
+):
+    autoscaler.observe(worker_pids, {}, now=0)
+
+    assert autoscaler.get_idle_worker(worker_pids, in_flight, now=60) is None
@@ -1,9 +1,18 @@
+import asyncio
 import pytest
 
+from mlserver.settings import ModelSettings
 from mlserver.types import InferenceResponse
-from mlserver.parallel.errors import WorkerStop
+from mlserver.parallel.errors import NoWorkersAvailable, WorkerError, WorkerStop
+from mlserver.parallel import utils
 from mlserver.parallel.dispatcher import Dispatcher
-from mlserver.parallel.messages import ModelUpdateMessage, ModelRequestMessage
+from mlserver.parallel.messages import (
+    ModelUpdateMessage,
+    ModelRequestMessage,
+    ModelResponseMessage,
+    next_message_id,
+)
+from mlserver.parallel.shared_memory import SharedMemoryPool
 
 
 async def test_on_worker_stop(dispatcher: Dispatcher):
@@ -12,13 +21,34 @@ async def test_on_worker_stop(dispatcher: Dispatcher):
     dispatcher.on_worker_stop(worker, 255)
 
     assert worker.pid not in dispatcher._workers
-    # Ensure worker is no longer in round robin rotation
+    # Ensure worker is no longer in the rotation
     workers_count = len(dispatcher._workers)
     for _ in range(workers_count + 1):
-        worker_pid = next(dispatcher._workers_round_robin)
+        _, worker_pid = dispatcher._get_worker()
         assert worker_pid != worker.pid
 
 
+async def test_ready_workers(dispatcher: Dispatcher):
+    worker = list(dispatcher._workers.values())[0]
+    await dispatcher.on_worker_start(worker)
+    assert worker.pid not in dispatcher.ready_workers
+
+    dispatcher.on_worker_ready(worker)
+    assert worker.pid in dispatcher.ready_workers
+
+
+async def test_on_worker_stop_shared_memory(dispatcher: Dispatcher, mocker):
+    shared_memory = SharedMemoryPool(threshold=1024)
+    release = mocker.spy(shared_memory, "release")
+    dispatcher._shared_memory = shared_memory
+
+    worker = list(dispatcher._workers.values())[0]
+    await worker.stop()
+    dispatcher.on_worker_stop(worker, 255)
+
+    release.assert_called_once_with(worker.pid)
+
+
 async def test_dispatch(
     dispatcher: Dispatcher,
     load_message: ModelUpdateMessage,
@@ -33,6 +63,68 @@ async def test_dispatch(
     assert len(inference_response.outputs) > 0
 
 
+async def test_dispatch_large_response(
+    dispatcher: Dispatcher,
+    load_message: ModelUpdateMessage,
+    inference_request_message: ModelRequestMessage,
+    mocker,
+):
+    mocker.patch("mlserver.parallel.utils.LARGE_MESSAGE_SIZE", 0)
+    on_large_message = mocker.spy(utils.MessageReader, "_on_large_message")
+
+    await dispatcher.dispatch_update(load_message)
+    for _ in range(3):
+        response_message = await dispatcher.dispatch_request(
+            inference_request_message.copy(id=next_message_id())
+        )
+
+        assert response_message.exception is None
+        assert isinstance(response_message.return_value, InferenceResponse)
+
+    assert on_large_message.call_count >= 4
+
+
+async def test_dispatch_observes_service_time(
+    dispatcher: Dispatcher,
+    load_message: ModelUpdateMessage,
+    inference_request_message: ModelRequestMessage,
+    mocker,
+):
+    await dispatcher.dispatch_update(load_message)
+
+    # Replace the worker's response with one which took longer to get
+    # processed than what it took to get sent back
+    service_time = 1234.0
+
+    def _send_request(request_message: ModelRequestMessage):
+        response = ModelResponseMessage(
+            id=request_message.id,
+            exception=WorkerError(Exception("my error")),
+            service_time=service_time,
+        )
+        # NOTE: Resolve the response once the request has been scheduled
+        loop = asyncio.get_running_loop()
+        loop.call_soon(dispatcher._async_responses.resolve, response)
+
+    for worker in dispatcher._workers.values():
+        mocker.patch.object(worker, "send_request", _send_request)
+
+    observe = mocker.spy(dispatcher._policy, "observe")
+    with pytest.raises(WorkerError):
+        await dispatcher.dispatch_request(inference_request_message)
+
+    observe.assert_called_once_with(mocker.ANY, service_time)
+    assert dispatcher._async_responses._service_times == {}
+
+
+async def test_resolve_unknown(dispatcher: Dispatcher, inference_request_message):
+    # Late responses (e.g. for requests already cleared) should be ignored
+    async_responses = dispatcher._async_responses
+    async_responses.resolve(ModelResponseMessage(id=inference_request_message.id))
+
+    assert async_responses.in_flight() == {}
+
+
 async def test_cancel(dispatcher: Dispatcher, inference_request_message):
     worker = list(dispatcher._workers.values())[0]
     async_responses = dispatcher._async_responses
@@ -45,3 +137,27 @@ async def test_cancel(dispatcher: Dispatcher, inference_request_message):
         await async_responses._wait(inference_request_message.id)
 
     assert str(exit_code) in str(err)
+
+
+async def test_in_flight(dispatcher: Dispatcher, inference_request_message):
+    worker = list(dispatcher._workers.values())[0]
+    async_responses = dispatcher._async_responses
+    async_responses._schedule(inference_request_message, worker)
+
+    assert async_responses.in_flight()[worker.pid] == 1
+    worker_in_flight = async_responses.worker_in_flight.labels(worker.pid)
+    assert worker_in_flight._value.get() == 1
+
+    async_responses._clear_message(inference_request_message.id)
+    assert async_responses.in_flight()[worker.pid] == 0
+    assert worker_in_flight._value.get() == 0
+
+
+async def test_get_worker_no_replicas(
+    dispatcher: Dispatcher, sum_model_settings: ModelSettings
+):
+    sum_model_settings.parallel_replicas = 1
+    dispatcher._placement.set_workers(sum_model_settings, [])
+
+    with pytest.raises(NoWorkersAvailable):
+        dispatcher._get_worker(sum_model_settings.name, sum_model_settings.version)
@@ -1,8 +1,12 @@
 import pytest
 import json
 
+from multiprocessing.reduction import ForkingPickler
+
 from mlserver.settings import ModelSettings
 from mlserver.parallel.messages import (
+    ModelRequestMessage,
+    ModelResponseMessage,
     ModelUpdateMessage,
     ModelUpdateType,
 )
@@ -18,12 +22,12 @@ _dummy_model_settings = ModelSettings(name="foo", implementation=SumModel).dict(
     [
         (
             {
-                "id": "foo",
+                "id": 1,
                 "update_type": ModelUpdateType.Load,
                 "model_settings": ModelSettings(name="foo", implementation=SumModel),
             },
             ModelUpdateMessage(
-                id="foo",
+                id=1,
                 update_type=ModelUpdateType.Load,
                 serialised_model_settings=json.dumps(
                     {
@@ -38,14 +42,14 @@ _dummy_model_settings = ModelSettings(name="foo", implementation=SumModel).dict(
         ),
         (
             {
-                "id": "foo",
+                "id": 1,
                 "update_type": ModelUpdateType.Load,
                 "serialised_model_settings": (
                     '{"name":"foo","implementation":"tests.fixtures.SumModel"}'
                 ),
             },
             ModelUpdateMessage(
-                id="foo",
+                id=1,
                 update_type=ModelUpdateType.Load,
                 serialised_model_settings=(
                     '{"name":"foo","implementation":"tests.fixtures.SumModel"}'
@@ -89,3 +93,72 @@ def test_model_settings(
     assert import_path == expected_path
 
     assert model_settings.name == expected.name
+
+
+def test_model_settings_cached():
+    model_settings = ModelSettings(name="foo", implementation=SumModel)
+    model_update_message = ModelUpdateMessage(
+        update_type=ModelUpdateType.Load,
+        model_settings=model_settings,
+    )
+
+    assert model_update_message.model_settings is model_settings
+
+
+def test_model_settings_cached_deserialised():
+    model_update_message = ModelUpdateMessage(
+        update_type=ModelUpdateType.Load,
+        serialised_model_settings=(
+            '{"name":"foo","implementation":"tests.fixtures.SumModel"}'
+        ),
+    )
+
+    model_settings = model_update_message.model_settings
+    assert model_update_message.model_settings is model_settings
+
+
+def test_message_ids():
+    first = ModelRequestMessage(model_name="foo", method_name="predict")
+    second = ModelRequestMessage(model_name="foo", method_name="predict")
+
+    assert isinstance(first.id, int)
+    assert second.id > first.id
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        ModelRequestMessage(
+            model_name="foo",
+            model_version="v1",
+            method_name="my_payload",
+            method_args=[1, 2],
+            method_kwargs={"payload": [1, 2, 3]},
+        ),
+        ModelResponseMessage(id=1, return_value={"foo": "bar"}),
+        ModelUpdateMessage(
+            update_type=ModelUpdateType.Unload,
+            model_settings=ModelSettings(name="foo", implementation=SumModel),
+        ),
+    ],
+)
+def test_pickle(message):
+    pickled = ForkingPickler.dumps(message)
+    unpickled = ForkingPickler.loads(pickled)
+
+    assert unpickled == message
+    assert unpickled is not message
+
+
+def test_pickle_skips_cache():
+    model_update_message = ModelUpdateMessage(
+        update_type=ModelUpdateType.Load,
+        model_settings=ModelSettings(name="foo", implementation=SumModel),
+    )
+    model_update_message.model_settings
+
+    pickled = ForkingPickler.dumps(model_update_message)
+    unpickled = ForkingPickler.loads(pickled)
+
+    assert unpickled._model_settings is None
+    assert unpickled.model_settings.name == "foo"
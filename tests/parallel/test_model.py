@@ -1,10 +1,14 @@
+import asyncio
 import pytest
 
+from mlserver.batching import load_batching
+from mlserver.context import model_context
 from mlserver.errors import MLServerError
 from mlserver.handlers.custom import get_custom_handlers
 from mlserver.types import InferenceRequest, MetadataModelResponse
 from mlserver.model import MLModel
 from mlserver.settings import ModelSettings
+from mlserver.parallel.dispatcher import Dispatcher
 from mlserver.parallel.pool import InferencePool
 
 from ..fixtures import ErrorModel
@@ -31,6 +35,31 @@ async def test_predict(
     assert len(inference_response.outputs) == 1
 
 
+async def test_predict_batched(
+    sum_model: MLModel,
+    dispatcher: Dispatcher,
+    inference_request: InferenceRequest,
+    mocker,
+):
+    dispatch_spy = mocker.spy(dispatcher, "dispatch_request")
+
+    num_requests = 4
+    with model_context(sum_model.settings):
+        batched_model = await load_batching(sum_model)
+        inference_responses = await asyncio.gather(
+            *[batched_model.predict(inference_request) for _ in range(num_requests)]
+        )
+
+    # Batching happens before dispatching requests to the workers, so only
+    # the merged request should cross the process boundary
+    assert len(inference_responses) == num_requests
+    dispatch_spy.assert_called_once()
+
+    request_message = dispatch_spy.call_args.args[0]
+    merged_request = request_message.method_args[0]
+    assert merged_request.inputs[0].shape[0] == num_requests
+
+
 async def test_predict_error(
     error_model: MLModel,
     inference_request: InferenceRequest,
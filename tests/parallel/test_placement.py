@@ -0,0 +1,78 @@
+import pytest
+
+from mlserver.settings import ModelSettings, ModelParameters
+from mlserver.parallel.placement import ModelPlacement
+
+from ..fixtures import SumModel
+
+WORKER_PIDS = [10, 11, 12]
+
+
+def _get_model_settings(name: str, replicas: int = None) -> ModelSettings:
+    return ModelSettings(name=name, implementation=SumModel, parallel_replicas=replicas)
+
+
+@pytest.fixture
+def placement() -> ModelPlacement:
+    return ModelPlacement()
+
+
+def test_place_all_workers(placement: ModelPlacement):
+    model_settings = _get_model_settings("foo")
+
+    assert placement.place(model_settings, WORKER_PIDS) is None
+
+    placement.set_workers(model_settings, None)
+    assert placement.get_workers("foo") is None
+
+
+@pytest.mark.parametrize(
+    "replicas, expected", [(1, [10]), (2, [10, 11]), (5, WORKER_PIDS)]
+)
+def test_place_replicas(placement: ModelPlacement, replicas: int, expected: list):
+    model_settings = _get_model_settings("foo", replicas)
+
+    assert placement.place(model_settings, WORKER_PIDS) == expected
+
+
+def test_place_least_loaded(placement: ModelPlacement):
+    foo = _get_model_settings("foo", 2)
+    placement.set_workers(foo, placement.place(foo, WORKER_PIDS))
+
+    bar = _get_model_settings("bar", 2)
+    assert placement.place(bar, WORKER_PIDS) == [12, 10]
+
+
+def test_place_keeps_current(placement: ModelPlacement):
+    foo = _get_model_settings("foo", 1)
+    placement.set_workers(foo, [12])
+
+    assert placement.place(foo, WORKER_PIDS) == [12]
+
+    # Increasing the replicas should keep the existing ones
+    foo.parallel_replicas = 2
+    assert placement.place(foo, WORKER_PIDS) == [12, 10]
+
+
+def test_remove_worker(placement: ModelPlacement):
+    foo = _get_model_settings("foo", 2)
+    placement.set_workers(foo, [10, 11])
+
+    placement.remove_worker(10)
+    assert placement.get_workers("foo") == {11}
+
+    # The missing replica should get placed on the new worker
+    new_worker_pids = [11, 12, 13]
+    assert placement.place(foo, new_worker_pids) == [11, 12]
+
+
+def test_place_ambiguous_keys(placement: ModelPlacement):
+    foo = _get_model_settings("a-b", 1)
+    foo.parameters = ModelParameters(version="c")
+    bar = _get_model_settings("a", 1)
+    bar.parameters = ModelParameters(version="b-c")
+    placement.set_workers(foo, [10])
+    placement.set_workers(bar, [11])
+
+    assert placement.get_workers("a-b", "c") == {10}
+    assert placement.get_workers("a", "b-c") == {11}
@@ -0,0 +1,110 @@
+import pytest
+
+from mlserver.parallel.errors import InvalidDispatchPolicy
+from mlserver.parallel.policies import (
+    DispatchPolicy,
+    LatencyAware,
+    LeastInFlight,
+    PowerOfTwoChoices,
+    RoundRobin,
+    get_dispatch_policy,
+)
+
+WORKER_PIDS = [10, 11, 12]
+
+
+def test_round_robin():
+    policy = RoundRobin()
+    selected = [policy.select(WORKER_PIDS, {}) for _ in range(4)]
+
+    assert selected == [10, 11, 12, 10]
+
+
+def test_least_in_flight():
+    policy = LeastInFlight()
+    in_flight = {10: 3, 11: 1, 12: 2}
+
+    assert policy.select(WORKER_PIDS, in_flight) == 11
+
+
+def test_least_in_flight_ties():
+    policy = LeastInFlight()
+    selected = {policy.select(WORKER_PIDS, {}) for _ in range(3)}
+
+    assert selected == set(WORKER_PIDS)
+
+
+def test_power_of_two_choices():
+    policy = PowerOfTwoChoices()
+    in_flight = {10: 5, 11: 5, 12: 0}
+
+    # The busiest worker can never win when compared against another one
+    selected = {policy.select(WORKER_PIDS, {10: 9, 11: 0, 12: 0}) for _ in range(20)}
+    assert 10 not in selected
+
+    assert policy.select([12], in_flight) == 12
+
+
+def test_latency_aware():
+    policy = LatencyAware(smoothing=0.5)
+    policy.observe(10, 0.1)
+    policy.observe(11, 0.1)
+    policy.observe(11, 0.3)
+
+    # Workers without any latency data are assumed to have the average latency
+    assert policy.select(WORKER_PIDS, {}) == 10
+    assert policy.select(WORKER_PIDS, {10: 1}) == 12
+
+    policy.observe(12, 0.4)
+    assert policy.select(WORKER_PIDS, {}) == 10
+
+    # Slow workers can still win if the rest are busier
+    assert policy.select(WORKER_PIDS, {10: 4, 11: 2}) == 12
+
+    policy.remove(12)
+    assert policy.select(WORKER_PIDS, {10: 4, 11: 2}) == 12
+
+
+def test_latency_aware_burst():
+    policy = LatencyAware()
+    in_flight = {}
+
+    # Before any latency gets observed, requests should get spread across all
+    # workers
+    for _ in range(len(WORKER_PIDS) * 2):
+        worker_pid = policy.select(WORKER_PIDS, in_flight)
+        in_flight[worker_pid] = in_flight.get(worker_pid, 0) + 1
+
+    assert in_flight == {worker_pid: 2 for worker_pid in WORKER_PIDS}
+
+    # New workers shouldn't get every request either
+    for worker_pid in WORKER_PIDS:
+        policy.observe(worker_pid, 0.1)
+
+    new_worker_pids = WORKER_PIDS + [13]
+    in_flight = {worker_pid: 1 for worker_pid in WORKER_PIDS}
+    selected = []
+    for _ in range(3):
+        worker_pid = policy.select(new_worker_pids, in_flight)
+        in_flight[worker_pid] = in_flight.get(worker_pid, 0) + 1
+        selected.append(worker_pid)
+
+    assert selected.count(13) < 3
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("round_robin", RoundRobin),
+        ("least_in_flight", LeastInFlight),
+        ("power_of_two_choices", PowerOfTwoChoices),
+        ("latency_aware", LatencyAware),
+    ],
+)
+def test_get_dispatch_policy(name: str, expected: DispatchPolicy):
+    assert isinstance(get_dispatch_policy(name), expected)
+
+
+def test_get_dispatch_policy_invalid():
+    with pytest.raises(InvalidDispatchPolicy):
+        get_dispatch_policy("foo")
@@ -34,6 +34,16 @@ def test_workers_start(inference_pool: InferencePool, settings: Settings):
         assert check_pid(worker_pid)
 
 
+def test_workers_responses(inference_pool: InferencePool):
+    workers = list(inference_pool._workers.values())
+    responses = {id(worker.responses) for worker in workers}
+    assert len(responses) == len(workers)
+
+    # Ensure the dispatcher is watching every worker's responses
+    dispatcher = inference_pool._dispatcher
+    assert set(dispatcher._responses_readers) == set(inference_pool._workers)
+
+
 async def test_on_worker_stop(
     settings: Settings, inference_pool: InferencePool, sum_model: MLModel
 ):
@@ -52,6 +62,10 @@ async def test_on_worker_stop(
     for worker in new_workers:
         assert worker.pid != stopped_worker.pid
 
+    dispatcher = inference_pool._dispatcher
+    assert stopped_worker.pid not in dispatcher._responses_readers
+    assert set(dispatcher._responses_readers) == set(inference_pool._workers)
+
 
 async def test_start_worker(
     settings: Settings,
@@ -149,3 +163,192 @@ async def test_load_error(
     assert len(inference_pool._worker_registry) == 0
     expected_msg = f"mlserver.errors.MLServerError: {ErrorModel.error_message}"
     assert str(excinfo.value) == expected_msg
+
+
+async def test_load_model_replicas(
+    settings: Settings,
+    inference_pool: InferencePool,
+    sum_model: MLModel,
+    inference_request: InferenceRequest,
+):
+    sum_model.settings.parallel_replicas = 1
+    model = await inference_pool.load_model(sum_model)
+
+    placed = inference_pool._placement.get_workers(model.name, model.version)
+    assert len(placed) == 1
+
+    # All requests should get routed to the worker holding the model
+    dispatcher = inference_pool._dispatcher
+    for _ in range(settings.parallel_workers + 1):
+        _, worker_pid = dispatcher._get_worker(model.name, model.version)
+        assert worker_pid in placed
+
+        inference_response = await model.predict(inference_request)
+        assert len(inference_response.outputs) == 1
+
+
+async def test_replicas_rebalanced(
+    inference_pool: InferencePool,
+    sum_model: MLModel,
+    inference_request: InferenceRequest,
+):
+    sum_model.settings.parallel_replicas = 1
+    model = await inference_pool.load_model(sum_model)
+
+    placed = inference_pool._placement.get_workers(model.name, model.version)
+    stopped_worker = inference_pool._workers[list(placed)[0]]
+
+    await inference_pool.on_worker_stop(stopped_worker.pid, 23)
+    await stopped_worker.stop()
+
+    # The replica should now be held by the new worker
+    placed = inference_pool._placement.get_workers(model.name, model.version)
+    assert len(placed) == 1
+    assert stopped_worker.pid not in placed
+    assert placed <= set(inference_pool._workers)
+
+    inference_response = await model.predict(inference_request)
+    assert len(inference_response.outputs) == 1
+
+
+@pytest.fixture
+async def replicas_pool(settings: Settings) -> InferencePool:
+    settings = settings.copy(update={"parallel_workers": 3})
+    pool = InferencePool(settings)
+    yield pool
+
+    await pool.close()
+
+
+async def test_replicas_rebalanced_several_lost(
+    replicas_pool: InferencePool,
+    sum_model: MLModel,
+    inference_request: InferenceRequest,
+    mocker,
+):
+    sum_model.settings.parallel_replicas = 2
+    model = await replicas_pool.load_model(sum_model)
+
+    # Lose both replica holders before any replacement gets started
+    placed = replicas_pool._placement.get_workers(model.name, model.version)
+    stopped_workers = [replicas_pool._workers[pid] for pid in placed]
+    for stopped_worker in stopped_workers:
+        replicas_pool._dispatcher.on_worker_stop(stopped_worker, 23)
+        replicas_pool._placement.remove_worker(stopped_worker.pid)
+        await stopped_worker.stop()
+
+    await replicas_pool._start_worker()
+
+    # Every worker recorded as a replica should be able to serve the model
+    placed = replicas_pool._placement.get_workers(model.name, model.version)
+    assert len(placed) == 2
+    dispatcher = replicas_pool._dispatcher
+    for pid in placed:
+        worker = replicas_pool._workers[pid]
+        mocker.patch.object(dispatcher, "_get_worker", return_value=(worker, pid))
+        inference_response = await model.predict(inference_request)
+        assert len(inference_response.outputs) == 1
+
+
+@pytest.fixture
+async def autoscaling_pool(settings: Settings) -> InferencePool:
+    # NOTE: Use a long interval, so that scaling only gets triggered
+    # explicitly from the tests
+    settings = settings.copy(
+        update={
+            "parallel_workers_max": settings.parallel_workers + 1,
+            "parallel_autoscaling_interval": 3600,
+            "parallel_autoscaling_idle_timeout": 0,
+        }
+    )
+    pool = InferencePool(settings)
+    yield pool
+
+    await pool.close()
+
+
+async def test_scale_up(
+    autoscaling_pool: InferencePool,
+    sum_model: MLModel,
+    inference_request: InferenceRequest,
+    mocker,
+):
+    model = await autoscaling_pool.load_model(sum_model)
+    start_workers = set(autoscaling_pool._workers)
+
+    dispatcher = autoscaling_pool._dispatcher
+    mocker.patch.object(
+        dispatcher, "in_flight", return_value={pid: 100 for pid in start_workers}
+    )
+    await autoscaling_pool._scale()
+
+    new_workers = set(autoscaling_pool._workers) - start_workers
+    assert len(new_workers) == 1
+
+    # The new worker should be able to serve the model straight away
+    new_worker = autoscaling_pool._workers[new_workers.pop()]
+    mocker.patch.object(
+        dispatcher, "_get_worker", return_value=(new_worker, new_worker.pid)
+    )
+    inference_response = await model.predict(inference_request)
+    assert len(inference_response.outputs) == 1
+
+
+async def test_scale_while_starting(autoscaling_pool: InferencePool, mocker):
+    start_workers = set(autoscaling_pool._workers)
+
+    # Flag one of the workers as still starting
+    dispatcher = autoscaling_pool._dispatcher
+    dispatcher._starting.add(list(start_workers)[0])
+    dispatcher._reset_worker_pids()
+
+    mocker.patch.object(
+        dispatcher, "in_flight", return_value={pid: 100 for pid in start_workers}
+    )
+    await autoscaling_pool._scale()
+
+    assert set(autoscaling_pool._workers) == start_workers
+
+
+async def test_retire_worker(
+    autoscaling_pool: InferencePool,
+    sum_model: MLModel,
+    inference_request: InferenceRequest,
+):
+    sum_model.settings.parallel_replicas = 1
+    model = await autoscaling_pool.load_model(sum_model)
+    placed = autoscaling_pool._placement.get_workers(model.name, model.version)
+    retired_worker = autoscaling_pool._workers[list(placed)[0]]
+
+    await autoscaling_pool._retire_worker(retired_worker)
+
+    assert retired_worker.pid not in autoscaling_pool._workers
+    assert retired_worker.pid not in autoscaling_pool._dispatcher._workers
+    assert not check_pid(retired_worker.pid)
+
+    # The replica should have been moved to one of the remaining workers
+    placed = autoscaling_pool._placement.get_workers(model.name, model.version)
+    assert len(placed) == 1
+    assert placed <= set(autoscaling_pool._workers)
+
+    inference_response = await model.predict(inference_request)
+    assert len(inference_response.outputs) == 1
+
+
+async def test_close_while_retiring(autoscaling_pool: InferencePool, mocker):
+    retired_worker = list(autoscaling_pool._workers.values())[0]
+
+    # Keep the worker busy, so that it never finishes draining
+    dispatcher = autoscaling_pool._dispatcher
+    mocker.patch.object(dispatcher, "in_flight", return_value={retired_worker.pid: 1})
+    retire_task = asyncio.create_task(autoscaling_pool._retire_worker(retired_worker))
+    await asyncio.sleep(0.5)
+
+    assert retired_worker.pid not in autoscaling_pool._workers
+    assert retired_worker in autoscaling_pool._retiring
+
+    retire_task.cancel()
+    await autoscaling_pool.close()
+
+    assert not check_pid(retired_worker.pid)
+    assert len(autoscaling_pool._retiring) == 0
@@ -15,7 +15,7 @@ from mlserver.parallel.registry import (
     ENV_HASH_ATTR,
 )
 
-from ..fixtures import EnvModel
+from ..fixtures import EnvModel, SumModel
 
 
 @pytest.fixture
@@ -74,6 +74,76 @@ async def test_load_model(
     await inference_pool_registry.unload_model(sum_model)
 
 
+async def test_load_model_dedicated_pool(
+    inference_pool_registry: InferencePoolRegistry,
+    sum_model: MLModel,
+    inference_request: InferenceRequest,
+):
+    sum_model.settings.parallel_pool_workers = 1
+    sum_model.settings.parallel_pool_workers_max = 2
+    model = await inference_pool_registry.load_model(sum_model)
+
+    assert sum_model.name in inference_pool_registry._dedicated_pools
+    dedicated_pool = inference_pool_registry._dedicated_pools[sum_model.name]
+    assert len(dedicated_pool._workers) == 1
+    assert dedicated_pool._autoscaler.enabled
+    assert dedicated_pool._autoscaler.max_workers == 2
+    assert inference_pool_registry._default_pool.empty()
+
+    inference_response = await model.predict(inference_request)
+    assert len(inference_response.outputs) == 1
+
+    await inference_pool_registry.unload_model(model)
+    assert sum_model.name not in inference_pool_registry._dedicated_pools
+
+
+async def test_reload_model_dedicated_pool(
+    inference_pool_registry: InferencePoolRegistry,
+    sum_model: MLModel,
+    inference_request: InferenceRequest,
+):
+    model = await inference_pool_registry.load_model(sum_model)
+    assert not inference_pool_registry._default_pool.empty()
+
+    new_model_settings = sum_model.settings.copy(update={"parallel_pool_workers": 1})
+    new_model = SumModel(new_model_settings)
+    model = await inference_pool_registry.reload_model(sum_model, new_model)
+
+    # The model should have moved to its own dedicated pool
+    assert inference_pool_registry._default_pool.empty()
+    assert sum_model.name in inference_pool_registry._dedicated_pools
+
+    inference_response = await model.predict(inference_request)
+    assert len(inference_response.outputs) == 1
+
+    await inference_pool_registry.unload_model(model)
+
+
+async def test_reload_model_from_dedicated_pool(
+    inference_pool_registry: InferencePoolRegistry,
+    sum_model: MLModel,
+    inference_request: InferenceRequest,
+):
+    sum_model.settings.parallel_pool_workers = 1
+    model = await inference_pool_registry.load_model(sum_model)
+    assert inference_pool_registry._default_pool.empty()
+
+    new_model_settings = sum_model.settings.copy(
+        update={"parallel_pool_workers": None, "parallel_replicas": 1}
+    )
+    new_model = SumModel(new_model_settings)
+    model = await inference_pool_registry.reload_model(sum_model, new_model)
+
+    # The model should have moved back to the shared pool
+    assert not inference_pool_registry._default_pool.empty()
+    assert sum_model.name not in inference_pool_registry._dedicated_pools
+
+    inference_response = await model.predict(inference_request)
+    assert len(inference_response.outputs) == 1
+
+    await inference_pool_registry.unload_model(model)
+
+
 async def test_load_model_with_env(
     inference_pool_registry: InferencePoolRegistry,
     env_model: MLModel,
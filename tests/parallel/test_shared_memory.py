@@ -0,0 +1,221 @@
+import os
+import numpy as np
+import pytest
+
+from multiprocessing.shared_memory import SharedMemory
+
+from mlserver.model import MLModel
+from mlserver.settings import Settings
+from mlserver.types import (
+    InferenceRequest,
+    InferenceResponse,
+    RequestInput,
+    ResponseOutput,
+)
+from mlserver.parallel.messages import ModelRequestMessage, ModelResponseMessage
+from mlserver.parallel.pool import InferencePool
+from mlserver.parallel.shared_memory import (
+    MIN_SEGMENT_SIZE,
+    SharedMemoryPool,
+    SharedTensor,
+)
+
+THRESHOLD = 1024
+
+
+@pytest.fixture
+def sender() -> SharedMemoryPool:
+    pool = SharedMemoryPool(THRESHOLD)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def receiver() -> SharedMemoryPool:
+    pool = SharedMemoryPool(THRESHOLD)
+    yield pool
+    pool.close()
+
+
+def _get_request(num_elems: int, datatype: str = "FP32") -> InferenceRequest:
+    return InferenceRequest(
+        inputs=[
+            RequestInput(
+                name="input-0",
+                shape=[1, num_elems],
+                datatype=datatype,
+                data=list(range(num_elems)),
+            )
+        ]
+    )
+
+
+def _get_data(payload: InferenceRequest):
+    return getattr(payload.inputs[0].data, "__root__")
+
+
+def test_encode_request(sender: SharedMemoryPool, receiver: SharedMemoryPool):
+    inference_request = _get_request(1000)
+    request_message = ModelRequestMessage(
+        model_name="sum-model", method_name="predict", method_args=[inference_request]
+    )
+
+    encoded = sender.encode_request(request_message)
+    assert encoded.id == request_message.id
+    assert isinstance(_get_data(encoded.method_args[0]), SharedTensor)
+
+    # The original request should be left untouched
+    assert _get_data(inference_request) == list(range(1000))
+
+    decoded = receiver.decode_request(encoded)
+    data = _get_data(decoded.method_args[0])
+    assert isinstance(data, np.ndarray)
+    assert data.dtype == np.float32
+    np.testing.assert_array_equal(data, np.arange(1000, dtype=np.float32))
+
+
+def test_encode_response(sender: SharedMemoryPool, receiver: SharedMemoryPool):
+    data = np.arange(512, dtype=np.int64)
+    inference_response = InferenceResponse(
+        model_name="sum-model",
+        outputs=[
+            ResponseOutput(name="output-0", shape=[1, 512], datatype="INT64", data=data)
+        ],
+    )
+    response_message = ModelResponseMessage(
+        id="foo", return_value=inference_response, exception=None
+    )
+
+    encoded = sender.encode_response(response_message)
+    output = encoded.return_value.outputs[0]
+    assert isinstance(getattr(output.data, "__root__"), SharedTensor)
+
+    decoded = receiver.decode_response(encoded)
+    output = decoded.return_value.outputs[0]
+    np.testing.assert_array_equal(getattr(output.data, "__root__"), data)
+
+
+@pytest.mark.parametrize(
+    "inference_request",
+    [
+        # Below the threshold
+        _get_request(10),
+        # Variable-length data
+        InferenceRequest(
+            inputs=[
+                RequestInput(
+                    name="input-0", shape=[1, 2048], datatype="BYTES", data=b"a" * 2048
+                )
+            ]
+        ),
+    ],
+)
+def test_encode_inline(sender: SharedMemoryPool, inference_request: InferenceRequest):
+    assert sender.encode(inference_request) is inference_request
+    assert sender._owned == []
+
+
+def test_segments_recycled(sender: SharedMemoryPool, receiver: SharedMemoryPool):
+    first = sender.encode(_get_request(1000))
+    second = sender.encode(_get_request(1000))
+
+    # The first segment is still in use, so a new one should get created
+    assert len(sender._owned) == 2
+
+    receiver.decode(first)
+    receiver.decode(second)
+    sender.encode(_get_request(500))
+
+    assert len(sender._owned) == 2
+
+
+def test_release_reader(sender: SharedMemoryPool):
+    sender.encode(_get_request(1000), reader=123)
+    assert len(sender._owned) == 1
+
+    # Reader died without freeing the segment, so it should get reclaimed
+    sender.release(123)
+    sender.encode(_get_request(1000), reader=456)
+    assert len(sender._owned) == 1
+
+
+def test_release_owner(sender: SharedMemoryPool, receiver: SharedMemoryPool):
+    encoded = sender.encode(_get_request(1000))
+    receiver.decode(encoded)
+    segment_name = sender._owned[0].name
+    assert segment_name in receiver._attached
+
+    # Segments owned by the process which stopped should get detached and
+    # unlinked
+    receiver.release(os.getpid())
+    assert receiver._attached == {}
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=segment_name)
+
+
+def test_max_size(receiver: SharedMemoryPool):
+    sender = SharedMemoryPool(THRESHOLD, max_size=MIN_SEGMENT_SIZE)
+    inference_request = _get_request(1000)
+
+    first = sender.encode(inference_request)
+    assert _get_data(first) is not _get_data(inference_request)
+
+    # There is no room for another segment, so data should get sent inline
+    assert sender.encode(inference_request) is inference_request
+    assert len(sender._owned) == 1
+
+    # Once the segment is freed, it can get reused
+    receiver.decode(first)
+    second = sender.encode(inference_request)
+    assert isinstance(_get_data(second), SharedTensor)
+
+    sender.close()
+
+
+def test_max_size_drops_free(receiver: SharedMemoryPool):
+    sender = SharedMemoryPool(THRESHOLD, max_size=MIN_SEGMENT_SIZE * 2)
+    receiver.decode(sender.encode(_get_request(1000)))
+
+    # The free (but too small) segment should get dropped to make room
+    large_request = _get_request(MIN_SEGMENT_SIZE // 4 + 1)
+    encoded = sender.encode(large_request)
+    assert isinstance(_get_data(encoded), SharedTensor)
+    assert [segment.size for segment in sender._owned] == [MIN_SEGMENT_SIZE * 2]
+
+    sender.close()
+
+
+def test_max_size_detaches_dropped():
+    max_size = MIN_SEGMENT_SIZE * 4
+    sender = SharedMemoryPool(THRESHOLD, max_size=max_size)
+    receiver = SharedMemoryPool(THRESHOLD, max_size=max_size)
+
+    # Growing payloads force the sender to keep dropping its free segments
+    for num_elems in [1000, MIN_SEGMENT_SIZE // 4, MIN_SEGMENT_SIZE // 2] * 5:
+        inference_request = _get_request(num_elems)
+        decoded = receiver.decode(sender.encode(inference_request))
+        np.testing.assert_array_equal(_get_data(decoded), np.arange(num_elems))
+
+        attached = sum(segment.size for segment in receiver._attached.values())
+        assert attached <= max_size
+
+    # Segments dropped by the sender shouldn't stay mapped by the receiver
+    owned = {segment.name for segment in sender._owned}
+    assert set(receiver._attached) <= owned
+
+    receiver.close()
+    sender.close()
+
+
+async def test_predict(settings: Settings, sum_model: MLModel):
+    settings.parallel_shared_memory_threshold = THRESHOLD
+    inference_pool = InferencePool(settings)
+    parallel_model = await inference_pool.load_model(sum_model)
+
+    inference_request = _get_request(1000)
+    inference_response = await parallel_model.predict(inference_request)
+
+    assert getattr(inference_response.outputs[0].data, "__root__") == [499500.0]
+
+    await inference_pool.unload_model(sum_model)
+    await inference_pool.close()
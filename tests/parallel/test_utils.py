@@ -0,0 +1,36 @@
+import asyncio
+import struct
+
+from multiprocessing import Queue
+
+from mlserver.parallel.utils import MessageReader
+
+
+async def test_message_reader(responses: Queue):
+    received = []
+    reader = MessageReader(responses, received.append)
+    reader.start(asyncio.get_running_loop())
+
+    responses.put("foo")
+    responses.put("bar")
+    while len(received) < 2:
+        await asyncio.sleep(0.1)
+
+    reader.stop()
+    assert received == ["foo", "bar"]
+
+
+async def test_message_reader_broken_queue(responses: Queue):
+    received = []
+    reader = MessageReader(responses, received.append)
+    loop = asyncio.get_running_loop()
+    reader.start(loop)
+
+    # Simulate a writer which dies half-way through sending a message
+    responses._writer._send(struct.pack("!i", 100))
+    responses._writer.close()
+    await asyncio.sleep(0.5)
+
+    assert received == []
+    assert not reader._active
+    assert not loop.remove_reader(reader._fd)
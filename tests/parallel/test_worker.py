@@ -1,10 +1,18 @@
+import time
+
 from multiprocessing import Queue
+from multiprocessing.reduction import ForkingPickler
 
 from mlserver.settings import ModelSettings
 from mlserver.codecs import StringCodec
+from mlserver.parallel import utils
 from mlserver.parallel.errors import WorkerError
 from mlserver.parallel.worker import Worker
-from mlserver.parallel.messages import ModelUpdateMessage, ModelRequestMessage
+from mlserver.parallel.messages import (
+    ModelUpdateMessage,
+    ModelUpdateType,
+    ModelRequestMessage,
+)
 
 
 async def test_predict(
@@ -17,6 +25,8 @@ async def test_predict(
 
     assert response is not None
     assert response.id == inference_request_message.id
+    assert response.service_time is not None
+    assert response.service_time > 0
 
     inference_response = response.return_value
     assert inference_response.model_name == inference_request_message.model_name
@@ -24,6 +34,23 @@ async def test_predict(
     assert len(inference_response.outputs) == 1
 
 
+async def test_predict_large_request(
+    worker: Worker,
+    inference_request_message: ModelRequestMessage,
+    responses: Queue,
+    mocker,
+):
+    mocker.patch("mlserver.parallel.utils.LARGE_MESSAGE_SIZE", 0)
+    on_large_message = mocker.spy(worker._requests_reader, "_on_large_message")
+
+    worker.send_request(inference_request_message)
+    response = responses.get()
+
+    assert response.id == inference_request_message.id
+    assert response.exception is None
+    assert on_large_message.call_count == 1
+
+
 async def test_metadata(
     worker: Worker,
     metadata_request_message: ModelRequestMessage,
@@ -93,6 +120,58 @@ async def test_unload_model(
     assert len(loaded_models) == 0
 
 
+async def test_model_updates_order(
+    worker: Worker,
+    load_message: ModelUpdateMessage,
+    responses: Queue,
+    mocker,
+):
+    # Large messages get read on a separate thread, which shouldn't let the
+    # unload below overtake the (slow to unpickle) load it follows
+    mocker.patch("mlserver.parallel.utils.LARGE_MESSAGE_SIZE", 1024)
+
+    loads = ForkingPickler.loads
+
+    def _slow_loads(buf):
+        if len(buf) >= 1024:
+            time.sleep(0.1)
+
+        return loads(buf)
+
+    mocker.patch.object(utils.ForkingPickler, "loads", _slow_loads)
+
+    new_model_settings = load_message.model_settings.copy()
+    new_model_settings.name = "foo-model"
+    new_unload_message = ModelUpdateMessage(
+        update_type=ModelUpdateType.Unload, model_settings=new_model_settings
+    )
+
+    # Only the load message will be above the threshold
+    padded_model_settings = new_model_settings.copy()
+    padded_model_settings.parameters = new_model_settings.parameters.copy(
+        update={"extra": {"padding": "x" * 2048}}
+    )
+    new_load_message = ModelUpdateMessage(
+        update_type=load_message.update_type, model_settings=padded_model_settings
+    )
+    worker.send_update(new_load_message)
+    worker.send_update(new_unload_message)
+
+    for _ in range(2):
+        response = responses.get()
+        print(
+            "RESP",
+            response.id,
+            response.exception,
+            len(new_load_message.serialised_model_settings),
+        )
+        assert response.exception is None
+
+    loaded_models = list(await worker._model_registry.get_models())
+    assert len(loaded_models) == 1
+    assert loaded_models[0].name == load_message.model_settings.name
+
+
 async def test_exception(
     worker: Worker,
     inference_request_message: ModelRequestMessage,
@@ -116,6 +195,7 @@ async def test_exception(
     assert response.exception is not None
     assert response.exception.__class__ == WorkerError
     assert str(response.exception) == f"builtins.Exception: {error_msg}"
+    assert response.service_time is not None
 
 
 async def test_worker_env(
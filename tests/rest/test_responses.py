@@ -0,0 +1,50 @@
+import json
+import pytest
+import numpy as np
+
+from mlserver.rest.responses import InferenceResponseSerializer
+from mlserver.types import InferenceResponse, ResponseOutput
+
+
+@pytest.fixture
+def serializer() -> InferenceResponseSerializer:
+    return InferenceResponseSerializer()
+
+
+def test_serialize(serializer, inference_response):
+    serialized = serializer.serialize(inference_response)
+
+    as_dict = json.loads(serialized)
+    assert "id" not in as_dict
+    assert as_dict["model_name"] == inference_response.model_name
+
+
+@pytest.mark.parametrize("response_id", ["my-id", 'with "quotes"', None])
+def test_with_id(serializer, inference_response, response_id):
+    serialized = serializer.serialize(inference_response)
+    body = serializer.with_id(
+        serializer.loads(serializer.dumps(serialized)), response_id
+    )
+
+    inference_response.id = response_id
+    assert InferenceResponse.parse_raw(body) == inference_response
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        np.array([[1.5, 2.5], [3.5, 4.5]]),
+        # non-contiguous view
+        np.array([[1.5, 0, 2.5], [3.5, 0, 4.5]])[:, ::2],
+    ],
+)
+def test_serialize_array(serializer, data: np.ndarray):
+    inference_response = InferenceResponse(
+        model_name="my-model",
+        outputs=[ResponseOutput(name="foo", datatype="FP64", shape=[2, 2], data=data)],
+    )
+    serialized = serializer.serialize(inference_response)
+
+    as_dict = json.loads(serialized)
+    assert as_dict["outputs"][0]["data"] == [[1.5, 2.5], [3.5, 4.5]]
+    assert json.loads(inference_response.json()) == as_dict
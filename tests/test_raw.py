@@ -116,6 +116,26 @@ def test_pack_tensor(tensor: np.ndarray):
     assert expected == packed
 
 
+@pytest.mark.parametrize(
+    "tensor",
+    [
+        np.array([True, False, True]),
+        np.array([[1, 2], [3, 4]], dtype=np.intc),
+        np.array([[1.2, 3.3]], dtype=np.single),
+        # non-contiguous view
+        np.arange(6, dtype=np.int_).reshape(2, 3)[:, 1:],
+    ],
+)
+def test_pack_tensor_array(tensor: np.ndarray):
+    response_output = NumpyCodec.encode_output(name="foo", payload=tensor)
+    expected = _pack_tensor(response_output)
+
+    response_output.data = TensorData(__root__=tensor)
+    packed = _pack_tensor(response_output)
+
+    assert expected == packed
+
+
 @pytest.mark.parametrize(
     "inputs, raw_contents, expected",
     [
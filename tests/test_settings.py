@@ -3,6 +3,8 @@ import sys
 import pytest
 import json
 
+from pydantic import ValidationError
+
 from mlserver.settings import CORSSettings, Settings, ModelSettings, ModelParameters
 from mlserver.repository import DEFAULT_MODEL_SETTINGS_FILENAME
 
@@ -76,6 +78,16 @@ def test_model_settings_parse_obj(obj: dict):
     assert model_settings.implementation.__name__ == "SumModel"
 
 
+@pytest.mark.parametrize(
+    "field", ["parallel_pool_workers", "parallel_pool_workers_max", "parallel_replicas"]
+)
+def test_model_settings_parallel_invalid(field: str):
+    with pytest.raises(ValidationError):
+        ModelSettings.parse_obj(
+            {"name": "foo", "implementation": "tests.fixtures.SumModel", field: 0}
+        )
+
+
 def test_model_settings_serialisation():
     # Module may have been reloaded in a diff test, so let's re-import it
     from .fixtures import SumModel